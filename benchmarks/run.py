@@ -0,0 +1,390 @@
+"""
+Benchmarks the hot paths of the client against a local mock server (see hetznercloud.testing), and writes the results
+as JSON so they can be compared between releases.
+
+    python -m benchmarks.run --label v1.2.0 --output v1.2.0.json
+    python -m benchmarks.run --compare v1.2.0.json
+
+Every result has a name, a value, a unit and whether higher or lower values are better. When comparing, results that
+got worse by more than --max-regression (as a fraction of the baseline) are reported, and the exit code is 1.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import requests
+import requests.adapters
+import requests.structures
+
+from hetznercloud import HetznerCloudClientConfiguration, HetznerCloudClient, ACTION_STATUS_SUCCESS, \
+    SERVER_TYPE_1CPU_2GB, IMAGE_UBUNTU_1604
+from hetznercloud.actions import HetznerCloudAction
+from hetznercloud.datacenters import HetznerCloudDatacenter
+from hetznercloud.floating_ips import HetznerCloudFloatingIp
+from hetznercloud.images import HetznerCloudImage
+from hetznercloud.isos import HetznerCloudIso
+from hetznercloud.locations import HetznerCloudLocation
+from hetznercloud.server_types import HetznerCloudServerType
+from hetznercloud.serialization import HetznerCloudStdlibJsonCodec, HetznerCloudOrjsonCodec, orjson
+from hetznercloud.servers import HetznerCloudServer
+from hetznercloud.shared import _get_results, _get_paginated_results
+from hetznercloud.ssh_keys import HetznerCloudSSHKey
+from hetznercloud.testing import HetznerCloudMockServer
+
+FORMAT_VERSION = 1
+
+# Run in a fresh interpreter, printing how long importing the package (and running `%s`) took, and which HTTP clients
+# were loaded by then.
+_IMPORT_SCRIPT = """
+import sys, time
+started = time.perf_counter()
+import hetznercloud
+%s
+print(time.perf_counter() - started, *sorted({"requests", "aiohttp"} & set(sys.modules)))
+"""
+
+# (name, list endpoint, load function, whether the model supports lazy decoding)
+_MODELS = [
+    ("server", "servers", lambda config, json: HetznerCloudServer._load_from_json(config, json), True),
+    ("image", "images", lambda config, json: HetznerCloudImage._load_from_json(config, json), True),
+    ("floating_ip", "floating_ips", lambda config, json: HetznerCloudFloatingIp._load_from_json(config, json), True),
+    ("ssh_key", "ssh_keys", lambda config, json: HetznerCloudSSHKey._load_from_json(config, json), True),
+    ("action", "actions", lambda config, json: HetznerCloudAction._load_from_json(config, json), False),
+    ("location", "locations", lambda config, json: HetznerCloudLocation._load_from_json(json), False),
+    ("iso", "isos", lambda config, json: HetznerCloudIso._load_from_json(json), False),
+    ("server_type", "server_types", lambda config, json: HetznerCloudServerType._load_from_json(json), False),
+    ("datacenter", "datacenters", lambda config, json: HetznerCloudDatacenter._load_from_json(json), False),
+]
+
+
+class _RecordedAdapter(requests.adapters.BaseAdapter):
+    """
+    Answers every request with the same recorded response, so that only the client's own overhead is measured.
+    """
+    def __init__(self, status_code, headers, content):
+        super().__init__()
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.headers = requests.structures.CaseInsensitiveDict(self.headers)
+        response._content = self.content
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def run_benchmarks(scale=1.0, repeat=3, action_count=10, action_duration=1.0):
+    """
+    Runs every benchmark, returning the results as a JSON-serialisable dictionary.
+
+    :param scale: A multiplier applied to the number of records and requests in each benchmark.
+    :param repeat: The number of times each timed benchmark is run. The fastest run is reported.
+    :param action_count: The number of actions to wait for in the action benchmarks.
+    :param action_duration: The number of seconds each action takes to finish on the mock server.
+    """
+    results = _benchmark_import(repeat)
+    with HetznerCloudMockServer(action_duration=action_duration, rate_limit=10 ** 9, seed=1) as mock_server:
+        results.extend(_benchmark_action_waiting(mock_server, action_count))
+        mock_server.reset()
+
+        records = _download_records(mock_server, max(int(100 * scale), 1))
+        results.extend(_benchmark_decoding(records, max(int(200 * scale), 1), repeat))
+        results.extend(_benchmark_parsing(records, max(int(10000 * scale), 1), repeat))
+        results.extend(_benchmark_memory(records, max(int(10000 * scale), 1)))
+        mock_server.reset()
+
+        results.extend(_benchmark_requests(mock_server, max(int(500 * scale), 1), repeat))
+        results.extend(_benchmark_listings(mock_server, max(int(10000 * scale), 1), repeat))
+
+    return {
+        "format_version": FORMAT_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "scale": scale,
+        "results": results,
+    }
+
+
+def _result(name, value, unit, better, **details):
+    return {"name": name, "value": value, "unit": unit, "better": better, "details": details}
+
+
+def _configuration(mock_server, lazy_decoding=False):
+    return HetznerCloudClientConfiguration().with_api_key("benchmark").with_base_url(mock_server.base_url) \
+        .with_lazy_decoding(lazy_decoding)
+
+
+def _best_of(repeat, function):
+    """
+    Calls a function `repeat` times, returning the shortest time it took in seconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+
+    return min(timings)
+
+
+def _download_records(mock_server, count):
+    """
+    Fills the mock server with `count` servers, floating IPs, SSH keys and actions, and downloads the raw JSON records
+    of every model from it.
+    """
+    config = _configuration(mock_server)
+    mock_server.seed_resources(servers=count, floating_ips=count, ssh_keys=count)
+    for i in range(count):
+        _get_results(config, "servers/%s/actions/reboot" % (i + 1), method="POST")
+
+    records = {}
+    for name, endpoint, _, _ in _MODELS:
+        records[name] = list(_get_paginated_results(config, endpoint, endpoint, per_page=50))
+
+    config.close()
+    return records
+
+
+def _repeat_records(records, count):
+    return [records[i % len(records)] for i in range(count)]
+
+
+def _benchmark_decoding(records, count, repeat):
+    """
+    Measures how many pages of 50 servers each JSON codec decodes per second.
+    """
+    page = HetznerCloudStdlibJsonCodec().dumps({"servers": _repeat_records(records["server"], 50)}).encode("utf-8")
+
+    results = []
+    codecs = [("stdlib", HetznerCloudStdlibJsonCodec())] + ([("orjson", HetznerCloudOrjsonCodec())] if orjson else [])
+    for name, codec in codecs:
+        seconds = _best_of(repeat, lambda: [codec.loads(page) for _ in range(count)])
+        results.append(_result("decode.servers_page.%s" % name, count / seconds, "pages/s", "higher", pages=count,
+                               page_bytes=len(page)))
+
+    return results
+
+
+def _benchmark_parsing(records, count, repeat):
+    """
+    Measures how many records of each model _load_from_json turns into models per second.
+    """
+    results = []
+    for name, _, load, supports_lazy in _MODELS:
+        pool = _repeat_records(records[name], count)
+        for lazy in ((False, True) if supports_lazy else (False,)):
+            config = HetznerCloudClientConfiguration().with_lazy_decoding(lazy)
+            seconds = _best_of(repeat, lambda: [load(config, json) for json in pool])
+            results.append(_result("parse.%s.%s" % (name, "lazy" if lazy else "eager"), count / seconds,
+                                   "records/s", "higher", records=count, seconds=seconds))
+
+    return results
+
+
+def _benchmark_memory(records, count):
+    """
+    Measures the number of bytes allocated per model, not counting the JSON records they are loaded from.
+    """
+    results = []
+    for name, _, load, supports_lazy in _MODELS:
+        pool = _repeat_records(records[name], count)
+        for lazy in ((False, True) if supports_lazy else (False,)):
+            config = HetznerCloudClientConfiguration().with_lazy_decoding(lazy)
+
+            gc.collect()
+            tracemalloc.start()
+            try:
+                before = tracemalloc.get_traced_memory()[0]
+                models = [load(config, json) for json in pool]
+                allocated = tracemalloc.get_traced_memory()[0] - before
+            finally:
+                tracemalloc.stop()
+
+            results.append(_result("memory.%s.%s" % (name, "lazy" if lazy else "eager"), allocated / len(models),
+                                   "bytes/object", "lower", objects=len(models)))
+            del models
+
+    return results
+
+
+def _benchmark_requests(mock_server, count, repeat):
+    """
+    Measures the time _get_results takes per call, both over HTTP to the mock server and against a recorded response
+    (which leaves only the client's own overhead).
+    """
+    results = []
+
+    config = _configuration(mock_server)
+    seconds = _best_of(repeat, lambda: [_get_results(config, "locations/1") for _ in range(count)])
+    config.close()
+    results.append(_result("request.mock", seconds / count * 1e6, "us/request", "lower", requests=count))
+
+    response = requests.get("%s/v1/locations/1" % mock_server.base_url, headers={"Authorization": "Bearer benchmark"})
+    for statistics in (True, False):
+        config = HetznerCloudClientConfiguration().with_api_key("benchmark").with_base_url("http://recorded.invalid") \
+            .with_statistics(statistics)
+        config._get_session().mount("http://recorded.invalid", _RecordedAdapter(response.status_code,
+                                                                                 dict(response.headers),
+                                                                                 response.content))
+        recorded_count = count * 4
+        seconds = _best_of(repeat, lambda: [_get_results(config, "locations/1") for _ in range(recorded_count)])
+        results.append(_result("request.recorded%s" % ("" if statistics else ".without_statistics"),
+                               seconds / recorded_count * 1e6, "us/request", "lower", requests=recorded_count))
+
+    return results
+
+
+def _benchmark_listings(mock_server, count, repeat):
+    """
+    Measures how many servers per second get_all() (and snapshot()) yields when walking a paginated listing.
+    """
+    mock_server.seed_resources(servers=count)
+
+    cases = [
+        ("get_all.servers.eager", False, lambda client: list(client.servers().get_all(per_page=50))),
+        ("get_all.servers.lazy", True, lambda client: list(client.servers().get_all(per_page=50))),
+        ("get_all.servers.prefetch", False, lambda client: list(client.servers().get_all(per_page=50, prefetch=2))),
+        ("get_all.servers.stream", False, lambda client: list(client.servers().get_all(per_page=50, stream=True))),
+        ("snapshot.servers", False, lambda client: client.servers().snapshot(per_page=50)),
+    ]
+
+    results = []
+    for name, lazy, function in cases:
+        with HetznerCloudClient(_configuration(mock_server, lazy)) as client:
+            requests_before = mock_server.requests
+            seconds = _best_of(repeat, lambda: function(client))
+            results.append(_result(name, count / seconds, "items/s", "higher", items=count, seconds=seconds,
+                                   requests=(mock_server.requests - requests_before) // repeat))
+
+    return results
+
+
+def _benchmark_import(repeat):
+    """
+    Measures how long a fresh interpreter takes to import the package, and to get a client's first resource action
+    (which loads the HTTP stack).
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")])))
+    cases = [
+        ("import.package", "pass"),
+        ("import.first_action", "hetznercloud.HetznerCloudClient(hetznercloud.HetznerCloudClientConfiguration()"
+                                ".with_api_key('benchmark')).servers()"),
+    ]
+
+    results = []
+    for name, statement in cases:
+        timings = []
+        for _ in range(repeat):
+            output = subprocess.run([sys.executable, "-c", _IMPORT_SCRIPT % statement], env=environment,
+                                    stdout=subprocess.PIPE, check=True, universal_newlines=True).stdout.split()
+            timings.append(float(output[0]))
+
+        results.append(_result(name, min(timings) * 1000, "ms", "lower", loaded=output[1:]))
+
+    return results
+
+
+def _benchmark_action_waiting(mock_server, count):
+    """
+    Measures the number of requests spent per completed action, when waiting for actions one at a time and when
+    waiting for them together with wait_for_actions().
+    """
+    results = []
+    for name in ("actions.wait_individually", "actions.wait_for_actions"):
+        mock_server.reset()
+        with HetznerCloudClient(_configuration(mock_server)) as client:
+            actions = [client.servers().create("benchmark-%s" % i, SERVER_TYPE_1CPU_2GB, IMAGE_UBUNTU_1604)[1]
+                       for i in range(count)]
+
+            requests_before = mock_server.requests
+            started = time.perf_counter()
+            if name == "actions.wait_for_actions":
+                client.actions().wait_for_actions(actions)
+            else:
+                for action in actions:
+                    action.wait_until_status_is(ACTION_STATUS_SUCCESS)
+            seconds = time.perf_counter() - started
+
+            requests_made = mock_server.requests - requests_before
+            results.append(_result(name, requests_made / count, "requests/action", "lower", actions=count,
+                                   requests=requests_made, seconds=seconds))
+
+    return results
+
+
+def compare(baseline, current, max_regression=0.1):
+    """
+    Compares two sets of results, returning a list of (name, baseline value, current value, relative change,
+    regressed) tuples for every result present in both. The change is positive when the result got better.
+    """
+    baseline_results = {result["name"]: result for result in baseline["results"]}
+    comparison = []
+    for result in current["results"]:
+        previous = baseline_results.get(result["name"])
+        if previous is None or not previous["value"]:
+            continue
+
+        change = (result["value"] - previous["value"]) / previous["value"]
+        if result["better"] == "lower":
+            change = -change
+        comparison.append((result["name"], previous["value"], result["value"], change, change < -max_regression))
+
+    return comparison
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks the Hetzner Cloud client against a local mock server.")
+    parser.add_argument("--output", help="The file to write the results to, instead of standard output.")
+    parser.add_argument("--label", help="A label to store with the results, such as the release being measured.")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="A multiplier for the number of records and requests in each benchmark.")
+    parser.add_argument("--repeat", type=int, default=3, help="The number of runs of each timed benchmark.")
+    parser.add_argument("--compare", help="A results file to compare the results against.")
+    parser.add_argument("--max-regression", type=float, default=0.1,
+                        help="The largest acceptable regression, as a fraction of the baseline.")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(scale=args.scale, repeat=args.repeat)
+    results["label"] = args.label
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    elif not args.compare:
+        json.dump(results, sys.stdout, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+        regressed = False
+        for name, previous, value, change, is_regression in compare(baseline, results, args.max_regression):
+            regressed = regressed or is_regression
+            print("%-45s %14.2f %14.2f %+8.1f%%%s" % (name, previous, value, change * 100,
+                                                       "  REGRESSION" if is_regression else ""))
+        return 1 if regressed else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
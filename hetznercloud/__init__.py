@@ -1,3 +1,50 @@
-from .client import HetznerCloudClientConfiguration, HetznerCloudClient
+import importlib
+from types import ModuleType as _ModuleType
+
 from .constants import *
 from .exceptions import *
+
+# The public classes of the package, by the module that defines them. They are imported the first time they are used
+# (see PEP 562), so that importing the package stays fast and does not load requests or aiohttp until a client needs
+# them. Module level __getattr__ and __dir__ need Python 3.7, the oldest version setup.py allows.
+_LAZY_ATTRIBUTES = {
+    "AsyncHetznerCloudClient": ".aio",
+    "HetznerCloudBatchResult": ".batches",
+    "HetznerCloudCatalogCache": ".caching",
+    "HetznerCloudResponseCache": ".caching",
+    "HetznerCloudClientConfiguration": ".client",
+    "HetznerCloudClient": ".client",
+    "HetznerCloudRequestCoalescer": ".coalescing",
+    "HetznerCloudRequestEvent": ".instrumentation",
+    "HetznerCloudEndpointStatistics": ".instrumentation",
+    "HetznerCloudStatisticsCollector": ".instrumentation",
+    "HetznerCloudInventory": ".inventory",
+    "HetznerCloudPollingStrategy": ".polling",
+    "HetznerCloudFixedPolling": ".polling",
+    "HetznerCloudBackoffPolling": ".polling",
+    "HetznerCloudProgressPolling": ".polling",
+    "HetznerCloudRateLimiter": ".rate_limiting",
+    "HetznerCloudRetryPolicy": ".retries",
+    "HetznerCloudRequestStatistics": ".retries",
+    "HetznerCloudJsonCodec": ".serialization",
+    "HetznerCloudStdlibJsonCodec": ".serialization",
+    "HetznerCloudOrjsonCodec": ".serialization",
+    "HetznerCloudServerTable": ".tables",
+}
+
+__all__ = [name for name, value in globals().items() if not name.startswith("_") and not isinstance(value, _ModuleType)]
+__all__ += _LAZY_ATTRIBUTES
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
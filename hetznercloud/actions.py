@@ -1,8 +1,12 @@
 import time
 
-from .constants import ACTION_STATUS_ERROR
-from .exceptions import HetznerWaitAttemptsExceededException, HetznerInternalServerErrorException
-from .shared import _get_results
+from .constants import ACTION_STATUS_ERROR, ACTION_STATUS_SUCCESS
+from .exceptions import HetznerWaitAttemptsExceededException, HetznerInternalServerErrorException, HetznerActionException
+from .polling import _Poller
+from .shared import _get_results, _get_paginated_results, _MODEL_LOCK
+
+# The largest number of actions the list endpoint returns per page, and so the most we ask for by id in one request.
+_ACTIONS_PER_REQUEST = 50
 
 
 def _get_action_json(config, id):
@@ -10,7 +14,110 @@ def _get_action_json(config, id):
     return json["action"]
 
 class HetznerCloudActionsAction(object):
-    pass
+    def __init__(self, config):
+        self._config = config
+
+    def get_all(self, status=None, sort=None, ids=None, per_page=None, max_items=None, prefetch=0,
+                stream=False):
+        """
+        Lists the actions of the project, fetching pages lazily as the generator is consumed.
+
+        :param status: Only list actions with this status (i.e. ACTION_STATUS_RUNNING).
+        :param sort: The order to list the actions in (i.e. SORT_BY_ID_DESC lists the newest actions first).
+        :param ids: Only list the actions with these ids.
+        :param per_page: The number of actions to request per page, or None to use the API's default.
+        :param max_items: The maximum number of actions to list, or None to list every action.
+        :param prefetch: The number of pages to fetch ahead on a background thread.
+        :param stream: Whether to decode each action as it is read, rather than decoding whole pages at once.
+        """
+        url_params = {}
+        if status is not None:
+            url_params["status"] = status
+        if sort is not None:
+            url_params["sort"] = sort
+        if ids is not None:
+            url_params["id"] = list(ids)
+
+        for result in _get_paginated_results(self._config, "actions", "actions", url_params=url_params,
+                                             per_page=per_page, max_items=max_items, prefetch=prefetch, stream=stream):
+            yield HetznerCloudAction._load_from_json(self._config, result)
+
+    def get(self, id):
+        status_code, results = _get_results(self._config, "actions/%s" % id)
+        if status_code != 200:
+            raise HetznerActionException(results)
+
+        return HetznerCloudAction._load_from_json(self._config, results["action"])
+
+    def wait_for_actions(self, actions, status=ACTION_STATUS_SUCCESS, timeout=None, polling=None):
+        """
+        Waits for a number of actions at once. Rather than polling each action individually, the status of every
+        pending action is fetched through the actions list endpoint, and actions are dropped from the set being polled
+        as soon as they finish.
+
+        :param actions: The HetznerCloudAction objects to wait for.
+        :param status: The status the actions need to be.
+        :param timeout: The maximum number of seconds to wait for (60 seconds if not specified).
+        :param polling: The HetznerCloudPollingStrategy deciding how long to wait between polls, or None to use the
+                        configured strategy.
+        :return: A list of (action, exception) tuples in the same order as the actions passed in. The exception is None
+                 if the action reached the requested status, a HetznerInternalServerErrorException if the action
+                 failed, or a HetznerWaitAttemptsExceededException if the timeout elapsed first.
+        """
+        pending = _get_pending_actions(actions, status)
+        errors = {}
+        poller = _Poller(self._config, timeout=timeout, polling=polling)
+
+        while pending:
+            for ids in _chunk_action_ids(pending):
+                for action_json in _get_paginated_results(self._config, "actions", "actions", {"id": ids},
+                                                          per_page=_ACTIONS_PER_REQUEST):
+                    _update_pending_action(pending, errors, action_json, status)
+
+            if not pending:
+                break
+
+            delay = poller.next_delay(_get_slowest_progress(pending))
+            if delay is None:
+                for id in pending:
+                    errors[id] = HetznerWaitAttemptsExceededException()
+                break
+
+            time.sleep(delay)
+
+        return [(action, errors.get(action.id)) for action in actions]
+
+
+def _get_pending_actions(actions, status):
+    return {action.id: action for action in actions if action.status != status}
+
+
+def _get_slowest_progress(pending):
+    return min(action.progress for action in pending.values())
+
+
+def _chunk_action_ids(pending):
+    ids = list(pending)
+    return [ids[i:i + _ACTIONS_PER_REQUEST] for i in range(0, len(ids), _ACTIONS_PER_REQUEST)]
+
+
+def _update_pending_action(pending, errors, action_json, status):
+    action = pending.get(action_json["id"])
+    if action is None:
+        return
+
+    with _MODEL_LOCK:
+        action.status = action_json["status"]
+        action.progress = action_json["progress"]
+        action.finished = action_json["finished"]
+        action.error = action_json["error"]
+
+    if action.status == status:
+        del pending[action.id]
+    elif action.status == ACTION_STATUS_ERROR:
+        errors[action.id] = HetznerInternalServerErrorException(action.error)
+        del pending[action.id]
+
 
 class HetznerCloudAction(object):
     """
@@ -19,6 +126,8 @@ class HetznerCloudAction(object):
 
     Instead, the cloud API returns an 'action', which can be used to check up on the status of specific tasks.
     """
+    __slots__ = ("config", "id", "command", "status", "progress", "started", "finished", "error", "resources")
+
     def __init__(self, config):
         self.config = config
         self.id = 0
@@ -28,36 +137,50 @@ class HetznerCloudAction(object):
         self.started = ""
         self.finished = ""
         self.error = { "code": "", "message": "" }
+        self.resources = []
 
-    def wait_until_status_is(self, status, attempts=20, wait_seconds=1):
+    def wait_until_status_is(self, status, attempts=None, wait_seconds=None, timeout=None, polling=None):
         """
-        Sleeps the executing thread (a second each loop) until the status is either what the user requires or the
-        attempt count is exceeded, in which case an exception is thrown.
+        Sleeps the executing thread until the status is either what the user requires or the time available runs out,
+        in which case an exception is thrown.
+
+        By default, the configured polling strategy decides how long to wait between polls (using the progress of the
+        action to estimate when it will finish), for up to `timeout` seconds. Passing `attempts` or `wait_seconds`
+        instead polls every `wait_seconds` seconds, at most `attempts` times.
 
         :param status: The status the action needs to be.
         :param attempts: The number of attempts to query the action's status.
         :param wait_seconds: The number of seconds to wait for between each attempt.
+        :param timeout: The maximum number of seconds to wait for (60 seconds if no other limit is specified).
+        :param polling: The HetznerCloudPollingStrategy deciding how long to wait between polls.
         :return: An exception, unless the status matches the status parameter.
         """
         if self.status == status:
             return
 
-        for i in range(0, attempts):
+        poller = _Poller(self.config, attempts, wait_seconds, timeout, polling)
+        while True:
             action_status = _get_action_json(self.config, self.id)
-            if action_status["status"] == status:
-                self.status = action_status
+            reached = action_status["status"] == status
+            with _MODEL_LOCK:
+                self.progress = action_status["progress"]
+                if reached:
+                    self.status = status
+            if reached:
                 return
 
             if action_status["status"] == ACTION_STATUS_ERROR:
                 raise HetznerInternalServerErrorException(action_status["error"])
 
-            time.sleep(wait_seconds)
+            delay = poller.next_delay(action_status["progress"])
+            if delay is None:
+                raise HetznerWaitAttemptsExceededException()
 
-        raise HetznerWaitAttemptsExceededException()
+            time.sleep(delay)
 
-    @staticmethod
-    def _load_from_json(configuration, json):
-        action = HetznerCloudAction(configuration)
+    @classmethod
+    def _load_from_json(cls, configuration, json):
+        action = cls(configuration)
 
         action.id = json["id"]
         action.command = json["command"]
@@ -66,5 +189,6 @@ class HetznerCloudAction(object):
         action.started = json["started"]
         action.finished = json["finished"]
         action.error = json["error"]
+        action.resources = json.get("resources") or []
 
         return action
\ No newline at end of file
@@ -0,0 +1,107 @@
+import asyncio
+
+from ..actions import HetznerCloudAction, _get_pending_actions, _chunk_action_ids, _update_pending_action, \
+    _get_slowest_progress, _ACTIONS_PER_REQUEST
+from ..constants import ACTION_STATUS_ERROR, ACTION_STATUS_SUCCESS
+from ..exceptions import HetznerWaitAttemptsExceededException, HetznerInternalServerErrorException, \
+    HetznerActionException
+from ..polling import _Poller
+from .shared import _get_results, _get_paginated_results
+
+
+async def _get_action_json(config, id):
+    status_code, json = await _get_results(config, "actions/%s" % id)
+    return json["action"]
+
+
+class AsyncHetznerCloudActionsAction(object):
+    def __init__(self, config):
+        self._config = config
+
+    async def get_all(self, status=None, sort=None, ids=None, per_page=None, max_items=None):
+        url_params = {}
+        if status is not None:
+            url_params["status"] = status
+        if sort is not None:
+            url_params["sort"] = sort
+        if ids is not None:
+            url_params["id"] = list(ids)
+
+        async for result in _get_paginated_results(self._config, "actions", "actions", url_params=url_params,
+                                                   per_page=per_page, max_items=max_items):
+            yield AsyncHetznerCloudAction._load_from_json(self._config, result)
+
+    async def get(self, id):
+        status_code, results = await _get_results(self._config, "actions/%s" % id)
+        if status_code != 200:
+            raise HetznerActionException(results)
+
+        return AsyncHetznerCloudAction._load_from_json(self._config, results["action"])
+
+    async def wait_for_actions(self, actions, status=ACTION_STATUS_SUCCESS, timeout=None, polling=None):
+        """
+        The asynchronous equivalent of HetznerCloudActionsAction.wait_for_actions.
+
+        :return: A list of (action, exception) tuples in the same order as the actions passed in.
+        """
+        pending = _get_pending_actions(actions, status)
+        errors = {}
+        poller = _Poller(self._config, timeout=timeout, polling=polling)
+
+        while pending:
+            for ids in _chunk_action_ids(pending):
+                async for action_json in _get_paginated_results(self._config, "actions", "actions", {"id": ids},
+                                                                per_page=_ACTIONS_PER_REQUEST):
+                    _update_pending_action(pending, errors, action_json, status)
+
+            if not pending:
+                break
+
+            delay = poller.next_delay(_get_slowest_progress(pending))
+            if delay is None:
+                for id in pending:
+                    errors[id] = HetznerWaitAttemptsExceededException()
+                break
+
+            await asyncio.sleep(delay)
+
+        return [(action, errors.get(action.id)) for action in actions]
+
+
+class AsyncHetznerCloudAction(HetznerCloudAction):
+    """
+    The asynchronous equivalent of HetznerCloudAction. Waiting for a status suspends the calling coroutine instead of
+    sleeping the executing thread.
+    """
+    __slots__ = ()
+
+    async def wait(self, status=ACTION_STATUS_SUCCESS, attempts=None, wait_seconds=None, timeout=None, polling=None):
+        """
+        Waits until the action has completed successfully (or has the status passed in). See wait_until_status_is.
+        """
+        await self.wait_until_status_is(status, attempts, wait_seconds, timeout, polling)
+
+    async def wait_until_status_is(self, status, attempts=None, wait_seconds=None, timeout=None, polling=None):
+        """
+        Suspends the calling coroutine until the status is either what the user requires or the time available runs
+        out, in which case an exception is thrown. See HetznerCloudAction.wait_until_status_is for the parameters.
+        """
+        if self.status == status:
+            return
+
+        poller = _Poller(self.config, attempts, wait_seconds, timeout, polling)
+        while True:
+            action_status = await _get_action_json(self.config, self.id)
+            self.progress = action_status["progress"]
+            if action_status["status"] == status:
+                self.status = action_status["status"]
+                return
+
+            if action_status["status"] == ACTION_STATUS_ERROR:
+                raise HetznerInternalServerErrorException(action_status["error"])
+
+            delay = poller.next_delay(self.progress)
+            if delay is None:
+                raise HetznerWaitAttemptsExceededException()
+
+            await asyncio.sleep(delay)
@@ -0,0 +1,87 @@
+import asyncio
+
+from ..client import _validate_configuration
+from ..retries import _get_last_request_statistics
+from .actions import AsyncHetznerCloudActionsAction
+from .datacenters import AsyncHetznerCloudDatacentersAction
+from .floating_ips import AsyncHetznerCloudFloatingIpAction
+from .images import AsyncHetznerCloudImagesAction
+from .isos import AsyncHetznerCloudIsosAction
+from .locations import AsyncHetznerCloudLocationsAction
+from .server_types import AsyncHetznerCloudServerTypesAction
+from .servers import AsyncHetznerCloudServersAction
+from .ssh_keys import AsyncHetznerCloudSSHKeysAction
+
+
+class AsyncHetznerCloudClient(object):
+    """
+    An asyncio based client that mirrors HetznerCloudClient. Every request method is a coroutine, every get_all()
+    method is an asynchronous generator and all requests made from an event loop share a single pool of connections
+    owned by the configuration.
+    """
+    def __init__(self, configuration):
+        _validate_configuration(configuration)
+
+        self.configuration = configuration
+
+        # alias for datacentres method
+        self.datacenters = self.datacentres
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """
+        Closes the pooled connections used by this client in the running event loop.
+        """
+        with self.configuration._session_lock:
+            session = self.configuration._async_sessions.pop(asyncio.get_event_loop(), None)
+        if session is not None:
+            await session.close()
+
+    def last_request_statistics(self):
+        """
+        Returns the number of attempts and the total time spent waiting between them for the last API call made by the
+        current asyncio task, or None if no call has been made yet.
+        """
+        return _get_last_request_statistics()
+
+    def stats(self):
+        """
+        Returns the requests made with this client's configuration so far, grouped by endpoint. See
+        HetznerCloudClient.stats().
+        """
+        if self.configuration.statistics is None:
+            return {}
+
+        return self.configuration.statistics.get()
+
+    def actions(self):
+        return AsyncHetznerCloudActionsAction(self.configuration)
+
+    def datacentres(self):
+        return AsyncHetznerCloudDatacentersAction(self.configuration)
+
+    def floating_ips(self):
+        return AsyncHetznerCloudFloatingIpAction(self.configuration)
+
+    def images(self):
+        return AsyncHetznerCloudImagesAction(self.configuration)
+
+    def isos(self):
+        return AsyncHetznerCloudIsosAction(self.configuration)
+
+    def locations(self):
+        return AsyncHetznerCloudLocationsAction(self.configuration)
+
+    def server_types(self):
+        return AsyncHetznerCloudServerTypesAction(self.configuration)
+
+    def servers(self):
+        return AsyncHetznerCloudServersAction(self.configuration)
+
+    def ssh_keys(self):
+        return AsyncHetznerCloudSSHKeysAction(self.configuration)
@@ -0,0 +1,93 @@
+from ..exceptions import HetznerInvalidArgumentException, HetznerActionException
+from ..floating_ips import HetznerCloudFloatingIp
+from .actions import AsyncHetznerCloudAction
+from .shared import _get_results, _get_paginated_results
+
+
+class AsyncHetznerCloudFloatingIpAction(object):
+    def __init__(self, config):
+        self._config = config
+
+    async def create(self, type, home_location=None, server=None, description=None):
+        if home_location is None and server is None:
+            raise HetznerInvalidArgumentException("home_location_id and server")
+
+        body = {"type": type}
+        if home_location is not None:
+            body["home_location"] = home_location
+        if server is not None:
+            body["server"] = server
+        if description is not None:
+            body["description"] = description
+
+        status_code, results = await _get_results(self._config, "floating_ips", method="POST", body=body)
+        if status_code != 201:
+            raise HetznerActionException(results)
+
+        return AsyncHetznerCloudFloatingIp._load_from_json(self._config, results["floating_ip"])
+
+    async def get_all(self, per_page=None, max_items=None):
+        async for result in _get_paginated_results(self._config, "floating_ips", "floating_ips", per_page=per_page,
+                                                   max_items=max_items):
+            yield AsyncHetznerCloudFloatingIp._load_from_json(self._config, result)
+
+    async def get(self, id):
+        status_code, result = await _get_results(self._config, "floating_ips/%s" % id)
+        if status_code != 200:
+            raise HetznerActionException(result)
+
+        return AsyncHetznerCloudFloatingIp._load_from_json(self._config, result["floating_ip"])
+
+
+class AsyncHetznerCloudFloatingIp(HetznerCloudFloatingIp):
+    __slots__ = ()
+
+    async def assign_to_server(self, server_id):
+        if not server_id:
+            raise HetznerInvalidArgumentException("server_id")
+
+        status_code, result = await _get_results(self._config, "floating_ips/%s/actions/assign" % self.id,
+                                                 method="POST", body={"server": server_id})
+        if status_code != 201:
+            raise HetznerActionException(result)
+
+        self.server = server_id
+
+        return AsyncHetznerCloudAction._load_from_json(self._config, result["action"])
+
+    async def change_description(self, new_description):
+        status_code, result = await _get_results(self._config, "floating_ips/%s" % self.id, method="PUT",
+                                                 body={"description": new_description})
+        if status_code != 200:
+            raise HetznerActionException(result)
+
+        self.description = new_description
+
+    async def change_reverse_dns_entry(self, ip, dns_ptr=None):
+        if not ip:
+            raise HetznerInvalidArgumentException("ip")
+
+        status_code, result = await _get_results(self._config, "floating_ips/%s/actions/change_dns_ptr" % self.id,
+                                                 method="POST", body={"ip": ip, "dns_ptr": dns_ptr})
+        if status_code != 201:
+            raise HetznerActionException(result)
+
+        self.ptr_ips = [ip]
+        self.ptr_dns_ptrs = [dns_ptr]
+
+        return AsyncHetznerCloudAction._load_from_json(self._config, result["action"])
+
+    async def delete(self):
+        status_code, result = await _get_results(self._config, "floating_ips/%s" % self.id, method="DELETE")
+        if status_code != 204:
+            raise HetznerActionException(result)
+
+    async def unassign_from_server(self):
+        status_code, result = await _get_results(self._config, "floating_ips/%s/actions/unassign" % self.id,
+                                                 method="POST")
+        if status_code != 201:
+            raise HetznerActionException(result)
+
+        self.server = 0
+
+        return AsyncHetznerCloudAction._load_from_json(self._config, result["action"])
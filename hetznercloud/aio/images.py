@@ -0,0 +1,59 @@
+from ..constants import IMAGE_TYPE_SYSTEM
+from ..exceptions import HetznerActionException
+from ..images import HetznerCloudImage
+from .shared import _get_results, _get_paginated_results, _get_catalog_results, _get_cached_record
+
+
+class AsyncHetznerCloudImagesAction(object):
+    def __init__(self, config):
+        self._config = config
+
+    async def get_all(self, sort=None, type=None, bound_to=None, name=None, per_page=None, max_items=None):
+        url_params = {}
+        if sort is not None:
+            url_params["sort"] = sort
+        if type is not None:
+            url_params["type"] = type
+        if bound_to is not None:
+            url_params["bound_to"] = bound_to
+        if name is not None:
+            url_params["name"] = name
+
+        get_results = _get_catalog_results if type == IMAGE_TYPE_SYSTEM else _get_paginated_results
+        async for result in get_results(self._config, "images", "images", url_params=url_params, per_page=per_page,
+                                        max_items=max_items):
+            yield AsyncHetznerCloudImage._load_from_json(self._config, result)
+
+    async def get(self, id):
+        result = _get_cached_record(self._config, "images", id)
+        if result is None:
+            status_code, results = await _get_results(self._config, "images/%s" % id)
+            if status_code != 200:
+                raise HetznerActionException(results)
+
+            result = results["image"]
+
+        return AsyncHetznerCloudImage._load_from_json(self._config, result)
+
+
+class AsyncHetznerCloudImage(HetznerCloudImage):
+    __slots__ = ()
+
+    async def update(self, description=None, type=None):
+        body = {}
+        if description is not None:
+            body["description"] = description
+        if type is not None:
+            body["type"] = type
+
+        status_code, result = await _get_results(self._config, "images/%s" % self.id, method="PUT", body=body)
+        if status_code != 200:
+            raise HetznerActionException(result)
+
+        self.description = description
+        self.type = type
+
+    async def delete(self):
+        status_code, result = await _get_results(self._config, "images/%s" % self.id, method="DELETE")
+        if status_code != 204:
+            raise HetznerActionException(result)
@@ -0,0 +1,25 @@
+from ..exceptions import HetznerActionException
+from ..isos import HetznerCloudIso
+from .shared import _get_results, _get_catalog_results, _get_cached_record
+
+
+class AsyncHetznerCloudIsosAction(object):
+    def __init__(self, config):
+        self._config = config
+
+    async def get_all(self, name=None, per_page=None, max_items=None):
+        async for result in _get_catalog_results(self._config, "isos", "isos",
+                                                 url_params={"name": name} if name is not None else None,
+                                                 per_page=per_page, max_items=max_items):
+            yield HetznerCloudIso._load_from_json(result)
+
+    async def get(self, id):
+        result = _get_cached_record(self._config, "isos", id)
+        if result is None:
+            status_code, results = await _get_results(self._config, "isos/%s" % id)
+            if status_code != 200:
+                raise HetznerActionException(results)
+
+            result = results["iso"]
+
+        return HetznerCloudIso._load_from_json(result)
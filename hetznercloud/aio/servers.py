@@ -0,0 +1,251 @@
+import asyncio
+
+from ..constants import RESCUE_TYPE_LINUX, RESCUE_TYPE_FREEBSD, BACKUP_WINDOW_2AM_6AM, SERVER_STATUS_RUNNING, \
+    SERVER_STATUS_OFF
+from ..exceptions import HetznerServerNotFoundException, HetznerInvalidArgumentException, HetznerActionException, \
+    HetznerWaitAttemptsExceededException
+from ..polling import _Poller
+from ..servers import HetznerCloudServer
+from ..tables import HetznerCloudServerTable
+from .actions import AsyncHetznerCloudAction
+from .shared import _get_results, _get_paginated_results
+
+
+async def _get_server_json(config, server_id):
+    status_code, result = await _get_results(config, "servers/%s" % server_id)
+    if status_code == 404:
+        raise HetznerServerNotFoundException()
+
+    if not "server" in result:
+        raise HetznerActionException(result)
+
+    return result["server"]
+
+
+class AsyncHetznerCloudServersAction(object):
+    def __init__(self, config):
+        self._config = config
+
+    async def create(self, name, server_type, image, datacenter=None, start_after_create=True, ssh_keys=[],
+                     user_data=None, location=None):
+        if not name or not server_type or not image:
+            raise HetznerInvalidArgumentException("name" if not name
+                                                  else "server_type" if not server_type
+                                                  else "image")
+
+        create_params = {
+            "name": name,
+            "server_type": server_type,
+            "image": image,
+            "start_after_create": start_after_create
+        }
+
+        if location is not None:
+            create_params["location"] = location
+        if datacenter is not None:
+            create_params["datacenter"] = datacenter
+        if ssh_keys is not None and len(ssh_keys) > 0:
+            create_params["ssh_keys"] = ssh_keys
+        if user_data is not None:
+            create_params["user_data"] = user_data
+
+        status_code, result = await _get_results(self._config, "servers", body=create_params, method="POST")
+        if status_code != 201 or result is None or ("error" in result and result["error"] is not None):
+            raise HetznerActionException(result)
+
+        return AsyncHetznerCloudServer._load_from_json(self._config, result["server"], result["root_password"]), \
+               AsyncHetznerCloudAction._load_from_json(self._config, result["action"])
+
+    async def get(self, server_id):
+        if not isinstance(server_id, int) or server_id == 0:
+            raise HetznerServerNotFoundException()
+
+        return AsyncHetznerCloudServer._load_from_json(self._config, await _get_server_json(self._config, server_id))
+
+    async def get_all(self, name=None, per_page=None, max_items=None):
+        async for result in _get_paginated_results(self._config, "servers", "servers",
+                                                   {"name": name} if name is not None else None,
+                                                   per_page=per_page, max_items=max_items):
+            yield AsyncHetznerCloudServer._load_from_json(self._config, result)
+
+    async def snapshot(self, name=None, per_page=50):
+        table = HetznerCloudServerTable()
+        async for result in _get_paginated_results(self._config, "servers", "servers",
+                                                   {"name": name} if name is not None else None, per_page=per_page):
+            table._append(result)
+
+        return table
+
+
+class AsyncHetznerCloudServer(HetznerCloudServer):
+    """
+    The asynchronous equivalent of HetznerCloudServer. Every modifier is a coroutine, and every action returned can be
+    awaited with AsyncHetznerCloudAction.wait().
+    """
+    __slots__ = ()
+
+    async def _perform_action(self, action, body=None):
+        status_code, result = await _get_results(self._config, "servers/%s/actions/%s" % (self.id, action),
+                                                 method="POST", body=body)
+        if status_code != 201:
+            raise HetznerActionException(result)
+
+        return result
+
+    async def attach_iso(self, iso):
+        if not iso:
+            raise HetznerInvalidArgumentException("iso")
+
+        result = await self._perform_action("attach_iso", {"iso": iso})
+        self.iso = iso
+
+        return AsyncHetznerCloudAction._load_from_json(self._config, result["action"])
+
+    async def change_name(self, new_name):
+        if not new_name:
+            raise HetznerInvalidArgumentException("new_name")
+
+        status_code, result = await _get_results(self._config, "servers/%s" % self.id, method="PUT",
+                                                 body={"name": new_name})
+        if status_code != 200:
+            raise HetznerActionException(result)
+
+        self.name = new_name
+
+    async def change_reverse_dns_entry(self, ip, dns_pointer=None):
+        if not ip:
+            raise HetznerInvalidArgumentException("ip")
+
+        result = await self._perform_action("change_dns_ptr", {"ip": ip, "dns_ptr": dns_pointer})
+
+        return AsyncHetznerCloudAction._load_from_json(self._config, result["action"])
+
+    async def change_type(self, new_instance_type, upgrade_disk=True):
+        if not new_instance_type:
+            raise HetznerInvalidArgumentException("new_instance_type")
+
+        result = await self._perform_action("change_type", {"server_type": new_instance_type,
+                                                            "upgrade_disk": upgrade_disk})
+        self.server_type = new_instance_type
+
+        return AsyncHetznerCloudAction._load_from_json(self._config, result["action"])
+
+    async def delete(self):
+        status_code, result = await _get_results(self._config, "servers/%s" % self.id, method="DELETE")
+        if status_code != 200:
+            raise HetznerActionException(result)
+
+        self.iso = ""
+
+        return AsyncHetznerCloudAction._load_from_json(self._config, result["action"])
+
+    async def detach_iso(self):
+        result = await self._perform_action("detach_iso")
+        self.iso = ""
+
+        return AsyncHetznerCloudAction._load_from_json(self._config, result["action"])
+
+    async def disable_rescue_mode(self):
+        result = await self._perform_action("disable_rescue")
+        self.rescue_enabled = False
+
+        return AsyncHetznerCloudAction._load_from_json(self._config, result["action"])
+
+    async def enable_backups(self, backup_window=BACKUP_WINDOW_2AM_6AM):
+        status_code, result = await _get_results(self._config, "servers/%s/actions/enable_backup" % self.id,
+                                                 method="POST", body={"backup_window": backup_window})
+        if status_code != 201:
+            raise HetznerActionException("Invalid backup window choice" if status_code == 422 else result)
+
+        self.backup_window = backup_window
+
+        return AsyncHetznerCloudAction._load_from_json(self._config, result["action"])
+
+    async def enable_rescue_mode(self, rescue_type=RESCUE_TYPE_LINUX, ssh_keys=[]):
+        """
+        Enables rescue mode for the current server. See HetznerCloudServer.enable_rescue_mode for details.
+
+        :param rescue_type: The rescue image to use.
+        :param ssh_keys: An array of SSH key ids to load into the rescue mode (if it is linux based)
+        :return: A tuple containing the root SSH password to access the recovery mode and the action to track the
+                 progress of the request.
+        """
+        body = {"type": rescue_type}
+        if ssh_keys and len(ssh_keys) > 0 and rescue_type != RESCUE_TYPE_FREEBSD:
+            body["ssh_keys"] = ssh_keys
+
+        result = await self._perform_action("enable_rescue", body)
+        self.rescue_enabled = True
+
+        return result["root_password"], AsyncHetznerCloudAction._load_from_json(self._config, result["action"])
+
+    async def image(self, description=None, image_type="snapshot"):
+        body = {"type": image_type}
+        if description is not None:
+            body["description"] = description
+
+        result = await self._perform_action("create_image", body)
+
+        return result["image"]["id"], AsyncHetznerCloudAction._load_from_json(self._config, result["action"])
+
+    async def power_on(self):
+        result = await self._perform_action("poweron")
+        self.status = SERVER_STATUS_RUNNING
+
+        return AsyncHetznerCloudAction._load_from_json(self._config, result["action"])
+
+    async def power_off(self):
+        result = await self._perform_action("poweroff")
+        self.status = SERVER_STATUS_OFF
+
+        return AsyncHetznerCloudAction._load_from_json(self._config, result["action"])
+
+    async def soft_reboot(self):
+        result = await self._perform_action("reboot")
+
+        return AsyncHetznerCloudAction._load_from_json(self._config, result["action"])
+
+    async def rebuild_from_image(self, image):
+        if not image:
+            raise HetznerInvalidArgumentException("image")
+
+        result = await self._perform_action("rebuild", {"image": image})
+        self.image_id = image
+
+        return AsyncHetznerCloudAction._load_from_json(self._config, result["action"])
+
+    async def reset(self):
+        result = await self._perform_action("reset")
+
+        return AsyncHetznerCloudAction._load_from_json(self._config, result["action"])
+
+    async def reset_root_password(self):
+        result = await self._perform_action("reset_password")
+
+        return result["root_password"], AsyncHetznerCloudAction._load_from_json(self._config, result["action"])
+
+    async def shutdown(self):
+        result = await self._perform_action("shutdown")
+
+        return AsyncHetznerCloudAction._load_from_json(self._config, result["action"])
+
+    async def wait_until_status_is(self, status, attempts=None, wait_seconds=None, timeout=None, polling=None):
+        """
+        Suspends the calling coroutine until the status is either what the user requires or the time available runs
+        out, in which case an exception is thrown. See HetznerCloudServer.wait_until_status_is for the parameters.
+        """
+        if self.status == status:
+            return
+
+        poller = _Poller(self._config, attempts, wait_seconds, timeout, polling)
+        while True:
+            server_status = (await _get_server_json(self._config, self.id))["status"]
+            if server_status == status:
+                self.status = server_status
+                return
+
+            delay = poller.next_delay()
+            if delay is None:
+                raise HetznerWaitAttemptsExceededException()
+
+            await asyncio.sleep(delay)
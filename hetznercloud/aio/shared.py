@@ -0,0 +1,126 @@
+import asyncio
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from ..exceptions import HetznerConfigurationException, HetznerActionException
+from ..retries import _RequestAttempts
+from ..shared import _build_request, _handle_response, _get_cached_response, _handle_cached_response, _get_pagination_params, _validate_pagination_args, _get_next_page, _get_cached_record
+
+
+def _create_async_session(config):
+    """
+    Creates the aiohttp session used by the asynchronous client. Like the synchronous session, it holds a pool of
+    keep-alive connections shared by every action and model created from the configuration.
+    """
+    if aiohttp is None:
+        raise HetznerConfigurationException("The aiohttp package is required to use the asynchronous client.")
+
+    connector = aiohttp.TCPConnector(limit=config.pool_size * config.max_connections_per_host,
+                                     limit_per_host=config.max_connections_per_host,
+                                     force_close=not config.keep_alive)
+    return aiohttp.ClientSession(connector=connector)
+
+
+def _get_async_session(config):
+    """
+    Returns the session of the running event loop. An aiohttp session can only be used from the event loop it was
+    created in, so a configuration shared between event loops holds a session for each of them.
+    """
+    loop = asyncio.get_event_loop()
+    with config._session_lock:
+        session = config._async_sessions.get(loop)
+        if session is None or session.closed:
+            session = config._async_sessions[loop] = _create_async_session(config)
+        return session
+
+
+def _encode_params(url_params):
+    if not url_params:
+        return None
+
+    encoded = []
+    for key, value in url_params.items():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        encoded.extend((key, str(v)) for v in values if v is not None)
+
+    return encoded
+
+
+async def _get_results(config, endpoint, url_params=None, body=None, method="GET"):
+    url, headers, data = _build_request(config, endpoint, body)
+    attempts = _RequestAttempts(config, method, endpoint, data)
+    cache_key, cache_entry = _get_cached_response(config, method, url, url_params, headers)
+    session = _get_async_session(config)
+
+    while True:
+        delay = attempts.acquire()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        attempts.start()
+        try:
+            async with session.request(method, url, headers=headers, params=_encode_params(url_params),
+                                       data=data) as response:
+                content = await response.read()
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            delay = attempts.failed(e)
+            if delay is None:
+                raise
+        else:
+            delay = attempts.finished(response.status, response.headers, len(content))
+            if delay is None:
+                status_code, content = _handle_cached_response(config, cache_key, cache_entry, response.status,
+                                                               response.headers, content)
+                return _handle_response(config, status_code, content)
+
+        await asyncio.sleep(delay)
+
+
+async def _get_paginated_results(config, endpoint, key, url_params=None, per_page=None, max_items=None):
+    """
+    The asynchronous equivalent of hetznercloud.shared._get_paginated_results. Pages are requested lazily as the
+    generator is consumed.
+    """
+    params = _get_pagination_params(url_params, per_page, max_items)
+
+    page = 1
+    yielded = 0
+    while page is not None and (max_items is None or yielded < max_items):
+        params["page"] = page
+        status_code, results = await _get_results(config, endpoint, url_params=params)
+        if status_code != 200:
+            raise HetznerActionException(results)
+
+        for result in results[key]:
+            if max_items is not None and yielded >= max_items:
+                return
+
+            yield result
+            yielded += 1
+
+        page = _get_next_page(results)
+
+
+async def _get_catalog_results(config, endpoint, key, url_params=None, per_page=None, max_items=None):
+    """
+    The asynchronous equivalent of hetznercloud.shared._get_catalog_results.
+    """
+    cache = config.catalog_cache
+    if cache is None:
+        async for result in _get_paginated_results(config, endpoint, key, url_params, per_page, max_items):
+            yield result
+        return
+
+    _validate_pagination_args(per_page, max_items)
+
+    records = cache._get(endpoint, url_params)
+    if records is None:
+        records = [record async for record in _get_paginated_results(config, endpoint, key, url_params,
+                                                                     per_page=per_page)]
+        cache._put(endpoint, url_params, records)
+
+    for record in (records if max_items is None else records[:max_items]):
+        yield record
@@ -0,0 +1,54 @@
+from ..exceptions import HetznerInvalidArgumentException, HetznerActionException
+from ..ssh_keys import HetznerCloudSSHKey
+from .shared import _get_results, _get_paginated_results
+
+
+class AsyncHetznerCloudSSHKeysAction(object):
+    def __init__(self, config):
+        self._config = config
+
+    async def get_all(self, name=None, per_page=None, max_items=None):
+        async for result in _get_paginated_results(self._config, "ssh_keys", "ssh_keys",
+                                                   url_params={"name": name} if name is not None else None,
+                                                   per_page=per_page, max_items=max_items):
+            yield AsyncHetznerCloudSSHKey._load_from_json(self._config, result)
+
+    async def get(self, id):
+        status_code, result = await _get_results(self._config, "ssh_keys/%s" % id)
+        if status_code != 200:
+            raise HetznerActionException(result)
+
+        return AsyncHetznerCloudSSHKey._load_from_json(self._config, result["ssh_key"])
+
+    async def create(self, name, public_key):
+        if not name:
+            raise HetznerInvalidArgumentException("name")
+        if not public_key:
+            raise HetznerInvalidArgumentException("public_key")
+
+        status_code, result = await _get_results(self._config, "ssh_keys", method="POST",
+                                                 body={"name": name, "public_key": public_key})
+        if status_code != 201:
+            raise HetznerActionException(result)
+
+        return AsyncHetznerCloudSSHKey._load_from_json(self._config, result["ssh_key"])
+
+
+class AsyncHetznerCloudSSHKey(HetznerCloudSSHKey):
+    __slots__ = ()
+
+    async def delete(self):
+        status_code, result = await _get_results(self._config, "ssh_keys/%s" % self.id, method="DELETE")
+        if status_code != 204:
+            raise HetznerActionException(result)
+
+    async def update(self, name):
+        if not name:
+            raise HetznerInvalidArgumentException("name")
+
+        status_code, result = await _get_results(self._config, "ssh_keys/%s" % self.id, method="PUT",
+                                                 body={"name": name})
+        if status_code != 200:
+            raise HetznerActionException(result)
+
+        self.name = name
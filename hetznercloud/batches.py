@@ -0,0 +1,33 @@
+from concurrent.futures import ThreadPoolExecutor
+
+
+class HetznerCloudBatchResult(object):
+    """
+    The outcome of a single item of a batch operation (such as creating many servers at once).
+    """
+    def __init__(self, item):
+        self.item = item
+        self.server = None
+        self.action = None
+        self.error = None
+        self.rolled_back = False
+        self.rollback_error = None
+
+    @property
+    def succeeded(self):
+        # A server that was rolled back no longer exists, and one that could not be rolled back is still running (and
+        # billed), so neither counts as a success.
+        return self.error is None and not self.rolled_back and self.rollback_error is None
+
+
+def _run_concurrently(function, items, max_concurrency):
+    """
+    Calls the function with every item, running at most `max_concurrency` calls at once, and waits for them all to
+    finish. The function is expected to record its own outcome, so any exception it raises is re-raised here.
+    """
+    if not items:
+        return
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        for future in [executor.submit(function, item) for item in items]:
+            future.result()
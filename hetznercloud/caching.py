@@ -0,0 +1,234 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+_SUFFIX = ".json"
+_TEMPORARY_PREFIX = ".tmp-"
+# The number of seconds after which a temporary file is considered abandoned by a process that crashed whilst writing.
+_ABANDONED_AFTER = 3600
+
+
+class HetznerCloudCatalogCache(object):
+    """
+    An in-memory cache for the listings of resources that rarely change (server types, locations, datacenters, ISOs and
+    system images). Each listing is kept for a time-to-live that can be configured per resource, and the least recently
+    used listings are evicted once more than `max_entries` are held.
+    """
+    def __init__(self, ttls=None, default_ttl=3600, max_entries=128):
+        """
+        :param ttls: A dictionary of resource names (i.e. server_types) to the number of seconds their listings are
+                     cached for.
+        :param default_ttl: The number of seconds to cache listings of resources not present in `ttls`.
+        :param max_entries: The maximum number of listings to hold.
+        """
+        self.ttls = dict(ttls) if ttls else {}
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def invalidate(self, resource=None):
+        """
+        Removes the cached listings of a resource, or of every resource if none is specified.
+
+        :param resource: The name of the resource (i.e. server_types).
+        """
+        with self._lock:
+            for key in list(self._entries):
+                if resource is None or key[0] == resource:
+                    del self._entries[key]
+
+    def _get(self, resource, url_params):
+        key = _get_key(resource, url_params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def _put(self, resource, url_params, records):
+        key = _get_key(resource, url_params)
+        expires = time.monotonic() + self.ttls.get(resource, self.default_ttl)
+        with self._lock:
+            self._entries[key] = (expires, records)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _find(self, resource, id):
+        """
+        Looks for a single resource by id in every cached listing of that resource.
+        """
+        now = time.monotonic()
+        with self._lock:
+            for key, (expires, records) in self._entries.items():
+                if key[0] != resource or expires <= now:
+                    continue
+
+                for record in records:
+                    if str(record["id"]) == str(id):
+                        self.hits += 1
+                        return record
+
+            self.misses += 1
+            return None
+
+
+def _get_key(resource, url_params):
+    return resource, tuple(sorted((url_params or {}).items()))
+
+
+class HetznerCloudResponseCache(object):
+    """
+    A cache of GET responses kept on disk, so that short-lived processes (such as CLI runs and cron jobs) can share the
+    responses downloaded by earlier ones. Responses are only stored when the API sends an ETag or Last-Modified
+    validator, and are revalidated on every use with If-None-Match and If-Modified-Since headers: a 304 response is
+    served from the cache, anything else replaces the cached response.
+
+    Every response is written to its own file and atomically moved into place, so several processes can share a cache
+    directory. Once the cache grows beyond `max_size` bytes or `max_entries` responses, the least recently used
+    responses are removed.
+    """
+    def __init__(self, directory, max_size=50 * 1024 * 1024, max_entries=1000):
+        """
+        :param directory: The directory to keep the cached responses in. It is created if it does not exist.
+        :param max_size: The maximum number of bytes the cached responses may take up.
+        :param max_entries: The maximum number of responses to keep.
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def clear(self):
+        """
+        Removes every cached response.
+        """
+        for name, _, _ in self._list_entries():
+            _remove(os.path.join(self.directory, name))
+
+    def _get_key(self, api_key, url, url_params):
+        """
+        Builds the name of the file that holds a response. The API key is part of the key (as responses differ between
+        projects), but is only ever stored hashed.
+        """
+        identity = json.dumps([api_key, url, url_params or {}], sort_keys=True, default=str)
+        return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+    def _load(self, key):
+        """
+        Returns the cached response stored under the key, or None (counting a miss) if there is no (readable) response.
+        """
+        try:
+            with open(self._get_path(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            entry = None
+
+        if not isinstance(entry, dict) or "text" not in entry:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        return entry
+
+    def _get_validators(self, entry):
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def _revalidated(self, key, entry):
+        """
+        Records that the API confirmed a cached response is still current, returning its body.
+        """
+        with self._lock:
+            self.hits += 1
+        try:
+            os.utime(self._get_path(key))
+        except OSError:
+            pass
+        return entry["text"]
+
+    def _store(self, key, headers, text):
+        """
+        Stores a successful response if it carries a validator, then evicts the least recently used responses if the
+        cache has grown too large.
+        """
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if etag is None and last_modified is None:
+            return
+
+        fd, temporary_path = tempfile.mkstemp(dir=self.directory, prefix=_TEMPORARY_PREFIX)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"etag": etag, "last_modified": last_modified, "text": text}, f)
+            os.replace(temporary_path, self._get_path(key))
+        except OSError:
+            _remove(temporary_path)
+            return
+
+        self._evict()
+
+    def _evict(self):
+        entries = sorted(self._list_entries(), key=lambda entry: entry[2])
+        total_size = sum(size for _, size, _ in entries)
+
+        while entries and (total_size > self.max_size or len(entries) > self.max_entries):
+            name, size, _ = entries.pop(0)
+            _remove(os.path.join(self.directory, name))
+            total_size -= size
+
+    def _list_entries(self):
+        """
+        Lists the (file name, size, last used time) of every cached response. Files removed by another process whilst
+        listing are skipped, and temporary files abandoned by a crashed writer are cleaned up.
+        """
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return entries
+
+        now = time.time()
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+
+            if name.startswith(_TEMPORARY_PREFIX):
+                if now - stat.st_mtime > _ABANDONED_AFTER:
+                    _remove(path)
+            elif name.endswith(_SUFFIX):
+                entries.append((name, stat.st_size, stat.st_mtime))
+
+        return entries
+
+    def _get_path(self, key):
+        return os.path.join(self.directory, key + _SUFFIX)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -1,18 +1,43 @@
-from .floating_ips import HetznerCloudFloatingIpAction
-from .ssh_keys import HetznerCloudSSHKeysAction
-from .images import HetznerCloudImagesAction
-from .datacenters import HetznerCloudDatacentersAction
+import threading
+import weakref
+
+from .instrumentation import HetznerCloudStatisticsCollector
+from .coalescing import HetznerCloudRequestCoalescer
+from .caching import HetznerCloudCatalogCache, HetznerCloudResponseCache
 from .exceptions import HetznerConfigurationException
-from .isos import HetznerCloudIsosAction
-from .locations import HetznerCloudLocationsAction
-from .server_types import HetznerCloudServerTypesAction
-from .servers import HetznerCloudServersAction
+from .polling import HetznerCloudPollingStrategy, HetznerCloudProgressPolling
+from .rate_limiting import HetznerCloudRateLimiter
+from .retries import HetznerCloudRetryPolicy, _get_last_request_statistics
+from .serialization import HetznerCloudJsonCodec, _get_default_codec
+
+# The resource actions, and the HTTP stack behind them, are imported by the methods that need them, so that creating
+# a configuration (or importing the package) does not load requests.
 
 
 class HetznerCloudClientConfiguration(object):
     def __init__(self):
         self.api_key = ""
         self.api_version = 1
+        self.base_url = "https://api.hetzner.cloud"
+        self.pool_size = 10
+        self.max_connections_per_host = 10
+        self.keep_alive = True
+        self.rate_limiter = None
+        self.retry_policy = None
+        self.polling_strategy = HetznerCloudProgressPolling()
+        self.catalog_cache = None
+        self.response_cache = None
+        self.request_coalescer = None
+        self.lazy_decoding = False
+        self.json_codec = _get_default_codec()
+        self.statistics = HetznerCloudStatisticsCollector()
+        self.before_request_hooks = []
+        self.after_request_hooks = []
+        self._adapter = None
+        self._adapter_generation = 0
+        self._sessions = threading.local()
+        self._session_lock = threading.Lock()
+        self._async_sessions = weakref.WeakKeyDictionary()
 
     def with_api_key(self, key):
         self.api_key = key
@@ -31,43 +56,333 @@ class HetznerCloudClientConfiguration(object):
         self.api_version = version
         return self
 
+    def with_base_url(self, base_url):
+        """
+        Modifies the address the API is reached at, which is useful for talking to the API through a proxy, or to a
+        local stand-in for it (see hetznercloud.testing.HetznerCloudMockServer).
 
-class HetznerCloudClient(object):
-    def __init__(self, configuration):
-        if not isinstance(configuration, HetznerCloudClientConfiguration):
-            raise HetznerConfigurationException("Invalid configuration type.")
+        :param base_url: The scheme and host (and optionally the port) of the API, i.e. http://127.0.0.1:8080.
+        :return: The current instance of the cloud configuration object to allow fluent chaining.
+        """
+        if not base_url or not base_url.startswith(("http://", "https://")):
+            raise HetznerConfigurationException("The base URL must be an http:// or https:// URL.")
+
+        self.base_url = base_url.rstrip("/")
+        return self
+
+    def with_connection_pool(self, pool_size=10, max_connections_per_host=10, keep_alive=True):
+        """
+        Modifies the connection pool used by every request made with this configuration. Connections are kept alive
+        and reused between calls, so only the first request to the API pays for the TCP and TLS handshakes.
+
+        :param pool_size: The number of per-host connection pools to cache.
+        :param max_connections_per_host: The maximum number of connections kept open to a single host.
+        :param keep_alive: Whether connections should be kept open and reused between requests.
+        :return: The current instance of the cloud configuration object to allow fluent chaining.
+        """
+        if not isinstance(pool_size, int) or pool_size < 1:
+            raise HetznerConfigurationException("The connection pool size must be a positive integer.")
 
-        if not configuration.api_key:
-            raise HetznerConfigurationException("Invalid API key.")
+        if not isinstance(max_connections_per_host, int) or max_connections_per_host < 1:
+            raise HetznerConfigurationException("The maximum connections per host must be a positive integer.")
+
+        self.pool_size = pool_size
+        self.max_connections_per_host = max_connections_per_host
+        self.keep_alive = keep_alive
+        self.close()
+        return self
 
-        if not isinstance(configuration.api_version, int) or configuration.api_version != 1:
-            raise HetznerConfigurationException("The requested API version is not yet supported.")
+    def with_rate_limiter(self, wait=True, max_wait=None):
+        """
+        Adds a client-side rate limiter that is shared by every request made with this configuration. The limiter is
+        seeded from the rate limit headers returned by the API, and stops the client from exceeding its request budget.
+
+        The remaining budget can be inspected at any time through the `rate_limiter` attribute.
+
+        :param wait: Whether a request that would exceed the budget should wait until it can be made (True) or
+                     immediately raise a HetznerRateLimitExceeded exception (False).
+        :param max_wait: The maximum number of seconds a request may wait before a HetznerRateLimitExceeded exception
+                         is raised, or None to wait for as long as necessary.
+        :return: The current instance of the cloud configuration object to allow fluent chaining.
+        """
+        self.rate_limiter = HetznerCloudRateLimiter(wait=wait, max_wait=max_wait)
+        return self
+
+    def with_retry_policy(self, max_attempts=3, backoff_factor=0.5, max_backoff=30, jitter=True, retry_post=False):
+        """
+        Retries requests that fail with a transient error (a connection error, a 429 or a 5xx status code), waiting
+        an exponentially growing, randomised amount of time between attempts. A Retry-After header sent by the API
+        takes precedence over the computed wait.
+
+        :param max_attempts: The maximum number of times a request is sent, including the first attempt.
+        :param backoff_factor: The number of seconds to wait before the first retry. Each further retry doubles it.
+        :param max_backoff: The maximum number of seconds to wait between two attempts.
+        :param jitter: Whether waits should be randomised between zero and the computed backoff.
+        :param retry_post: Whether POST requests (which start actions, and so are not idempotent) should be retried.
+        :return: The current instance of the cloud configuration object to allow fluent chaining.
+        """
+        if not isinstance(max_attempts, int) or max_attempts < 1:
+            raise HetznerConfigurationException("The maximum number of attempts must be a positive integer.")
+
+        self.retry_policy = HetznerCloudRetryPolicy(max_attempts=max_attempts, backoff_factor=backoff_factor,
+                                                    max_backoff=max_backoff, jitter=jitter, retry_post=retry_post)
+        return self
+
+    def with_polling_strategy(self, strategy):
+        """
+        Modifies the strategy used to decide how long to wait between polls when waiting for an action or a server to
+        reach a status.
+
+        :param strategy: A HetznerCloudPollingStrategy (for example HetznerCloudBackoffPolling or
+                         HetznerCloudProgressPolling).
+        :return: The current instance of the cloud configuration object to allow fluent chaining.
+        """
+        if not isinstance(strategy, HetznerCloudPollingStrategy):
+            raise HetznerConfigurationException("Invalid polling strategy type.")
+
+        self.polling_strategy = strategy
+        return self
+
+    def with_catalog_cache(self, ttls=None, default_ttl=3600, max_entries=128):
+        """
+        Caches the listings of resources that rarely change (server types, locations, datacenters, ISOs and system
+        images) in memory, so repeated calls to get_all() and get() do not go to the API. The cache's hit and miss
+        counters, and its invalidate() method, are available through the `catalog_cache` attribute.
+
+        :param ttls: A dictionary of resource names (i.e. server_types) to the number of seconds they are cached for.
+        :param default_ttl: The number of seconds to cache resources not present in `ttls`.
+        :param max_entries: The maximum number of listings (one per combination of filters) to hold.
+        :return: The current instance of the cloud configuration object to allow fluent chaining.
+        """
+        self.catalog_cache = HetznerCloudCatalogCache(ttls=ttls, default_ttl=default_ttl, max_entries=max_entries)
+        return self
+
+    def with_response_cache(self, directory, max_size=50 * 1024 * 1024, max_entries=1000):
+        """
+        Keeps GET responses on disk so they can be reused by later calls, including those made by other processes
+        sharing the same directory. Cached responses are revalidated with the API on every use, which answers with a
+        (bodiless) 304 response if they are still current.
+
+        :param directory: The directory to keep the cached responses in. It is created if it does not exist.
+        :param max_size: The maximum number of bytes the cached responses may take up.
+        :param max_entries: The maximum number of responses to keep.
+        :return: The current instance of the cloud configuration object to allow fluent chaining.
+        """
+        if not isinstance(max_size, int) or max_size < 1:
+            raise HetznerConfigurationException("The maximum response cache size must be a positive integer.")
+
+        if not isinstance(max_entries, int) or max_entries < 1:
+            raise HetznerConfigurationException("The maximum number of cached responses must be a positive integer.")
+
+        self.response_cache = HetznerCloudResponseCache(directory, max_size=max_size, max_entries=max_entries)
+        return self
+
+    def with_request_coalescing(self, enabled=True):
+        """
+        Modifies whether concurrent, identical GET requests share a single call to the API. When several threads ask
+        for the same resource (or the same page of a listing) at the same moment, only the first sends a request, and
+        the others wait for it and receive the same response. The number of requests sent and shared is available
+        through the `request_coalescer` attribute.
+
+        NOTE: Models built from a shared response are separate objects, but a lazily decoded model reads from a record
+              that is shared with the other callers.
+
+        :param enabled: Whether GET requests should be coalesced.
+        :return: The current instance of the cloud configuration object to allow fluent chaining.
+        """
+        self.request_coalescer = HetznerCloudRequestCoalescer() if enabled else None
+        return self
+
+    def with_lazy_decoding(self, lazy_decoding=True):
+        """
+        Modifies whether servers, images, floating IPs and SSH keys are decoded lazily. A lazily decoded model keeps a
+        reference to the API's response and only decodes each field the first time it is accessed, which saves time
+        (and allocations) when only a few fields of a large listing are used.
+
+        NOTE: A lazily decoded model holds on to its whole response record for as long as it lives, and a malformed
+              record only raises an exception when the affected field is first accessed.
+
+        :param lazy_decoding: Whether models should be decoded lazily.
+        :return: The current instance of the cloud configuration object to allow fluent chaining.
+        """
+        self.lazy_decoding = lazy_decoding
+        return self
+
+    def with_json_codec(self, codec):
+        """
+        Modifies the codec that encodes request bodies and decodes responses. By default, orjson is used when it is
+        installed, and the json module of the standard library otherwise.
+
+        :param codec: A HetznerCloudJsonCodec, such as HetznerCloudStdlibJsonCodec() or HetznerCloudOrjsonCodec().
+        :return: The current instance of the cloud configuration object to allow fluent chaining.
+        """
+        if not isinstance(codec, HetznerCloudJsonCodec):
+            raise HetznerConfigurationException("The JSON codec must be a HetznerCloudJsonCodec.")
+
+        self.json_codec = codec
+        return self
+
+    def with_request_hooks(self, before_request=None, after_request=None):
+        """
+        Adds callbacks that are called around every HTTP request made with this configuration (including each retry).
+        Both callbacks receive a HetznerCloudRequestEvent, which describes the method, the endpoint template (i.e.
+        servers/{id}) and the attempt number. By the time the after_request callback is called, it also holds the
+        status code, latency and the number of bytes sent and received. Exceptions raised by callbacks are logged and
+        otherwise ignored.
+
+        This method can be called several times to add several pairs of callbacks.
+
+        :param before_request: A callable taking a HetznerCloudRequestEvent, called just before the request is sent.
+        :param after_request: A callable taking a HetznerCloudRequestEvent, called once the request has finished.
+        :return: The current instance of the cloud configuration object to allow fluent chaining.
+        """
+        if before_request is not None:
+            self.before_request_hooks.append(before_request)
+        if after_request is not None:
+            self.after_request_hooks.append(after_request)
+        return self
+
+    def with_statistics(self, enabled=True):
+        """
+        Modifies whether per-endpoint request statistics (see HetznerCloudClient.stats()) are collected. They are
+        collected by default.
+
+        :param enabled: Whether statistics should be collected.
+        :return: The current instance of the cloud configuration object to allow fluent chaining.
+        """
+        self.statistics = HetznerCloudStatisticsCollector() if enabled else None
+        return self
+
+    def close(self):
+        """
+        Closes every pooled connection held by this configuration. A new pool is created if the configuration is used
+        again afterwards.
+        """
+        with self._session_lock:
+            if self._adapter is not None:
+                self._adapter.close()
+                self._adapter = None
+                self._adapter_generation += 1
+
+    def _get_session(self):
+        """
+        Returns the calling thread's HTTP session. Every thread has its own session, but they all share the
+        configuration's connection pool.
+        """
+        session = getattr(self._sessions, "session", None)
+        if session is not None and self._sessions.generation == self._adapter_generation:
+            return session
+
+        from .shared import _create_adapter, _create_session
+
+        with self._session_lock:
+            if self._adapter is None:
+                self._adapter = _create_adapter(self)
+
+            session = _create_session(self, self._adapter)
+            self._sessions.session = session
+            self._sessions.generation = self._adapter_generation
+            return session
+
+
+def _validate_configuration(configuration):
+    if not isinstance(configuration, HetznerCloudClientConfiguration):
+        raise HetznerConfigurationException("Invalid configuration type.")
+
+    if not configuration.api_key:
+        raise HetznerConfigurationException("Invalid API key.")
+
+    if not isinstance(configuration.api_version, int) or configuration.api_version != 1:
+        raise HetznerConfigurationException("The requested API version is not yet supported.")
+
+
+class HetznerCloudClient(object):
+    def __init__(self, configuration):
+        _validate_configuration(configuration)
 
         self.configuration = configuration
 
         # alias for datacentres method
         self.datacenters = self.datacentres
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Closes the pooled connections owned by this client's configuration.
+        """
+        self.configuration.close()
+
+    def last_request_statistics(self):
+        """
+        Returns the number of attempts and the total time spent waiting between them for the last API call made by the
+        current thread (or asyncio task), or None if no call has been made yet.
+
+        :return: A HetznerCloudRequestStatistics object.
+        """
+        return _get_last_request_statistics()
+
+    def stats(self):
+        """
+        Returns the requests made with this client's configuration so far, grouped by endpoint.
+
+        :return: A dictionary of "METHOD endpoint" strings (i.e. "GET servers/{id}") to HetznerCloudEndpointStatistics
+                 objects, each holding the number of requests, errors, retries and bytes, and a latency histogram. The
+                 dictionary is empty if statistics have been disabled.
+        """
+        if self.configuration.statistics is None:
+            return {}
+
+        return self.configuration.statistics.get()
+
+    def actions(self):
+        from .actions import HetznerCloudActionsAction
+        return HetznerCloudActionsAction(self.configuration)
+
     def datacentres(self):
+        from .datacenters import HetznerCloudDatacentersAction
         return HetznerCloudDatacentersAction(self.configuration)
 
     def floating_ips(self):
+        from .floating_ips import HetznerCloudFloatingIpAction
         return HetznerCloudFloatingIpAction(self.configuration)
 
     def images(self):
+        from .images import HetznerCloudImagesAction
         return HetznerCloudImagesAction(self.configuration)
 
+    def inventory(self):
+        """
+        Downloads the project's servers, floating IPs and SSH keys into a HetznerCloudInventory, which indexes them for
+        local lookups. Keep hold of the inventory and call refresh() on it to bring it up to date.
+
+        :return: A HetznerCloudInventory.
+        """
+        from .inventory import HetznerCloudInventory
+        inventory = HetznerCloudInventory(self.configuration)
+        inventory.refresh()
+        return inventory
+
     def isos(self):
+        from .isos import HetznerCloudIsosAction
         return HetznerCloudIsosAction(self.configuration)
 
     def locations(self):
+        from .locations import HetznerCloudLocationsAction
         return HetznerCloudLocationsAction(self.configuration)
 
     def server_types(self):
+        from .server_types import HetznerCloudServerTypesAction
         return HetznerCloudServerTypesAction(self.configuration)
 
     def servers(self):
+        from .servers import HetznerCloudServersAction
         return HetznerCloudServersAction(self.configuration)
 
     def ssh_keys(self):
+        from .ssh_keys import HetznerCloudSSHKeysAction
         return HetznerCloudSSHKeysAction(self.configuration)
@@ -0,0 +1,82 @@
+import threading
+
+
+class _Flight(object):
+    """
+    A request that is in progress, and the outcome it is shared with every caller that asked for the same thing.
+    """
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class HetznerCloudRequestCoalescer(object):
+    """
+    Makes concurrent, identical GET requests share a single call to the API. The first thread to ask for an endpoint
+    (with a given set of parameters) sends the request, and every thread that asks for the same thing before it has
+    finished waits for that request and receives the same response (or exception) instead of sending its own.
+
+    Only requests that are in progress are shared; nothing is kept once a request has finished, so a call made after a
+    request has returned always goes to the API. The decoded response is shared between the callers, and must be
+    treated as read-only.
+    """
+    def __init__(self):
+        self.requests = 0
+        self.coalesced = 0
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self):
+        """
+        The number of distinct requests currently in progress.
+        """
+        with self._lock:
+            return len(self._flights)
+
+    def _run(self, key, function):
+        """
+        Calls `function` and returns its result, unless a call with the same key is already in progress on another
+        thread, in which case its result is waited for and returned instead.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                self.requests += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = function()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+
+def _get_coalescing_key(url, url_params):
+    """
+    Returns a hashable key identifying a GET request by its URL and parameters, regardless of the order the parameters
+    were given in.
+    """
+    if not url_params:
+        return url, ()
+
+    return url, tuple(sorted((name, tuple(value) if isinstance(value, list) else value)
+                             for name, value in url_params.items()))
@@ -42,6 +42,7 @@ IMAGE_FEDORA_28 = "fedora-28"
 
 IMAGE_TYPE_BACKUP = "backup"
 IMAGE_TYPE_SNAPSHOT = "snapshot"
+IMAGE_TYPE_SYSTEM = "system"
 
 DATACENTER_FALKENSTEIN_1 = "fsn1-dc8"
 DATACENTER_NUREMBERG_1 = "nbg1-dc3"
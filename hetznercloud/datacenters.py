@@ -1,30 +1,33 @@
 from .exceptions import HetznerActionException
 from .locations import HetznerCloudLocation
-from .shared import _get_results
+from .shared import _get_results, _get_catalog_results, _get_cached_record
 
 
 class HetznerCloudDatacentersAction(object):
     def __init__(self, config):
         self._config = config
 
-    def get_all(self, name=None):
-        status_code, results = _get_results(self._config, "datacenters",
-                                            url_params={"name": name} if name is not None else None)
-        if status_code != 200:
-            raise HetznerActionException(results)
-
-        for result in results["datacenters"]:
+    def get_all(self, name=None, per_page=None, max_items=None, prefetch=0, stream=False):
+        for result in _get_catalog_results(self._config, "datacenters", "datacenters",
+                                           url_params={"name": name} if name is not None else None,
+                                           per_page=per_page, max_items=max_items, prefetch=prefetch, stream=stream):
             yield HetznerCloudDatacenter._load_from_json(result)
 
     def get(self, id):
-        status_code, results = _get_results(self._config, "datacenters/%s" % id)
-        if status_code != 200:
-            raise HetznerActionException(results)
+        result = _get_cached_record(self._config, "datacenters", id)
+        if result is None:
+            status_code, results = _get_results(self._config, "datacenters/%s" % id)
+            if status_code != 200:
+                raise HetznerActionException(results)
+
+            result = results["datacenter"]
 
-        return HetznerCloudDatacenter._load_from_json(results["datacenter"])
+        return HetznerCloudDatacenter._load_from_json(result)
 
 
 class HetznerCloudDatacenter(object):
+    __slots__ = ("id", "name", "description", "location", "supported_server_types", "available_server_types")
+
     def __init__(self):
         self.id = 0
         self.name = ""
@@ -1,6 +1,6 @@
 from hetznercloud.actions import HetznerCloudAction
 from .exceptions import HetznerInvalidArgumentException, HetznerActionException
-from .shared import _get_results
+from .shared import _get_results, _get_paginated_results, _LazyModel, _load_model
 
 
 class HetznerCloudFloatingIpAction(object):
@@ -25,12 +25,9 @@ class HetznerCloudFloatingIpAction(object):
 
         return HetznerCloudFloatingIp._load_from_json(self._config, results["floating_ip"])
 
-    def get_all(self):
-        status_code, results = _get_results(self._config, "floating_ips")
-        if status_code != 200:
-            raise HetznerActionException(results)
-
-        for result in results["floating_ips"]:
+    def get_all(self, per_page=None, max_items=None, prefetch=0, stream=False):
+        for result in _get_paginated_results(self._config, "floating_ips", "floating_ips", per_page=per_page,
+                                             max_items=max_items, prefetch=prefetch, stream=stream):
             yield HetznerCloudFloatingIp._load_from_json(self._config, result)
 
     def get(self, id):
@@ -41,7 +38,22 @@ class HetznerCloudFloatingIpAction(object):
         return HetznerCloudFloatingIp._load_from_json(self._config, result["floating_ip"])
 
 
-class HetznerCloudFloatingIp(object):
+class HetznerCloudFloatingIp(_LazyModel):
+    __slots__ = ("_config", "id", "ip", "description", "type", "server", "ptr_ips", "ptr_dns_ptrs", "location_id",
+                 "blocked")
+
+    _decoders = {
+        "id": lambda json: int(json["id"]),
+        "description": lambda json: json["description"],
+        "ip": lambda json: json["ip"],
+        "type": lambda json: json["type"],
+        "server": lambda json: int(json["server"]) if json["server"] is not None else 0,
+        "ptr_ips": lambda json: [entry["ip"] for entry in json["dns_ptr"]],
+        "ptr_dns_ptrs": lambda json: [entry["dns_ptr"] for entry in json["dns_ptr"]],
+        "location_id": lambda json: int(json["home_location"]["id"]),
+        "blocked": lambda json: bool(json["blocked"]),
+    }
+
     def __init__(self, config):
         self._config = config
         self.id = 0
@@ -63,7 +75,7 @@ class HetznerCloudFloatingIp(object):
         if status_code != 201:
             raise HetznerActionException(result)
 
-        self.server = server_id
+        self._set(server=server_id)
 
         return HetznerCloudAction._load_from_json(self._config, result["action"])
 
@@ -73,7 +85,7 @@ class HetznerCloudFloatingIp(object):
         if status_code != 200:
             raise HetznerActionException(result)
 
-        self.description = new_description
+        self._set(description=new_description)
 
     def change_reverse_dns_entry(self, ip, dns_ptr=None):
         if not ip:
@@ -84,8 +96,7 @@ class HetznerCloudFloatingIp(object):
         if status_code != 201:
             raise HetznerActionException(result)
 
-        self.ptr_ips = [ip]
-        self.ptr_dns_ptrs = [dns_ptr]
+        self._set(ptr_ips=[ip], ptr_dns_ptrs=[dns_ptr])
 
         return HetznerCloudAction._load_from_json(self._config, result["action"])
 
@@ -99,22 +110,10 @@ class HetznerCloudFloatingIp(object):
         if status_code != 201:
             raise HetznerActionException(result)
 
-        self.server = 0
+        self._set(server=0)
 
         return HetznerCloudAction._load_from_json(self._config, result["action"])
 
-    @staticmethod
-    def _load_from_json(config, json):
-        float_ip = HetznerCloudFloatingIp(config)
-
-        float_ip.id = int(json["id"])
-        float_ip.description = json["description"]
-        float_ip.ip = json["ip"]
-        float_ip.type = json["type"]
-        float_ip.server = int(json["server"]) if json["server"] is not None else 0
-        float_ip.ptr_ips = [entry["ip"] for entry in json["dns_ptr"]]
-        float_ip.ptr_dns_ptrs = [entry["dns_ptr"] for entry in json["dns_ptr"]]
-        float_ip.location_id = int(json["home_location"]["id"])
-        float_ip.blocked = bool(json["blocked"])
-
-        return float_ip
+    @classmethod
+    def _load_from_json(cls, config, json):
+        return _load_model(cls, json, config.lazy_decoding, _config=config)
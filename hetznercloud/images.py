@@ -1,13 +1,15 @@
-from .constants import IMAGE_TYPE_SNAPSHOT
+from .constants import IMAGE_TYPE_SYSTEM
 from .exceptions import HetznerActionException
-from .shared import _get_results
+from .shared import _get_results, _get_paginated_results, _get_catalog_results, _get_cached_record, _LazyModel, \
+    _load_model
 
 
 class HetznerCloudImagesAction(object):
     def __init__(self, config):
         self._config = config
 
-    def get_all(self, sort=None, type=None, bound_to=None, name=None):
+    def get_all(self, sort=None, type=None, bound_to=None, name=None, per_page=None, max_items=None, prefetch=0,
+                stream=False):
         url_params = {}
         if sort is not None:
             url_params["sort"] = sort
@@ -18,22 +20,44 @@ class HetznerCloudImagesAction(object):
         if name is not None:
             url_params["name"] = name
 
-        status_code, results = _get_results(self._config, "images?per_page=100", url_params=url_params)
-        if status_code != 200:
-            raise HetznerActionException(results)
-
-        for result in results["images"]:
+        # Only system images are provided by Hetzner, so only they are stable enough to be served from the cache.
+        get_results = _get_catalog_results if type == IMAGE_TYPE_SYSTEM else _get_paginated_results
+        for result in get_results(self._config, "images", "images", url_params=url_params, per_page=per_page,
+                                  max_items=max_items, prefetch=prefetch, stream=stream):
             yield HetznerCloudImage._load_from_json(self._config, result)
 
     def get(self, id):
-        status_code, results = _get_results(self._config, "images/%s" % id)
-        if status_code != 200:
-            raise HetznerActionException(results)
-
-        return HetznerCloudImage._load_from_json(self._config, results["image"])
-
+        result = _get_cached_record(self._config, "images", id)
+        if result is None:
+            status_code, results = _get_results(self._config, "images/%s" % id)
+            if status_code != 200:
+                raise HetznerActionException(results)
+
+            result = results["image"]
+
+        return HetznerCloudImage._load_from_json(self._config, result)
+
+
+class HetznerCloudImage(_LazyModel):
+    __slots__ = ("_config", "id", "type", "status", "name", "description", "image_size", "disk_size", "created_from_id",
+                 "created_from_name", "bound_to", "os_flavor", "os_version", "rapid_deploy")
+
+    _decoders = {
+        "id": lambda json: int(json["id"]),
+        "type": lambda json: json["type"],
+        "status": lambda json: json["status"],
+        "name": lambda json: json["name"],
+        "description": lambda json: json["description"],
+        "image_size": lambda json: float(json["image_size"]) if json["image_size"] is not None else None,
+        "disk_size": lambda json: float(json["disk_size"]) if json["disk_size"] is not None else None,
+        "created_from_id": lambda json: int(json["created_from"]["id"]) if json["created_from"] is not None else None,
+        "created_from_name": lambda json: json["created_from"]["name"] if json["created_from"] is not None else None,
+        "bound_to": lambda json: int(json["bound_to"]) if json["bound_to"] is not None else None,
+        "os_flavor": lambda json: json["os_flavor"],
+        "os_version": lambda json: json["os_version"],
+        "rapid_deploy": lambda json: bool(json["rapid_deploy"]),
+    }
 
-class HetznerCloudImage(object):
     def __init__(self, config):
         self._config = config
         self.id = 0
@@ -61,30 +85,13 @@ class HetznerCloudImage(object):
         if status_code != 200:
             raise HetznerActionException(result)
 
-        self.description = description
-        self.type = type
+        self._set(description=description, type=type)
 
     def delete(self):
         status_code, result = _get_results(self._config, "images/%s" % self.id, method="DELETE")
         if status_code != 204:
             raise HetznerActionException(result)
 
-    @staticmethod
-    def _load_from_json(config, json):
-        image = HetznerCloudImage(config)
-
-        image.id = int(json["id"])
-        image.type = json["type"]
-        image.status = json["status"]
-        image.name = json["name"]
-        image.description = json["description"]
-        image.image_size = float(json["image_size"]) if json["image_size"] is not None else None
-        image.disk_size = float(json["disk_size"]) if json["disk_size"] is not None else None
-        image.created_from_id = int(json["created_from"]["id"]) if json["created_from"] is not None else None
-        image.created_from_name = json["created_from"]["name"] if json["created_from"] is not None else None
-        image.bound_to = int(json["bound_to"]) if json["bound_to"] is not None else None
-        image.os_flavor = json["os_flavor"]
-        image.os_version = json["os_version"]
-        image.rapid_deploy = bool(json["rapid_deploy"])
-
-        return image
+    @classmethod
+    def _load_from_json(cls, config, json):
+        return _load_model(cls, json, config.lazy_decoding, _config=config)
@@ -0,0 +1,162 @@
+import bisect
+import logging
+import re
+import threading
+import time
+
+_logger = logging.getLogger("hetznercloud")
+
+# The upper bounds (in seconds) of the latency histogram buckets. The last bucket holds everything slower.
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_ID_SEGMENT = re.compile(r"(?<=/)\d+(?=/|$)")
+
+
+class HetznerCloudRequestEvent(object):
+    """
+    Describes a single HTTP request made to the API. Every attempt at a call (including retries) is a separate request.
+    The status code, latency and response size are only known once the request has finished.
+    """
+    __slots__ = ("method", "endpoint", "attempt", "request_bytes", "status_code", "latency", "response_bytes",
+                 "error")
+
+    def __init__(self, method, endpoint, attempt, request_bytes=0):
+        self.method = method
+        self.endpoint = endpoint
+        self.attempt = attempt
+        self.request_bytes = request_bytes
+        self.status_code = None
+        self.latency = None
+        self.response_bytes = 0
+        self.error = None
+
+    @property
+    def retries(self):
+        return self.attempt - 1
+
+    @property
+    def failed(self):
+        return self.error is not None or self.status_code is None or self.status_code >= 400
+
+
+class HetznerCloudEndpointStatistics(object):
+    """
+    The requests made to a single endpoint (such as GET servers/{id}), with a histogram of their latencies.
+    """
+    def __init__(self, method, endpoint):
+        self.method = method
+        self.endpoint = endpoint
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.latency_histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    @property
+    def mean_latency(self):
+        return self.total_latency / self.requests if self.requests else 0.0
+
+    def latency_percentile(self, percentile):
+        """
+        Estimates a latency percentile from the histogram, returning the upper bound of the bucket it falls in (or the
+        slowest latency seen, for the last bucket).
+
+        :param percentile: The percentile to estimate, between 0 and 100.
+        """
+        rank = self.requests * percentile / 100.0
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.latency_histogram):
+            seen += count
+            if count and seen >= rank:
+                return bound
+
+        return self.max_latency
+
+    def _record(self, event):
+        self.requests += 1
+        self.errors += event.failed
+        self.retries += event.attempt > 1
+        self.total_latency += event.latency
+        self.max_latency = max(self.max_latency, event.latency)
+        self.request_bytes += event.request_bytes
+        self.response_bytes += event.response_bytes
+        self.latency_histogram[bisect.bisect_left(LATENCY_BUCKETS, event.latency)] += 1
+
+    def _copy(self):
+        statistics = HetznerCloudEndpointStatistics(self.method, self.endpoint)
+        statistics.__dict__.update(self.__dict__)
+        statistics.latency_histogram = list(self.latency_histogram)
+        return statistics
+
+
+class HetznerCloudStatisticsCollector(object):
+    """
+    Collects the number of requests, errors, retries and bytes, and a latency histogram, for every endpoint the client
+    calls. Endpoints are identified by their method and template, so GET servers/1 and GET servers/2 are counted
+    together as GET servers/{id}.
+    """
+    def __init__(self):
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def get(self):
+        """
+        :return: A dictionary of "METHOD endpoint" strings (i.e. "GET servers/{id}") to a copy of the
+                 HetznerCloudEndpointStatistics of that endpoint.
+        """
+        with self._lock:
+            return {key: statistics._copy() for key, statistics in self._endpoints.items()}
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+    def after_request(self, event):
+        key = "%s %s" % (event.method, event.endpoint)
+        with self._lock:
+            statistics = self._endpoints.get(key)
+            if statistics is None:
+                statistics = self._endpoints[key] = HetznerCloudEndpointStatistics(event.method, event.endpoint)
+            statistics._record(event)
+
+
+def _get_endpoint_template(endpoint):
+    """
+    Replaces the ids in an endpoint with a placeholder (i.e. servers/42/actions/poweron becomes
+    servers/{id}/actions/poweron), so that requests for different resources are grouped together.
+    """
+    return _ID_SEGMENT.sub("{id}", "/" + endpoint)[1:]
+
+
+def _start_request(config, method, endpoint, attempt, data):
+    event = HetznerCloudRequestEvent(method, endpoint, attempt, len(data) if data else 0)
+    for hook in config.before_request_hooks:
+        _call_hook(hook, event)
+
+    return event, time.monotonic()
+
+
+def _finish_request(config, event, started, status_code=None, response_bytes=0, error=None):
+    event.latency = time.monotonic() - started
+    event.status_code = status_code
+    event.response_bytes = response_bytes
+    event.error = error
+
+    _logger.debug("%s %s (attempt %s) finished with %s in %.3fs", event.method, event.endpoint, event.attempt,
+                  status_code if error is None else repr(error), event.latency)
+
+    if config.statistics is not None:
+        config.statistics.after_request(event)
+    for hook in config.after_request_hooks:
+        _call_hook(hook, event)
+
+
+def _call_hook(hook, event):
+    # Instrumentation must never break the request it is observing.
+    try:
+        hook(event)
+    except Exception:
+        _logger.exception("A request hook failed whilst handling %s %s", event.method, event.endpoint)
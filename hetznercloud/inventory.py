@@ -0,0 +1,299 @@
+import ipaddress
+import threading
+
+from .actions import HetznerCloudActionsAction, _ACTIONS_PER_REQUEST
+from .constants import ACTION_STATUS_RUNNING, SORT_BY_ID_DESC
+from .exceptions import HetznerActionException
+from .floating_ips import HetznerCloudFloatingIp
+from .servers import HetznerCloudServer
+from .shared import _get_results, _get_paginated_results
+from .ssh_keys import HetznerCloudSSHKey
+
+# The size of the IPv6 networks assigned to servers and floating IPs.
+_IPV6_PREFIX_LENGTH = 64
+
+
+class HetznerCloudInventory(object):
+    """
+    A local copy of a project's servers, floating IPs and SSH keys, indexed so that they can be looked up by id, name,
+    IP address, datacenter or fingerprint without going to the API. The inventory only changes when refresh() or sync()
+    is called.
+
+    An inventory can be shared between threads. Lookups can be made whilst it is being refreshed or synced (and see each
+    resource either before or after it changed), and concurrent calls to refresh() and sync() take turns.
+    """
+    def __init__(self, config):
+        self._config = config
+        self._sync_lock = threading.Lock()
+        self.cursor = None
+        self._running_action_ids = set()
+        self._servers = _ResourceIndex(
+            lambda json: HetznerCloudServer._load_from_json(config, json),
+            keys={
+                "name": lambda server: [server.name],
+                "ip": lambda server: [server.public_net_ipv4, _normalise_ip(server.public_net_ipv6)],
+            },
+            groups={"datacenter_id": lambda server: server.datacenter_id})
+        self._floating_ips = _ResourceIndex(
+            lambda json: HetznerCloudFloatingIp._load_from_json(config, json),
+            keys={"ip": lambda floating_ip: [_normalise_ip(floating_ip.ip)]})
+        self._ssh_keys = _ResourceIndex(
+            lambda json: HetznerCloudSSHKey._load_from_json(config, json),
+            keys={
+                "name": lambda ssh_key: [ssh_key.name],
+                "fingerprint": lambda ssh_key: [ssh_key.fingerprint],
+            })
+
+    def refresh(self):
+        """
+        Downloads the servers, floating IPs and SSH keys of the project and brings the inventory up to date. Only the
+        resources that were added, changed or removed since the last refresh are rebuilt and re-indexed; the models of
+        unchanged resources are kept as they are.
+
+        :return: The number of resources that were added, changed or removed.
+        """
+        with self._sync_lock:
+            return self._refresh()
+
+    def _refresh(self):
+        # The actions feed is read first, so that sync() picks up anything that changes whilst the listings download.
+        actions = HetznerCloudActionsAction(self._config)
+        newest_actions = list(actions.get_all(sort=SORT_BY_ID_DESC, per_page=1, max_items=1))
+        running_actions = actions.get_all(status=ACTION_STATUS_RUNNING, per_page=_ACTIONS_PER_REQUEST)
+        self._running_action_ids = {action.id for action in running_actions}
+
+        changes = 0
+        for endpoint, index in (("servers", self._servers), ("floating_ips", self._floating_ips),
+                                ("ssh_keys", self._ssh_keys)):
+            changes += index._replace_all(_get_paginated_results(self._config, endpoint, endpoint, per_page=50))
+
+        self.cursor = newest_actions[0].id if newest_actions else 0
+        return changes
+
+    def sync(self):
+        """
+        Brings the inventory up to date by reading the actions started since the last refresh() or sync() (newest
+        first, stopping at the `cursor`), and re-fetching only the servers and floating IPs those actions touched.
+        Actions that were still running are checked again, so the resources they touch are re-fetched once they finish.
+        The cost of a sync therefore depends on how much has changed, rather than on the size of the project.
+
+        If the inventory has not been loaded yet, this is the same as refresh().
+
+        NOTE: Changes that do not start an action (such as renaming a server, or creating and deleting SSH keys and
+              unassigned floating IPs) are only picked up by refresh().
+
+        :return: The number of resources that were added, changed or removed.
+        """
+        with self._sync_lock:
+            if self.cursor is None:
+                return self._refresh()
+
+            return self._sync()
+
+    def _sync(self):
+        actions = HetznerCloudActionsAction(self._config)
+        touched = set()
+        running = set()
+        newest = self.cursor
+
+        for action in actions.get_all(sort=SORT_BY_ID_DESC, per_page=_ACTIONS_PER_REQUEST):
+            if action.id <= self.cursor:
+                break
+
+            newest = max(newest, action.id)
+            touched.update(_get_resources(action))
+            if action.status == ACTION_STATUS_RUNNING:
+                running.add(action.id)
+
+        # Running actions seen by an earlier sync, whose resources change again when they finish.
+        previously_running = list(self._running_action_ids)
+        for i in range(0, len(previously_running), _ACTIONS_PER_REQUEST):
+            for action in actions.get_all(ids=previously_running[i:i + _ACTIONS_PER_REQUEST],
+                                          per_page=_ACTIONS_PER_REQUEST):
+                if action.status == ACTION_STATUS_RUNNING:
+                    running.add(action.id)
+                else:
+                    touched.update(_get_resources(action))
+
+        changes = 0
+        for resource_type, id in touched:
+            changes += self._refetch(resource_type, id)
+
+        self.cursor = newest
+        self._running_action_ids = running
+        return changes
+
+    def _refetch(self, resource_type, id):
+        endpoint, key, index = {
+            "server": ("servers", "server", self._servers),
+            "floating_ip": ("floating_ips", "floating_ip", self._floating_ips),
+        }[resource_type]
+
+        status_code, result = _get_results(self._config, "%s/%s" % (endpoint, id))
+        if status_code == 404:
+            return index._remove(id)
+        if status_code != 200:
+            raise HetznerActionException(result)
+
+        return index._update(result[key])
+
+    def servers(self):
+        return self._servers._all()
+
+    def server(self, id):
+        return self._servers._get_by_id(id)
+
+    def server_by_name(self, name):
+        return self._servers._get("name", name)
+
+    def server_by_ip(self, ip):
+        """
+        Finds the server with the given public IPv4 address, or whose IPv6 network contains the given IPv6 address.
+        """
+        return self._servers._get("ip", _normalise_ip(ip))
+
+    def servers_in_datacenter(self, datacenter_id):
+        return self._servers._get_group("datacenter_id", datacenter_id)
+
+    def floating_ips(self):
+        return self._floating_ips._all()
+
+    def floating_ip(self, id):
+        return self._floating_ips._get_by_id(id)
+
+    def floating_ip_by_ip(self, ip):
+        return self._floating_ips._get("ip", _normalise_ip(ip))
+
+    def ssh_keys(self):
+        return self._ssh_keys._all()
+
+    def ssh_key(self, id):
+        return self._ssh_keys._get_by_id(id)
+
+    def ssh_key_by_name(self, name):
+        return self._ssh_keys._get("name", name)
+
+    def ssh_key_by_fingerprint(self, fingerprint):
+        return self._ssh_keys._get("fingerprint", fingerprint)
+
+
+class _ResourceIndex(object):
+    """
+    The models of one type of resource by id, along with hash indexes on other fields. `keys` maps each unique index
+    to a function returning the keys of a model, and `groups` maps each grouping index to a function returning the
+    (shared) key of a model. Every read and change is made under a lock, so the indexes are always consistent with each
+    other.
+    """
+    def __init__(self, load, keys=None, groups=None):
+        self.by_id = {}
+        self._lock = threading.RLock()
+        self._load = load
+        self._records = {}
+        self._entry_keys = {}
+        self._keys = keys or {}
+        self._groups = groups or {}
+        self._indexes = {name: {} for name in self._keys}
+        self._grouped = {name: {} for name in self._groups}
+
+    def _all(self):
+        with self._lock:
+            return list(self.by_id.values())
+
+    def _get_by_id(self, id):
+        with self._lock:
+            return self.by_id.get(id)
+
+    def _get(self, index, key):
+        with self._lock:
+            return self._indexes[index].get(key)
+
+    def _get_group(self, index, key):
+        with self._lock:
+            return list(self._grouped[index].get(key, {}).values())
+
+    def _update(self, json):
+        """
+        Adds or replaces a resource from its raw JSON record, returning whether anything changed.
+        """
+        with self._lock:
+            id = json["id"]
+            if self._records.get(id) == json:
+                return False
+
+            self._remove(id)
+
+            model = self._load(json)
+            self._records[id] = json
+            self.by_id[id] = model
+
+            # The keys are remembered, as the model may be modified before it is removed.
+            keys = [(name, key) for name, get_keys in self._keys.items() for key in get_keys(model) if key]
+            groups = [(name, get_key(model)) for name, get_key in self._groups.items()]
+            self._entry_keys[id] = keys, groups
+            for name, key in keys:
+                self._indexes[name][key] = model
+            for name, key in groups:
+                self._grouped[name].setdefault(key, {})[id] = model
+
+            return True
+
+    def _remove(self, id):
+        """
+        Removes a resource, returning whether it was present.
+        """
+        with self._lock:
+            model = self.by_id.pop(id, None)
+            if model is None:
+                return False
+
+            del self._records[id]
+            keys, groups = self._entry_keys.pop(id)
+            for name, key in keys:
+                if self._indexes[name].get(key) is model:
+                    del self._indexes[name][key]
+            for name, key in groups:
+                group = self._grouped[name][key]
+                del group[id]
+                if not group:
+                    del self._grouped[name][key]
+
+            return True
+
+    def _replace_all(self, records):
+        """
+        Brings the index in line with a complete listing, returning the number of resources added, changed or removed.
+        """
+        changes = 0
+        seen = set()
+        for json in records:
+            seen.add(json["id"])
+            changes += self._update(json)
+
+        with self._lock:
+            for id in [id for id in self.by_id if id not in seen]:
+                changes += self._remove(id)
+
+        return changes
+
+
+def _get_resources(action):
+    """
+    Returns the (type, id) of every resource an action touched that the inventory holds.
+    """
+    return {(resource["type"], resource["id"]) for resource in action.resources
+            if resource["type"] in ("server", "floating_ip")}
+
+
+def _normalise_ip(ip):
+    """
+    Returns IPv4 addresses as they are, and the network an IPv6 address (or network) belongs to, so that any address
+    of a server's IPv6 network finds the server.
+    """
+    if not ip or ":" not in ip:
+        return ip
+
+    try:
+        network = ip if "/" in ip else "%s/%s" % (ip, _IPV6_PREFIX_LENGTH)
+        return str(ipaddress.ip_network(network, strict=False))
+    except ValueError:
+        return ip
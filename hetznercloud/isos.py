@@ -1,29 +1,32 @@
 from .exceptions import HetznerActionException
-from .shared import _get_results
+from .shared import _get_results, _get_catalog_results, _get_cached_record
 
 
 class HetznerCloudIsosAction(object):
     def __init__(self, config):
         self._config = config
 
-    def get_all(self, name=None):
-        status_code, results = _get_results(self._config, "isos?per_page=100",
-                                            url_params={"name": name} if name is not None else None)
-        if status_code != 200:
-            raise HetznerActionException(results)
-
-        for result in results["isos"]:
+    def get_all(self, name=None, per_page=None, max_items=None, prefetch=0, stream=False):
+        for result in _get_catalog_results(self._config, "isos", "isos",
+                                           url_params={"name": name} if name is not None else None,
+                                           per_page=per_page, max_items=max_items, prefetch=prefetch, stream=stream):
             yield HetznerCloudIso._load_from_json(result)
 
     def get(self, id):
-        status_code, results = _get_results(self._config, "isos/%s" % id)
-        if status_code != 200:
-            raise HetznerActionException(results)
+        result = _get_cached_record(self._config, "isos", id)
+        if result is None:
+            status_code, results = _get_results(self._config, "isos/%s" % id)
+            if status_code != 200:
+                raise HetznerActionException(results)
+
+            result = results["iso"]
 
-        return HetznerCloudIso._load_from_json(results["iso"])
+        return HetznerCloudIso._load_from_json(result)
 
 
 class HetznerCloudIso(object):
+    __slots__ = ("id", "name", "description", "type")
+
     def __init__(self):
         self.id = 0
         self.name = ""
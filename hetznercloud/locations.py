@@ -1,29 +1,32 @@
 from .exceptions import HetznerActionException
-from .shared import _get_results
+from .shared import _get_results, _get_catalog_results, _get_cached_record
 
 
 class HetznerCloudLocationsAction(object):
     def __init__(self, config):
         self._config = config
 
-    def get_all(self, name=None):
-        status_code, results = _get_results(self._config, "locations",
-                                            url_params={"name": name} if name is not None else None)
-        if status_code != 200:
-            raise HetznerActionException(results)
-
-        for result in results["locations"]:
+    def get_all(self, name=None, per_page=None, max_items=None, prefetch=0, stream=False):
+        for result in _get_catalog_results(self._config, "locations", "locations",
+                                           url_params={"name": name} if name is not None else None,
+                                           per_page=per_page, max_items=max_items, prefetch=prefetch, stream=stream):
             yield HetznerCloudLocation._load_from_json(result)
 
     def get(self, id):
-        status_code, results = _get_results(self._config, "locations/%s" % id, method="GET")
-        if status_code != 200:
-            raise HetznerActionException(results)
+        result = _get_cached_record(self._config, "locations", id)
+        if result is None:
+            status_code, results = _get_results(self._config, "locations/%s" % id, method="GET")
+            if status_code != 200:
+                raise HetznerActionException(results)
+
+            result = results["location"]
 
-        return HetznerCloudLocation._load_from_json(results["location"])
+        return HetznerCloudLocation._load_from_json(result)
 
 
 class HetznerCloudLocation(object):
+    __slots__ = ("id", "name", "description", "country", "city", "latitude", "longitude")
+
     def __init__(self):
         self.id = 0
         self.name = ""
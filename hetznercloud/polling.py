@@ -0,0 +1,112 @@
+import random
+import time
+
+# The number of seconds to wait for a status before giving up, when neither a timeout nor a number of attempts is given.
+_DEFAULT_TIMEOUT = 60
+
+
+class HetznerCloudPollingStrategy(object):
+    """
+    Decides how long to wait between two polls of something that is changing state in the API (such as an action or a
+    server). Subclasses implement get_delay().
+    """
+    def get_delay(self, attempt, elapsed, progress=None):
+        """
+        :param attempt: The number of polls made so far.
+        :param elapsed: The number of seconds since waiting began.
+        :param progress: The progress (0 to 100) reported by the last poll, or None if it is not known.
+        :return: The number of seconds to wait before polling again.
+        """
+        raise NotImplementedError()
+
+
+class HetznerCloudFixedPolling(HetznerCloudPollingStrategy):
+    """
+    Polls at a fixed interval.
+    """
+    def __init__(self, wait_seconds=1):
+        self.wait_seconds = wait_seconds
+
+    def get_delay(self, attempt, elapsed, progress=None):
+        return self.wait_seconds
+
+
+class HetznerCloudBackoffPolling(HetznerCloudPollingStrategy):
+    """
+    Polls quickly at first, then backs off exponentially up to `max_wait` seconds. Each wait is randomised by up to
+    `jitter` (as a fraction of the wait) so that many waiters do not poll in lockstep.
+    """
+    def __init__(self, initial_wait=0.5, max_wait=10, multiplier=1.5, jitter=0.2):
+        self.initial_wait = initial_wait
+        self.max_wait = max_wait
+        self.multiplier = multiplier
+        self.jitter = jitter
+
+    def get_delay(self, attempt, elapsed, progress=None):
+        delay = min(self.initial_wait * (self.multiplier ** (attempt - 1)), self.max_wait)
+        return self._apply_jitter(delay)
+
+    def _apply_jitter(self, delay):
+        return max(delay * (1 + random.uniform(-self.jitter, self.jitter)), 0)
+
+
+class HetznerCloudProgressPolling(HetznerCloudBackoffPolling):
+    """
+    Uses the progress reported by an action to estimate when it will finish, and polls again after `fraction` of that
+    estimate (never sooner than `initial_wait` or later than `max_wait` seconds). When no progress has been reported,
+    it falls back to exponential backoff.
+
+    The estimate assumes the action started when waiting began, so waiting on an action that is already well under way
+    polls more often than strictly necessary, never less.
+    """
+    def __init__(self, initial_wait=0.5, max_wait=10, multiplier=1.5, jitter=0.2, fraction=0.5):
+        super().__init__(initial_wait, max_wait, multiplier, jitter)
+        self.fraction = fraction
+
+    def get_delay(self, attempt, elapsed, progress=None):
+        if not progress or progress >= 100 or elapsed <= 0:
+            return super().get_delay(attempt, elapsed, progress)
+
+        estimated_remaining = elapsed * (100 - progress) / progress
+        delay = min(max(estimated_remaining * self.fraction, self.initial_wait), self.max_wait)
+        return self._apply_jitter(delay)
+
+
+class _Poller(object):
+    """
+    Tracks a single wait: the strategy in use, the number of polls made and the deadline.
+
+    Passing `attempts` or `wait_seconds` keeps the original behaviour of polling every `wait_seconds` seconds for at most
+    `attempts` polls. Otherwise, the configured strategy is used until `timeout` seconds have passed.
+    """
+    def __init__(self, config, attempts=None, wait_seconds=None, timeout=None, polling=None):
+        if attempts is not None or wait_seconds is not None:
+            self.strategy = polling or HetznerCloudFixedPolling(wait_seconds if wait_seconds is not None else 1)
+            self.max_attempts = attempts if attempts is not None else 20
+        else:
+            self.strategy = polling or config.polling_strategy
+            self.max_attempts = None
+            timeout = timeout if timeout is not None else _DEFAULT_TIMEOUT
+
+        self.attempt = 0
+        self.started = time.monotonic()
+        self.deadline = self.started + timeout if timeout is not None else None
+
+    def next_delay(self, progress=None):
+        """
+        Records a poll, returning the number of seconds to wait before the next one, or None if the attempts or the
+        time available have run out.
+        """
+        self.attempt += 1
+        if self.max_attempts is not None and self.attempt >= self.max_attempts:
+            return None
+
+        now = time.monotonic()
+        delay = self.strategy.get_delay(self.attempt, now - self.started, progress)
+        if self.deadline is None:
+            return delay
+
+        if now >= self.deadline:
+            return None
+
+        return min(delay, self.deadline - now)
@@ -0,0 +1,107 @@
+import threading
+import time
+
+from .exceptions import HetznerRateLimitExceeded
+
+
+class HetznerCloudRateLimiter(object):
+    """
+    A token bucket that mirrors the request budget of the Hetzner Cloud API. Every request made with a configuration
+    that has a rate limiter takes a token from the bucket, and the bucket is re-seeded from the RateLimit-Limit,
+    RateLimit-Remaining and RateLimit-Reset headers of every response.
+
+    When the bucket is empty, requests either wait until a token becomes available or fail fast with a
+    HetznerRateLimitExceeded exception.
+    """
+    def __init__(self, limit=3600, period=3600, wait=True, max_wait=None):
+        """
+        :param limit: The number of requests available until the API tells us otherwise.
+        :param period: The number of seconds it takes for an empty bucket to refill.
+        :param wait: Whether requests should wait for a token (True) or fail fast (False) when the bucket is empty.
+        :param max_wait: The maximum number of seconds a request may wait for a token before failing, or None to wait
+                         for as long as necessary.
+        """
+        self.limit = limit
+        self.wait = wait
+        self.max_wait = max_wait
+        self._tokens = float(limit)
+        self._refill_rate = float(limit) / period
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self):
+        """
+        The number of requests that can be made right now without waiting.
+        """
+        with self._lock:
+            self._refill()
+            return max(int(self._tokens), 0)
+
+    @property
+    def reset(self):
+        """
+        The UNIX timestamp at which the bucket will be full again.
+        """
+        with self._lock:
+            self._refill()
+            return time.time() + (self.limit - self._tokens) / self._refill_rate
+
+    def time_until_available(self, requests=1):
+        """
+        Returns the number of seconds until the given number of requests can be made without waiting.
+
+        :param requests: The number of requests that need to be made.
+        """
+        with self._lock:
+            self._refill()
+            return max(requests - self._tokens, 0) / self._refill_rate
+
+    def _acquire(self):
+        """
+        Takes a token from the bucket, returning the number of seconds the caller must wait before making its request.
+        """
+        with self._lock:
+            self._refill()
+
+            delay = max(1 - self._tokens, 0) / self._refill_rate
+            if delay > 0 and (not self.wait or (self.max_wait is not None and delay > self.max_wait)):
+                raise HetznerRateLimitExceeded()
+
+            self._tokens -= 1
+            return delay
+
+    def _update(self, headers):
+        """
+        Re-seeds the bucket from the rate limit headers of an API response. Headers that are missing or malformed are
+        ignored.
+        """
+        limit = _parse_header(headers.get("RateLimit-Limit"), int)
+        remaining = _parse_header(headers.get("RateLimit-Remaining"), float)
+        reset = _parse_header(headers.get("RateLimit-Reset"), float)
+        if limit is None or remaining is None:
+            return
+
+        with self._lock:
+            self.limit = limit
+            self._tokens = remaining
+            self._updated = time.monotonic()
+
+            seconds_until_reset = reset - time.time() if reset is not None else 0
+            if seconds_until_reset > 0 and self.limit > self._tokens:
+                self._refill_rate = (self.limit - self._tokens) / seconds_until_reset
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self._tokens + (now - self._updated) * self._refill_rate, self.limit)
+        self._updated = now
+
+
+def _parse_header(value, parse):
+    if value is None:
+        return None
+
+    try:
+        return parse(value)
+    except ValueError:
+        return None
@@ -0,0 +1,160 @@
+import contextvars
+import email.utils
+import random
+import time
+
+from .instrumentation import _get_endpoint_template, _start_request, _finish_request
+
+_IDEMPOTENT_METHODS = ("GET", "PUT", "DELETE")
+
+_last_request_statistics = contextvars.ContextVar("hetznercloud_last_request_statistics", default=None)
+
+
+class HetznerCloudRetryPolicy(object):
+    """
+    Decides whether a failed request should be retried, and how long to wait before doing so. Waits grow exponentially
+    with each attempt (capped at `max_backoff` seconds) and are randomised to stop clients retrying in lockstep. A
+    Retry-After header sent by the API always takes precedence over the computed wait.
+
+    Only idempotent requests (GET, PUT and DELETE) are retried, unless `retry_post` is set. POST requests start actions,
+    so retrying one whose response was lost could, for example, create a server twice.
+    """
+    def __init__(self, max_attempts=3, backoff_factor=0.5, max_backoff=30, jitter=True, retry_post=False,
+                 retry_status_codes=(429, 500, 502, 503, 504)):
+        """
+        :param max_attempts: The maximum number of times a request is sent, including the first attempt.
+        :param backoff_factor: The number of seconds to wait before the first retry. Each further retry doubles it.
+        :param max_backoff: The maximum number of seconds to wait between two attempts.
+        :param jitter: Whether waits should be randomised between zero and the computed backoff.
+        :param retry_post: Whether POST requests should be retried.
+        :param retry_status_codes: The response status codes that are considered transient.
+        """
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_post = retry_post
+        self.retry_status_codes = retry_status_codes
+
+    def get_backoff(self, attempt):
+        """
+        Returns the number of seconds to wait after the given (1-based) attempt has failed.
+        """
+        backoff = min(self.backoff_factor * (2 ** (attempt - 1)), self.max_backoff)
+        return random.uniform(0, backoff) if self.jitter else backoff
+
+    def _get_retry_delay(self, method, attempt, status_code=None, retry_after=None):
+        """
+        Returns the number of seconds to wait before retrying a request, or None if it should not be retried.
+        Connection errors are represented by a status code of None.
+        """
+        if attempt >= self.max_attempts:
+            return None
+
+        if method not in _IDEMPOTENT_METHODS and not (method == "POST" and self.retry_post):
+            return None
+
+        if status_code is not None and status_code not in self.retry_status_codes:
+            return None
+
+        retry_after_seconds = _parse_retry_after(retry_after)
+        if retry_after_seconds is not None:
+            return retry_after_seconds
+
+        return self.get_backoff(attempt)
+
+
+class HetznerCloudRequestStatistics(object):
+    """
+    Describes how much effort a single call to the API took, including any retries.
+    """
+    def __init__(self, method, endpoint):
+        self.method = method
+        self.endpoint = endpoint
+        self.attempts = 0
+        self.total_wait = 0.0
+
+
+def _start_request_statistics(method, endpoint):
+    statistics = HetznerCloudRequestStatistics(method, endpoint)
+    _last_request_statistics.set(statistics)
+    return statistics
+
+
+def _get_last_request_statistics():
+    return _last_request_statistics.get()
+
+
+class _RequestAttempts(object):
+    """
+    The policy for sending a single call to the API, shared by the synchronous and asynchronous clients so that only
+    the transport and the way of sleeping differ between them. Every attempt draws from the rate limiter, is reported to
+    the request hooks and statistics, and is retried as the retry policy allows. For each attempt, the caller:
+
+    1. calls acquire() and sleeps for the number of seconds it returns,
+    2. calls start() and sends the request,
+    3. calls failed() with a connection error, or finished() with the response, and sleeps for the number of seconds
+       returned before the next attempt. None means the error should be raised, or the response returned.
+    """
+    def __init__(self, config, method, endpoint, data=None):
+        self.statistics = _start_request_statistics(method, endpoint)
+        self._config = config
+        self._method = method
+        self._template = _get_endpoint_template(endpoint)
+        self._data = data
+        self._event = None
+        self._started = None
+
+    def acquire(self):
+        """
+        Counts a new attempt, returning the number of seconds to wait for the rate limiter before sending it.
+        """
+        self.statistics.attempts += 1
+        if self._config.rate_limiter is None:
+            return 0
+
+        return self._config.rate_limiter._acquire()
+
+    def start(self):
+        self._event, self._started = _start_request(self._config, self._method, self._template,
+                                                    self.statistics.attempts, self._data)
+
+    def failed(self, error):
+        _finish_request(self._config, self._event, self._started, error=error)
+        return self._wait(_get_retry_delay(self._config, self._method, self.statistics.attempts))
+
+    def finished(self, status_code, headers, response_bytes):
+        _finish_request(self._config, self._event, self._started, status_code, response_bytes)
+        if self._config.rate_limiter is not None:
+            self._config.rate_limiter._update(headers)
+
+        return self._wait(_get_retry_delay(self._config, self._method, self.statistics.attempts, status_code,
+                                           headers.get("Retry-After")))
+
+    def _wait(self, delay):
+        if delay is not None:
+            self.statistics.total_wait += delay
+        return delay
+
+
+def _get_retry_delay(config, method, attempt, status_code=None, retry_after=None):
+    if config.retry_policy is None:
+        return None
+
+    return config.retry_policy._get_retry_delay(method, attempt, status_code, retry_after)
+
+
+def _parse_retry_after(retry_after):
+    if retry_after is None:
+        return None
+
+    try:
+        return max(float(retry_after), 0)
+    except ValueError:
+        pass
+
+    retry_at = email.utils.parsedate_tz(retry_after)
+    if retry_at is None:
+        return None
+
+    return max(email.utils.mktime_tz(retry_at) - time.time(), 0)
@@ -1,29 +1,32 @@
 from .exceptions import HetznerActionException
-from .shared import _get_results
+from .shared import _get_results, _get_catalog_results, _get_cached_record
 
 
 class HetznerCloudServerTypesAction(object):
     def __init__(self, config):
         self._config = config
 
-    def get_all(self, name=None):
-        status_code, results = _get_results(self._config, "server_types",
-                                            url_params={"name": name} if name is not None else None)
-        if status_code != 200:
-            raise HetznerActionException(results)
-
-        for result in results["server_types"]:
+    def get_all(self, name=None, per_page=None, max_items=None, prefetch=0, stream=False):
+        for result in _get_catalog_results(self._config, "server_types", "server_types",
+                                           url_params={"name": name} if name is not None else None,
+                                           per_page=per_page, max_items=max_items, prefetch=prefetch, stream=stream):
             yield HetznerCloudServerType._load_from_json(result)
 
     def get(self, id):
-        status_code, results = _get_results(self._config, "server_types/%s" % id)
-        if status_code != 200:
-            raise HetznerActionException(results)
+        result = _get_cached_record(self._config, "server_types", id)
+        if result is None:
+            status_code, results = _get_results(self._config, "server_types/%s" % id)
+            if status_code != 200:
+                raise HetznerActionException(results)
+
+            result = results["server_type"]
 
-        return HetznerCloudServerType._load_from_json(results["server_type"])
+        return HetznerCloudServerType._load_from_json(result)
 
 
 class HetznerCloudServerType(object):
+    __slots__ = ("id", "name", "description", "cores", "memory", "disk", "storage_type")
+
     def __init__(self):
         self.id = 0
         self.name = ""
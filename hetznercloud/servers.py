@@ -1,11 +1,14 @@
 import time
 
-from .actions import HetznerCloudAction
+from .actions import HetznerCloudAction, HetznerCloudActionsAction
+from .batches import HetznerCloudBatchResult, _run_concurrently
 from .constants import RESCUE_TYPE_LINUX, RESCUE_TYPE_FREEBSD, BACKUP_WINDOW_2AM_6AM, SERVER_STATUS_RUNNING, \
     SERVER_STATUS_OFF
 from .exceptions import HetznerServerNotFoundException, HetznerInvalidArgumentException, HetznerActionException, \
     HetznerWaitAttemptsExceededException
-from .shared import _get_results
+from .polling import _Poller
+from .shared import _get_results, _get_paginated_results, _LazyModel, _load_model
+from .tables import HetznerCloudServerTable
 
 
 def _get_server_json(config, server_id):
@@ -55,22 +58,236 @@ class HetznerCloudServersAction(object):
         return HetznerCloudServer._load_from_json(self._config, result["server"], result["root_password"]), \
                HetznerCloudAction._load_from_json(self._config, result["action"])
 
+    def create_many(self, specs, max_concurrency=5, timeout=None, rollback=False):
+        """
+        Creates a number of servers concurrently and waits for all of them to be created.
+
+        Create requests are sent from up to `max_concurrency` threads at once, drawing from the configuration's rate
+        limiter (if one is set up). The resulting actions are then waited for together using a single list query per
+        poll (see HetznerCloudActionsAction.wait_for_actions).
+
+        :param specs: A list of dictionaries, each holding the keyword arguments to pass to create() for one server.
+        :param max_concurrency: The maximum number of create requests in flight at once.
+        :param timeout: The maximum number of seconds to wait for the servers to be created.
+        :param rollback: Whether to delete the servers that were created if any server in the batch failed.
+        :return: A list of HetznerCloudBatchResult objects in the same order as the specs. Each result holds the spec,
+                 the created server and its action, and the exception that caused it to fail (if any). Servers deleted
+                 during a rollback are marked as `rolled_back`, and if one could not be deleted, the exception is held
+                 in `rollback_error`. Neither counts as succeeded.
+        """
+        if not isinstance(max_concurrency, int) or max_concurrency < 1:
+            raise HetznerInvalidArgumentException("max_concurrency", "must be a positive integer")
+
+        results = [HetznerCloudBatchResult(spec) for spec in specs]
+
+        def create(result):
+            try:
+                result.server, result.action = self.create(**result.item)
+            except Exception as e:
+                result.error = e
+
+        _run_concurrently(create, results, max_concurrency)
+
+        created = [result for result in results if result.action is not None]
+        outcomes = HetznerCloudActionsAction(self._config).wait_for_actions([result.action for result in created],
+                                                                            timeout=timeout)
+        for result, (_, error) in zip(created, outcomes):
+            result.error = error
+
+        if rollback and any(not result.succeeded for result in results):
+            self._roll_back([result for result in results if result.server is not None], max_concurrency)
+
+        return results
+
+    def _roll_back(self, results, max_concurrency):
+        def delete(result):
+            try:
+                result.server.delete()
+                result.rolled_back = True
+            except Exception as e:
+                result.rollback_error = e
+
+        _run_concurrently(delete, results, max_concurrency)
+
+    def bulk(self, servers):
+        """
+        Selects a set of servers to perform the same action on, i.e. client.servers().bulk([1, 2, 3]).power_off().
+
+        :param servers: The servers, either as HetznerCloudServer objects or as their ids.
+        :return: A HetznerCloudServersBulkAction.
+        """
+        servers = list(servers)
+        for server in servers:
+            if not isinstance(server, HetznerCloudServer) and (not isinstance(server, int) or server < 1):
+                raise HetznerInvalidArgumentException("servers", "must be HetznerCloudServer objects or server ids")
+
+        return HetznerCloudServersBulkAction(self._config, servers)
+
     def get(self, server_id):
         if not isinstance(server_id, int) or server_id == 0:
             raise HetznerServerNotFoundException()
 
         return HetznerCloudServer._load_from_json(self._config, _get_server_json(self._config, server_id))
 
-    def get_all(self, name=None):
-        status_code, results = _get_results(self._config, "servers", {"name": name} if name is not None else None)
-        if status_code != 200:
-            raise HetznerActionException(results)
-        
-        for result in results["servers"]:
+    def get_all(self, name=None, per_page=None, max_items=None, prefetch=0, stream=False):
+        for result in _get_paginated_results(self._config, "servers", "servers",
+                                             {"name": name} if name is not None else None,
+                                             per_page=per_page, max_items=max_items, prefetch=prefetch, stream=stream):
             yield HetznerCloudServer._load_from_json(self._config, result)
 
+    def snapshot(self, name=None, per_page=50, prefetch=0, stream=False):
+        """
+        Loads every server into a columnar table, without building a HetznerCloudServer for each of them. This is the
+        fastest way to answer questions about a large fleet (for example, which servers have used most of their
+        included traffic).
+
+        :param name: Only include the server with this name.
+        :param per_page: The number of servers to request per page.
+        :param prefetch: The number of pages to fetch ahead on a background thread.
+        :param stream: Whether to add each server to the table as soon as it has been read, rather than decoding whole
+                       pages at once.
+        :return: A HetznerCloudServerTable.
+        """
+        table = HetznerCloudServerTable()
+        for result in _get_paginated_results(self._config, "servers", "servers",
+                                             {"name": name} if name is not None else None,
+                                             per_page=per_page, prefetch=prefetch, stream=stream):
+            table._append(result)
+
+        return table
+
+
+class HetznerCloudServersBulkAction(object):
+    """
+    Performs the same action on a set of servers. The action is started on every server concurrently (at most
+    `max_concurrency` requests at once, drawing from the configuration's rate limiter if one is set up), and the
+    resulting actions are then waited for together (see HetznerCloudActionsAction.wait_for_actions).
+
+    Every method returns a list of HetznerCloudBatchResult objects in the same order as the servers. Each result holds
+    the server (or id) it was given as its `item`, the `action` that was started and the exception that caused it to
+    fail (if any). When the servers were given as HetznerCloudServer objects, they are also available as `server`, and
+    are updated as if the action had been performed on each of them individually.
+    """
+    def __init__(self, config, servers):
+        self._config = config
+        self._servers = servers
+
+    def power_on(self, max_concurrency=5, timeout=None, wait=True):
+        """
+        Powers on every server.
+
+        :param max_concurrency: The maximum number of requests in flight at once.
+        :param timeout: The maximum number of seconds to wait for the actions to finish.
+        :param wait: Whether to wait for the actions to finish, or to return as soon as they have been started.
+        :return: A list of HetznerCloudBatchResult objects.
+        """
+        return self._perform("poweron", max_concurrency, timeout, wait, status=SERVER_STATUS_RUNNING)
+
+    def power_off(self, max_concurrency=5, timeout=None, wait=True):
+        """
+        Cuts the power to every server, without giving the operating system a chance to shut down (see shutdown()).
+
+        :param max_concurrency: The maximum number of requests in flight at once.
+        :param timeout: The maximum number of seconds to wait for the actions to finish.
+        :param wait: Whether to wait for the actions to finish, or to return as soon as they have been started.
+        :return: A list of HetznerCloudBatchResult objects.
+        """
+        return self._perform("poweroff", max_concurrency, timeout, wait, status=SERVER_STATUS_OFF)
+
+    def shutdown(self, max_concurrency=5, timeout=None, wait=True):
+        """
+        Asks the operating system of every server to shut down. The actions finish once the request has been sent, not
+        once the servers are off.
+
+        :param max_concurrency: The maximum number of requests in flight at once.
+        :param timeout: The maximum number of seconds to wait for the actions to finish.
+        :param wait: Whether to wait for the actions to finish, or to return as soon as they have been started.
+        :return: A list of HetznerCloudBatchResult objects.
+        """
+        return self._perform("shutdown", max_concurrency, timeout, wait)
+
+    def soft_reboot(self, max_concurrency=5, timeout=None, wait=True):
+        """
+        Asks the operating system of every server to reboot.
+
+        :param max_concurrency: The maximum number of requests in flight at once.
+        :param timeout: The maximum number of seconds to wait for the actions to finish.
+        :param wait: Whether to wait for the actions to finish, or to return as soon as they have been started.
+        :return: A list of HetznerCloudBatchResult objects.
+        """
+        return self._perform("reboot", max_concurrency, timeout, wait)
+
+    def reset(self, max_concurrency=5, timeout=None, wait=True):
+        """
+        Cuts the power to every server and starts it again.
+
+        :param max_concurrency: The maximum number of requests in flight at once.
+        :param timeout: The maximum number of seconds to wait for the actions to finish.
+        :param wait: Whether to wait for the actions to finish, or to return as soon as they have been started.
+        :return: A list of HetznerCloudBatchResult objects.
+        """
+        return self._perform("reset", max_concurrency, timeout, wait)
+
+    def _perform(self, command, max_concurrency, timeout, wait, status=None):
+        if not isinstance(max_concurrency, int) or max_concurrency < 1:
+            raise HetznerInvalidArgumentException("max_concurrency", "must be a positive integer")
+
+        results = [HetznerCloudBatchResult(server) for server in self._servers]
+
+        def start(result):
+            server = result.item if isinstance(result.item, HetznerCloudServer) else None
+            server_id = server.id if server is not None else result.item
+            try:
+                status_code, response = _get_results(self._config, "servers/%s/actions/%s" % (server_id, command),
+                                                     method="POST")
+                if status_code != 201:
+                    raise HetznerActionException(response)
+
+                result.action = HetznerCloudAction._load_from_json(self._config, response["action"])
+            except Exception as e:
+                result.error = e
+                return
+
+            result.server = server
+            if server is not None and status is not None:
+                server._set(status=status)
+
+        _run_concurrently(start, results, max_concurrency)
+
+        if wait:
+            started = [result for result in results if result.action is not None]
+            outcomes = HetznerCloudActionsAction(self._config).wait_for_actions(
+                [result.action for result in started], timeout=timeout)
+            for result, (_, error) in zip(started, outcomes):
+                result.error = error
+
+        return results
+
+
+class HetznerCloudServer(_LazyModel):
+    __slots__ = ("_config", "id", "name", "status", "created", "public_net_ipv4", "public_net_ipv6", "server_type",
+                 "datacenter_id", "image_id", "iso", "rescue_enabled", "locked", "backup_window", "outgoing_traffic",
+                 "ingoing_traffic", "included_traffic", "root_password")
+
+    _decoders = {
+        "id": lambda json: json["id"],
+        "name": lambda json: json["name"],
+        "status": lambda json: json["status"],
+        "created": lambda json: json["created"],
+        "public_net_ipv4": lambda json: json["public_net"]["ipv4"]["ip"],
+        "public_net_ipv6": lambda json: json["public_net"]["ipv6"]["ip"],
+        "server_type": lambda json: json["server_type"]["name"],
+        "datacenter_id": lambda json: int(json["datacenter"]["id"] if json["datacenter"] is not None else 0),
+        "image_id": lambda json: json["image"]["name"] if json["image"] is not None else "",
+        "iso": lambda json: json["iso"]["name"] if json["iso"] is not None else "",
+        "rescue_enabled": lambda json: bool(json["rescue_enabled"]),
+        "locked": lambda json: bool(json["locked"]),
+        "backup_window": lambda json: json["backup_window"],
+        "outgoing_traffic": lambda json: int(json["outgoing_traffic"]),
+        "ingoing_traffic": lambda json: int(json["ingoing_traffic"]),
+        "included_traffic": lambda json: int(json["included_traffic"]),
+    }
 
-class HetznerCloudServer(object):
     def __init__(self, config):
         self._config = config
         self.id = 0
@@ -100,7 +317,7 @@ class HetznerCloudServer(object):
         if status_code != 201:
             raise HetznerActionException(result)
 
-        self.iso = iso
+        self._set(iso=iso)
 
         return HetznerCloudAction._load_from_json(self._config, result["action"])
 
@@ -113,7 +330,7 @@ class HetznerCloudServer(object):
         if status_code != 200:
             raise HetznerActionException(result)
 
-        self.name = new_name
+        self._set(name=new_name)
 
     def change_reverse_dns_entry(self, ip, dns_pointer=None):
         if not ip:
@@ -135,7 +352,7 @@ class HetznerCloudServer(object):
         if status_code != 201:
             raise HetznerActionException(result)
 
-        self.server_type = new_instance_type
+        self._set(server_type=new_instance_type)
 
         return HetznerCloudAction._load_from_json(self._config, result["action"])
 
@@ -144,7 +361,7 @@ class HetznerCloudServer(object):
         if status_code != 200:
             raise HetznerActionException(result)
 
-        self.iso = ""
+        self._set(iso="")
 
         return HetznerCloudAction._load_from_json(self._config, result["action"])
 
@@ -160,7 +377,7 @@ class HetznerCloudServer(object):
         if status_code != 201:
             raise HetznerActionException(result)
 
-        self.rescue_enabled = False
+        self._set(rescue_enabled=False)
 
         return HetznerCloudAction._load_from_json(self._config, result["action"])
 
@@ -170,7 +387,7 @@ class HetznerCloudServer(object):
         if status_code != 201:
             raise HetznerActionException("Invalid backup window choice" if status_code == 422 else result)
 
-        self.backup_window = backup_window
+        self._set(backup_window=backup_window)
 
         return HetznerCloudAction._load_from_json(self._config, result["action"])
 
@@ -199,7 +416,7 @@ class HetznerCloudServer(object):
         if status_code != 201:
             raise HetznerActionException(result)
 
-        self.rescue_enabled = True
+        self._set(rescue_enabled=True)
 
         return result["root_password"], HetznerCloudAction._load_from_json(self._config, result["action"])
 
@@ -220,7 +437,7 @@ class HetznerCloudServer(object):
         if status_code != 201:
             raise HetznerActionException(result)
 
-        self.status = SERVER_STATUS_RUNNING
+        self._set(status=SERVER_STATUS_RUNNING)
 
         return HetznerCloudAction._load_from_json(self._config, result["action"])
 
@@ -229,7 +446,7 @@ class HetznerCloudServer(object):
         if status_code != 201:
             raise HetznerActionException(result)
 
-        self.status = SERVER_STATUS_OFF
+        self._set(status=SERVER_STATUS_OFF)
 
         return HetznerCloudAction._load_from_json(self._config, result["action"])
 
@@ -249,7 +466,7 @@ class HetznerCloudServer(object):
         if status_code != 201:
             raise HetznerActionException(result)
 
-        self.image_id = image
+        self._set(image_id=image)
 
         return HetznerCloudAction._load_from_json(self._config, result["action"])
 
@@ -274,49 +491,38 @@ class HetznerCloudServer(object):
 
         return HetznerCloudAction._load_from_json(self._config, result["action"])
 
-    def wait_until_status_is(self, status, attempts=20, wait_seconds=1):
+    def wait_until_status_is(self, status, attempts=None, wait_seconds=None, timeout=None, polling=None):
         """
-        Sleeps the executing thread (a second each loop) until the status is either what the user requires or the
-        attempt count is exceeded, in which case an exception is thrown.
+        Sleeps the executing thread until the status is either what the user requires or the time available runs out,
+        in which case an exception is thrown.
+
+        By default, the configured polling strategy decides how long to wait between polls, for up to `timeout`
+        seconds. Passing `attempts` or `wait_seconds` instead polls every `wait_seconds` seconds, at most `attempts`
+        times.
 
-        :param status: The status the action needs to be.
-        :param attempts: The number of attempts to query the action's status.
+        :param status: The status the server needs to be.
+        :param attempts: The number of attempts to query the server's status.
         :param wait_seconds: The number of seconds to wait for between each attempt.
+        :param timeout: The maximum number of seconds to wait for (60 seconds if no other limit is specified).
+        :param polling: The HetznerCloudPollingStrategy deciding how long to wait between polls.
         :return: An exception, unless the status matches the status parameter.
         """
         if self.status == status:
             return
 
-        for i in range(0, attempts):
+        poller = _Poller(self._config, attempts, wait_seconds, timeout, polling)
+        while True:
             server_status = _get_server_json(self._config, self.id)["status"]
             if server_status == status:
-                self.status = server_status
+                self._set(status=server_status)
                 return
 
-            time.sleep(wait_seconds)
-
-        raise HetznerWaitAttemptsExceededException()
-
-    @staticmethod
-    def _load_from_json(config, json, root_password=None):
-        cloud_server = HetznerCloudServer(config)
-
-        cloud_server.id = json["id"]
-        cloud_server.name = json["name"]
-        cloud_server.status = json["status"]
-        cloud_server.created = json["created"]
-        cloud_server.public_net_ipv4 = json["public_net"]["ipv4"]["ip"]
-        cloud_server.public_net_ipv6 = json["public_net"]["ipv6"]["ip"]
-        cloud_server.server_type = json["server_type"]["name"]
-        cloud_server.datacenter_id = int(json["datacenter"]["id"] if json["datacenter"] is not None else 0)
-        cloud_server.image_id = json["image"]["name"] if json["image"] is not None else ""
-        cloud_server.iso_id = json["iso"]["name"] if json["iso"] is not None else ""
-        cloud_server.rescue_enabled = bool(json["rescue_enabled"])
-        cloud_server.locked = bool(json["locked"])
-        cloud_server.backup_window = json["backup_window"]
-        cloud_server.outgoing_traffic = int(json["outgoing_traffic"])
-        cloud_server.ingoing_traffic = int(json["ingoing_traffic"])
-        cloud_server.included_traffic = int(json["included_traffic"])
-        cloud_server.root_password = root_password
-
-        return cloud_server
+            delay = poller.next_delay()
+            if delay is None:
+                raise HetznerWaitAttemptsExceededException()
+
+            time.sleep(delay)
+
+    @classmethod
+    def _load_from_json(cls, config, json, root_password=None):
+        return _load_model(cls, json, config.lazy_decoding, _config=config, root_password=root_password)
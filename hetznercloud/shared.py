@@ -1,41 +1,431 @@
-import json
+import queue
+import threading
+import time
 
 import requests
+import requests.adapters
 
-from .exceptions import HetznerAuthenticationException, HetznerInternalServerErrorException, HetznerActionException, HetznerRateLimitExceeded
+from .coalescing import _get_coalescing_key
+from .exceptions import HetznerAuthenticationException, HetznerInternalServerErrorException, HetznerActionException, HetznerRateLimitExceeded, \
+    HetznerInvalidArgumentException
+from .retries import _start_request_statistics, _RequestAttempts
+from .streaming import _stream_list, _CHUNK_SIZE
+
+_END_OF_PAGES = object()
+
+# Guards the fields of every model. A single lock is shared, rather than one per model, as models are small and
+# numerous, and it is only ever held for as long as it takes to set a few attributes.
+_MODEL_LOCK = threading.Lock()
+
+
+class _LazyModel(object):
+    """
+    The base class of models that can be loaded lazily. Subclasses map each field to a function that decodes it from
+    the raw JSON record in `_decoders`. A lazily loaded model keeps a reference to its record and decodes each field the
+    first time it is accessed, storing the result so later accesses cost nothing.
+
+    Models can be shared between threads. Methods that change a model after a successful call set its fields with
+    _set(), so that a field being decoded by one thread never overwrites a change made by another.
+    """
+    __slots__ = ("_raw",)
+
+    _decoders = {}
+
+    def __getattr__(self, name):
+        # Only called when the field has not been set yet, so decoding happens at most once per field (per thread).
+        decode = self._decoders.get(name)
+        if decode is None:
+            raise AttributeError("'%s' object has no attribute '%s'" % (type(self).__name__, name))
+
+        try:
+            raw = self._raw
+        except AttributeError:
+            raise AttributeError("'%s' object has no attribute '%s'" % (type(self).__name__, name))
+
+        value = decode(raw)
+        with _MODEL_LOCK:
+            try:
+                # Another thread may have decoded (or changed) the field in the meantime.
+                return object.__getattribute__(self, name)
+            except AttributeError:
+                setattr(self, name, value)
+                return value
+
+    def _set(self, **fields):
+        """
+        Changes several fields at once, so that other threads see either all or none of the changes.
+        """
+        with _MODEL_LOCK:
+            for name, value in fields.items():
+                setattr(self, name, value)
+
+
+def _load_model(cls, json, lazy, **attributes):
+    """
+    Creates a model from its raw JSON record, either decoding every field straight away or (when `lazy` is set) leaving
+    them to be decoded on first access. Attributes that do not come from the record (such as the configuration) are
+    passed as keyword arguments.
+    """
+    model = cls.__new__(cls)
+    if lazy:
+        model._raw = json
+    else:
+        for field, decode in cls._decoders.items():
+            setattr(model, field, decode(json))
+
+    for name, value in attributes.items():
+        setattr(model, name, value)
+
+    return model
+
+
+def _create_adapter(config):
+    """
+    Creates the transport adapter owned by a configuration object. The adapter holds a thread-safe pool of keep-alive
+    connections which every action and model created from that configuration shares.
+    """
+    return requests.adapters.HTTPAdapter(pool_connections=config.pool_size,
+                                         pool_maxsize=config.max_connections_per_host)
+
+
+def _create_session(config, adapter):
+    """
+    Creates an HTTP session sending its requests through the configuration's adapter. Sessions are not safe to share
+    between threads (their cookie jar and settings are not guarded), so each thread gets its own, while the connections
+    themselves are pooled by the shared adapter.
+    """
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    if not config.keep_alive:
+        session.headers["Connection"] = "close"
+
+    return session
 
 
 def _get_results(config, endpoint, url_params=None, body=None, method="GET"):
-    api = "https://api.hetzner.cloud/v%s/%s?" % (config.api_version, endpoint)
+    coalescer = config.request_coalescer
+    if coalescer is None or method != "GET":
+        return _fetch_results(config, endpoint, url_params, body, method)
+
+    # A caller that is handed another thread's response made no attempts of its own. The thread sending the request
+    # replaces these statistics with its own.
+    _start_request_statistics(method, endpoint)
+    return coalescer._run(_get_coalescing_key(endpoint, url_params),
+                          lambda: _fetch_results(config, endpoint, url_params, body, method))
+
+
+def _fetch_results(config, endpoint, url_params=None, body=None, method="GET"):
+    url, headers, data = _build_request(config, endpoint, body)
+    cache_key, cache_entry = _get_cached_response(config, method, url, url_params, headers)
+
+    request = _send_request(config, method, endpoint, url, headers, data, url_params)
+    status_code, content = _handle_cached_response(config, cache_key, cache_entry, request.status_code,
+                                                   request.headers, request.content)
+    return _handle_response(config, status_code, content)
+
+
+def _send_request(config, method, endpoint, url, headers, data=None, url_params=None, stream=False):
+    """
+    Sends a request, drawing from the rate limiter and retrying transient failures as the retry policy allows, and
+    returns the final response. When `stream` is True, the body of the response is left to be read by the caller.
+    """
+    attempts = _RequestAttempts(config, method, endpoint, data)
+
+    while True:
+        delay = attempts.acquire()
+        if delay > 0:
+            time.sleep(delay)
+
+        attempts.start()
+        try:
+            request = config._get_session().request(method, url, headers=headers, params=url_params, data=data,
+                                                    stream=stream)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            delay = attempts.failed(e)
+            if delay is None:
+                raise
+        else:
+            # The size of a streamed response is only known up front if the API sends its length.
+            response_bytes = int(request.headers.get("Content-Length") or 0) if stream else len(request.content)
+            delay = attempts.finished(request.status_code, request.headers, response_bytes)
+            if delay is None:
+                return request
+
+            request.close()
+
+        time.sleep(delay)
+
+
+def _build_request(config, endpoint, body=None):
+    url = "%s/v%s/%s?" % (config.base_url, config.api_version, endpoint)
     headers = {"Authorization": "Bearer %s" % config.api_key}
-    data = json.dumps(body) if body is not None else None
-
-    if method == "GET":
-        request = requests.get(api, headers=headers, params=url_params)
-    elif method == "POST" or (method == "GET" and body is not None):
-        request = requests.post(api, data=data, headers=headers, params=url_params)
-    elif method == "DELETE":
-        request = requests.delete(api, headers=headers)
-    elif method == "PUT":
-        request = requests.put(api, headers=headers, data=data)
-
-    if request.status_code == 401 or request.status_code == 403:
+    data = config.json_codec.dumps(body) if body is not None else None
+    if data is not None:
+        headers["Content-Type"] = "application/json"
+
+    return url, headers, data
+
+
+def _get_cached_response(config, method, url, url_params, headers):
+    """
+    Looks up the response cached on disk for a GET request, adding its validators to the request headers so the API
+    can answer with a 304 if it is still current. Returns the cache key and the cached response (either may be None).
+    """
+    cache = config.response_cache
+    if cache is None or method != "GET":
+        return None, None
+
+    key = cache._get_key(config.api_key, url, url_params)
+    entry = cache._load(key)
+    if entry is not None:
+        headers.update(cache._get_validators(entry))
+
+    return key, entry
+
+
+def _handle_cached_response(config, cache_key, cache_entry, status_code, headers, content):
+    """
+    Serves a 304 response from the disk cache, and stores any other successful GET response in it. Returns the status
+    code and body to hand to _handle_response. Shared by the synchronous and asynchronous clients.
+    """
+    if cache_key is None:
+        return status_code, content
+
+    if status_code == 304 and cache_entry is not None:
+        return 200, config.response_cache._revalidated(cache_key, cache_entry)
+
+    if status_code == 200:
+        config.response_cache._store(cache_key, headers, content.decode("utf-8"))
+
+    return status_code, content
+
+
+def _handle_response(config, status_code, content):
+    """
+    Converts the status code and body of an API response into the (status code, JSON) tuple returned by
+    _get_results, raising the appropriate exception for error responses. Shared by the synchronous and asynchronous
+    clients.
+
+    The body is decoded straight from the bytes received (or from the string held by the response cache) by the
+    configuration's JSON codec, without decoding it into a string first.
+    """
+    if status_code == 401 or status_code == 403:
         raise HetznerAuthenticationException()
 
-    if request.status_code == 429:
+    if status_code == 429:
         raise HetznerRateLimitExceeded()
 
-    if request.status_code == 500:
-        raise HetznerInternalServerErrorException(request.text)
+    if status_code == 500:
+        raise HetznerInternalServerErrorException(_get_text(content))
 
-    if not request.text:
-        return request.status_code, ""
+    if not content:
+        return status_code, ""
 
     try:
-        js = request.json()
-        if "action" in js and "error" in js["action"] and js["action"]["error"] is not None:
-            raise HetznerActionException(js["action"]["error"])
-        
-        return request.status_code, js
-    except json.decoder.JSONDecodeError:
+        js = config.json_codec.loads(content)
+    except ValueError:
         raise HetznerInternalServerErrorException("failed to deserialise JSON")
+
+    # Some responses (such as creating an unassigned floating IP) hold a null action.
+    action = js.get("action")
+    if action is not None and action.get("error") is not None:
+        raise HetznerActionException(action["error"])
+
+    return status_code, js
+
+
+def _get_text(content):
+    return content.decode("utf-8", "replace") if isinstance(content, bytes) else content
+
+
+def _get_paginated_results(config, endpoint, key, url_params=None, per_page=None, max_items=None, prefetch=0,
+                           stream=False):
+    """
+    Lazily walks every page of a list endpoint by following the pagination metadata returned by the API, yielding the
+    raw JSON record of each resource. Only the page currently being consumed is held in memory, unless pages are being
+    prefetched.
+
+    :param config: The configuration to make the requests with.
+    :param endpoint: The list endpoint (i.e. servers).
+    :param key: The key in the response body that holds the list of resources (i.e. servers).
+    :param url_params: Any filters to pass through to the endpoint.
+    :param per_page: The number of resources to request per page, or None to use the API's default.
+    :param max_items: The maximum number of resources to yield, or None to yield every resource.
+    :param prefetch: The number of pages to fetch ahead of the consumer on a background thread, or 0 to fetch each page
+                     only when it is needed.
+    :param stream: Whether to decode each page incrementally as it is read, yielding every record as soon as it has been
+                   decoded, so that a whole page is never held in memory. Streaming cannot be combined with
+                   prefetching, and is not used when the configuration has a response cache.
+    """
+    params = _get_pagination_params(url_params, per_page, max_items)
+    if not isinstance(prefetch, int) or prefetch < 0:
+        raise HetznerInvalidArgumentException("prefetch", "must be zero or a positive integer")
+    if stream and prefetch:
+        raise HetznerInvalidArgumentException("prefetch", "cannot be used when streaming")
+
+    if stream and config.response_cache is None:
+        pages = _stream_pages(config, endpoint, key, params)
+    else:
+        pages = _get_pages(config, endpoint, key, params, max_items)
+    if prefetch > 0:
+        pages = _prefetch_pages(pages, prefetch)
+
+    yielded = 0
+    for page in pages:
+        # A streamed page is only requested once it is iterated over, so stop before asking for one that is not needed.
+        if max_items is not None and yielded >= max_items:
+            return
+
+        for result in page:
+            if max_items is not None and yielded >= max_items:
+                return
+
+            yield result
+            yielded += 1
+
+
+def _get_catalog_results(config, endpoint, key, url_params=None, per_page=None, max_items=None, prefetch=0,
+                         stream=False):
+    """
+    Returns the raw JSON records of a catalog resource (a resource that rarely changes, such as server types). When the
+    configuration has a catalog cache, the complete listing is served from (or stored in) the cache, otherwise this is
+    the same as _get_paginated_results.
+    """
+    cache = config.catalog_cache
+    if cache is None:
+        return _get_paginated_results(config, endpoint, key, url_params, per_page, max_items, prefetch, stream)
+
+    _validate_pagination_args(per_page, max_items)
+
+    records = cache._get(endpoint, url_params)
+    if records is None:
+        records = list(_get_paginated_results(config, endpoint, key, url_params, per_page=per_page, prefetch=prefetch,
+                                              stream=stream))
+        cache._put(endpoint, url_params, records)
+
+    return iter(records if max_items is None else records[:max_items])
+
+
+def _get_cached_record(config, endpoint, id):
+    """
+    Returns the raw JSON record of a single catalog resource from any cached listing that holds it, or None.
+    """
+    if config.catalog_cache is None:
+        return None
+
+    return config.catalog_cache._find(endpoint, id)
+
+
+def _validate_pagination_args(per_page, max_items):
+    if per_page is not None and (not isinstance(per_page, int) or per_page < 1):
+        raise HetznerInvalidArgumentException("per_page", "must be a positive integer")
+    if max_items is not None and (not isinstance(max_items, int) or max_items < 0):
+        raise HetznerInvalidArgumentException("max_items", "must be zero or a positive integer")
+
+
+def _get_pagination_params(url_params, per_page, max_items):
+    """
+    Validates the pagination arguments of a listing, returning the query parameters to request its first page with.
+    """
+    _validate_pagination_args(per_page, max_items)
+
+    params = dict(url_params) if url_params else {}
+    if per_page is not None:
+        params["per_page"] = per_page
+
+    return params
+
+
+def _get_pages(config, endpoint, key, params, max_items):
+    page = 1
+    fetched = 0
+    while page is not None and (max_items is None or fetched < max_items):
+        params["page"] = page
+        status_code, results = _get_results(config, endpoint, url_params=params)
+        if status_code != 200:
+            raise HetznerActionException(results)
+
+        fetched += len(results[key])
+        yield results[key]
+
+        page = _get_next_page(results)
+
+
+def _stream_pages(config, endpoint, key, params):
+    """
+    The streaming equivalent of _get_pages. Each page is a generator of records, and the next page is only requested
+    once the consumer has read the current one.
+    """
+    page = 1
+    while page is not None:
+        params["page"] = page
+        rest = {}
+        yield _stream_page(config, endpoint, key, params, rest)
+
+        page = _get_next_page(rest)
+
+
+def _stream_page(config, endpoint, key, params, rest):
+    url, headers, _ = _build_request(config, endpoint)
+    response = _send_request(config, "GET", endpoint, url, headers, url_params=params, stream=True)
+    try:
+        if response.status_code != 200:
+            _, results = _handle_response(config, response.status_code, response.content)
+            raise HetznerActionException(results)
+
+        try:
+            yield from _stream_list(response.iter_content(_CHUNK_SIZE), key, rest)
+        except ValueError:
+            raise HetznerInternalServerErrorException("failed to deserialise JSON")
+    finally:
+        response.close()
+
+
+def _prefetch_pages(pages, prefetch):
+    """
+    Consumes a page generator on a background thread, staying at most `prefetch` pages ahead of the caller. Pages are
+    handed over in order, and any exception raised whilst fetching is re-raised in the caller's thread once the pages
+    before it have been consumed.
+    """
+    buffer = queue.Queue()
+    slots = threading.Semaphore(prefetch)
+    stopped = threading.Event()
+
+    def fetch():
+        try:
+            while True:
+                while not slots.acquire(timeout=0.1):
+                    if stopped.is_set():
+                        return
+                if stopped.is_set():
+                    return
+
+                page = next(pages, _END_OF_PAGES)
+                buffer.put((page, None))
+                if page is _END_OF_PAGES:
+                    return
+        except Exception as e:
+            buffer.put((None, e))
+
+    threading.Thread(target=fetch, daemon=True).start()
+
+    try:
+        while True:
+            page, error = buffer.get()
+            if error is not None:
+                raise error
+            if page is _END_OF_PAGES:
+                return
+
+            slots.release()
+            yield page
+    finally:
+        stopped.set()
+
+
+def _get_next_page(results):
+    meta = results.get("meta") or {}
+    pagination = meta.get("pagination") or {}
+    return pagination.get("next_page")
@@ -1,18 +1,15 @@
 from .exceptions import HetznerInvalidArgumentException, HetznerActionException
-from .shared import _get_results
+from .shared import _get_results, _get_paginated_results, _LazyModel, _load_model
 
 
 class HetznerCloudSSHKeysAction(object):
     def __init__(self, config):
         self._config = config
 
-    def get_all(self, name=None):
-        status_code, results = _get_results(self._config, "ssh_keys",
-                                            url_params={"name": name} if name is not None else None)
-        if status_code != 200:
-            raise HetznerActionException(results)
-
-        for result in results["ssh_keys"]:
+    def get_all(self, name=None, per_page=None, max_items=None, prefetch=0, stream=False):
+        for result in _get_paginated_results(self._config, "ssh_keys", "ssh_keys",
+                                             url_params={"name": name} if name is not None else None,
+                                             per_page=per_page, max_items=max_items, prefetch=prefetch, stream=stream):
             yield HetznerCloudSSHKey._load_from_json(self._config, result)
 
     def get(self, id):
@@ -36,7 +33,16 @@ class HetznerCloudSSHKeysAction(object):
         return HetznerCloudSSHKey._load_from_json(self._config, result["ssh_key"])
 
 
-class HetznerCloudSSHKey(object):
+class HetznerCloudSSHKey(_LazyModel):
+    __slots__ = ("_config", "id", "name", "fingerprint", "public_key")
+
+    _decoders = {
+        "id": lambda json: int(json["id"]),
+        "name": lambda json: json["name"],
+        "fingerprint": lambda json: json["fingerprint"],
+        "public_key": lambda json: json["public_key"],
+    }
+
     def __init__(self, config):
         self._config = config
         self.id = 0
@@ -58,15 +64,8 @@ class HetznerCloudSSHKey(object):
         if status_code != 200:
             raise HetznerActionException(result)
 
-        self.name = name
-
-    @staticmethod
-    def _load_from_json(config, json):
-        ssh_key = HetznerCloudSSHKey(config)
-
-        ssh_key.id = int(json["id"])
-        ssh_key.name = json["name"]
-        ssh_key.fingerprint = json["fingerprint"]
-        ssh_key.public_key = json["public_key"]
+        self._set(name=name)
 
-        return ssh_key
+    @classmethod
+    def _load_from_json(cls, config, json):
+        return _load_model(cls, json, config.lazy_decoding, _config=config)
@@ -0,0 +1,114 @@
+import codecs
+import json
+
+# The number of bytes read from the response at a time.
+_CHUNK_SIZE = 64 * 1024
+_WHITESPACE = " \t\n\r"
+
+
+class _JsonStream(object):
+    """
+    Decodes a JSON document incrementally from an iterator of byte chunks, so the elements of a large array can be
+    decoded one at a time. Only the unread part of the current chunk (and of the value being decoded) is held in memory.
+
+    Values are decoded with the C scanner of the standard library's json module. A value split across two chunks is
+    decoded again once the next chunk has been read.
+    """
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json_decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._position = 0
+        self._exhausted = False
+
+    def _fill(self):
+        """
+        Appends the next chunk to the unread part of the buffer, returning False once the document has been read.
+        """
+        if self._exhausted:
+            return False
+
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._exhausted = True
+            text = self._text_decoder.decode(b"", final=True)
+        else:
+            text = self._text_decoder.decode(chunk)
+
+        self._buffer = self._buffer[self._position:] + text
+        self._position = 0
+        return True
+
+    def _peek(self):
+        """
+        Skips whitespace, returning the next character without consuming it (or an empty string at the end).
+        """
+        while True:
+            buffer = self._buffer
+            while self._position < len(buffer) and buffer[self._position] in _WHITESPACE:
+                self._position += 1
+            if self._position < len(buffer):
+                return buffer[self._position]
+            if not self._fill():
+                return ""
+
+    def _expect(self, characters):
+        """
+        Consumes the next character, which must be one of `characters`, and returns it.
+        """
+        character = self._peek()
+        if not character or character not in characters:
+            raise ValueError("Expected one of %r but found %r" % (characters, character))
+
+        self._position += 1
+        return character
+
+    def _value(self):
+        """
+        Decodes and consumes the next value.
+        """
+        self._peek()
+        while True:
+            try:
+                value, end = self._json_decoder.raw_decode(self._buffer, self._position)
+            except ValueError:
+                if not self._fill():
+                    raise
+                continue
+
+            # A value that runs to the end of the buffer (such as a number) may continue in the next chunk.
+            if end == len(self._buffer) and self._fill():
+                continue
+
+            self._position = end
+            return value
+
+
+def _stream_list(chunks, key, rest):
+    """
+    Yields the records held by the `key` array of a list response one at a time, as they are read. Every other member
+    of the response (such as the pagination metadata) is stored in the `rest` dictionary.
+    """
+    stream = _JsonStream(chunks)
+    stream._expect("{")
+    if stream._peek() == "}":
+        return
+
+    while True:
+        name = stream._value()
+        stream._expect(":")
+        if name == key:
+            stream._expect("[")
+            if stream._peek() == "]":
+                stream._position += 1
+            else:
+                while True:
+                    yield stream._value()
+                    if stream._expect(",]") == "]":
+                        break
+        else:
+            rest[name] = stream._value()
+
+        if stream._expect(",}") == "}":
+            return
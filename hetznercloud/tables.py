@@ -0,0 +1,225 @@
+import datetime
+import operator
+from array import array
+
+from .exceptions import HetznerInvalidArgumentException
+
+_INTEGER_COLUMNS = ("id", "datacenter_id", "outgoing_traffic", "ingoing_traffic", "included_traffic")
+_CATEGORICAL_COLUMNS = ("status", "server_type", "location")
+_TIMESTAMP_COLUMNS = ("created",)
+
+_OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": lambda value, values: value in values,
+}
+
+_AGGREGATES = {
+    "count": len,
+    "sum": sum,
+    "min": min,
+    "max": max,
+    "mean": lambda values: float(sum(values)) / len(values),
+}
+
+
+class HetznerCloudServerTable(object):
+    """
+    A columnar snapshot of servers. Rather than one object per server, every column is held in a single typed array,
+    so a table of thousands of servers takes up a few hundred kilobytes and can be filtered, grouped and aggregated
+    without building any models.
+
+    Integer columns (id, datacenter_id and the traffic columns) are stored as 64-bit integers, and missing traffic
+    values as 0. Textual columns (status, server_type and location) are dictionary-encoded, and the created column holds
+    UNIX timestamps.
+
+    Queries are plain Python loops over the arrays (there is no numpy to vectorize them with), so their cost grows with
+    the number of rows; the compact columns keep that cost to a few milliseconds for tens of thousands of servers.
+    """
+    def __init__(self):
+        self._columns = {}
+        for column in _INTEGER_COLUMNS:
+            self._columns[column] = array("q")
+        for column in _CATEGORICAL_COLUMNS:
+            self._columns[column] = array("I")
+        for column in _TIMESTAMP_COLUMNS:
+            self._columns[column] = array("d")
+
+        self._categories = {column: [] for column in _CATEGORICAL_COLUMNS}
+        self._codes = {column: {} for column in _CATEGORICAL_COLUMNS}
+
+    def __len__(self):
+        return len(self._columns["id"])
+
+    @property
+    def columns(self):
+        return _INTEGER_COLUMNS + _CATEGORICAL_COLUMNS + _TIMESTAMP_COLUMNS
+
+    def column(self, name):
+        """
+        Returns the values of a column, in the order of the rows of the table.
+
+        :param name: The name of the column (i.e. outgoing_traffic).
+        :return: A typed array for numeric columns, or a list of strings for textual columns.
+        """
+        values = self._get_column(name)
+        if name in self._categories:
+            categories = self._categories[name]
+            return [categories[code] for code in values]
+
+        return values
+
+    def divide(self, numerator, denominator):
+        """
+        Divides one numeric column by another, row by row. Rows whose denominator is 0 give 0.
+
+        :param numerator: The name of the column to divide.
+        :param denominator: The name of the column to divide by.
+        :return: An array of floats with one value per row, which can be passed to where().
+        """
+        return array("d", (float(n) / d if d else 0.0
+                           for n, d in zip(self._get_numeric_column(numerator), self._get_numeric_column(denominator))))
+
+    def where(self, column, op, value):
+        """
+        Returns a new table holding the rows that match a condition. Conditions can be chained to combine them.
+
+        :param column: The name of the column to compare, or an array of values with one value per row (such as the
+                       result of divide()).
+        :param op: One of ==, !=, <, <=, >, >= or in.
+        :param value: The value to compare against, or a collection of values when `op` is in.
+        :return: A HetznerCloudServerTable.
+        """
+        compare = _OPERATORS.get(op)
+        if compare is None:
+            raise HetznerInvalidArgumentException("op", "must be one of %s" % ", ".join(sorted(_OPERATORS)))
+        if op == "in" and isinstance(value, (str, bytes)):
+            raise HetznerInvalidArgumentException("value", "must be a collection of values when op is in")
+
+        if isinstance(column, str) and column in self._categories and op in ("==", "!=", "in"):
+            # Compare the codes of textual columns, so no strings are looked up per row.
+            codes = self._codes[column]
+            if op == "in":
+                value = {codes[v] for v in value if v in codes}
+            else:
+                value = codes.get(value, -1)
+            values = self._columns[column]
+        elif isinstance(column, str):
+            values = self.column(column)
+        else:
+            values = column
+            if len(values) != len(self):
+                raise HetznerInvalidArgumentException("column", "must have one value per row")
+
+        return self._take([index for index, v in enumerate(values) if compare(v, value)])
+
+    def group_by(self, column):
+        """
+        Splits the table by the values of a column.
+
+        :param column: The name of the column to group by.
+        :return: A dictionary of each value of the column to a HetznerCloudServerTable holding its rows.
+        """
+        return {value: self._take(indexes) for value, indexes in self._group_indexes(column).items()}
+
+    def aggregate(self, column, function, by=None):
+        """
+        Aggregates the values of a numeric column.
+
+        :param column: The name of the column to aggregate.
+        :param function: One of count, sum, min, max or mean.
+        :param by: The name of a column to group by before aggregating, or None to aggregate the whole table.
+        :return: The aggregated value (None for an empty table, except for count), or a dictionary of each value of
+                 the `by` column to its aggregated value.
+        """
+        aggregate = _AGGREGATES.get(function)
+        if aggregate is None:
+            raise HetznerInvalidArgumentException("function", "must be one of %s" % ", ".join(sorted(_AGGREGATES)))
+
+        values = self._get_column(column) if function == "count" else self._get_numeric_column(column)
+        if by is not None:
+            # Only the aggregated column is copied for each group, rather than every column of the table.
+            return {value: _aggregate(aggregate, function, _take(values, indexes))
+                    for value, indexes in self._group_indexes(by).items()}
+
+        return _aggregate(aggregate, function, values)
+
+    def _append(self, json):
+        """
+        Adds a server to the table from its raw JSON record.
+        """
+        columns = self._columns
+        columns["id"].append(json["id"])
+        columns["datacenter_id"].append(json["datacenter"]["id"] if json["datacenter"] is not None else 0)
+        columns["outgoing_traffic"].append(json["outgoing_traffic"] or 0)
+        columns["ingoing_traffic"].append(json["ingoing_traffic"] or 0)
+        columns["included_traffic"].append(json["included_traffic"] or 0)
+        columns["status"].append(self._encode("status", json["status"]))
+        columns["server_type"].append(self._encode("server_type", json["server_type"]["name"]))
+        columns["location"].append(self._encode("location", json["datacenter"]["location"]["name"]
+                                                if json["datacenter"] is not None else ""))
+        columns["created"].append(_parse_timestamp(json["created"]))
+
+    def _encode(self, column, value):
+        codes = self._codes[column]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self._categories[column])
+            self._categories[column].append(value)
+
+        return code
+
+    def _group_indexes(self, column):
+        """
+        Returns a dictionary of each value of a column to the indexes of the rows holding it.
+        """
+        groups = {}
+        for index, value in enumerate(self.column(column)):
+            groups.setdefault(value, []).append(index)
+
+        return groups
+
+    def _take(self, indexes):
+        table = HetznerCloudServerTable()
+        for name, values in self._columns.items():
+            table._columns[name] = _take(values, indexes)
+
+        # The categories are never modified once the table has been loaded, so they can be shared.
+        table._categories = self._categories
+        table._codes = self._codes
+        return table
+
+    def _get_column(self, name):
+        values = self._columns.get(name)
+        if values is None:
+            raise HetznerInvalidArgumentException("column", "must be one of %s" % ", ".join(self.columns))
+
+        return values
+
+    def _get_numeric_column(self, name):
+        if name in self._categories:
+            raise HetznerInvalidArgumentException("column", "%s is not numeric" % name)
+
+        return self._get_column(name)
+
+
+def _take(values, indexes):
+    return array(values.typecode, [values[index] for index in indexes])
+
+
+def _aggregate(aggregate, function, values):
+    if not values and function != "count":
+        return None
+
+    return aggregate(values)
+
+
+def _parse_timestamp(value):
+    if not value:
+        return 0.0
+
+    return datetime.datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
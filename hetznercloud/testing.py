@@ -0,0 +1,1085 @@
+import base64
+import hashlib
+import ipaddress
+import json
+import random
+import re
+import socketserver
+import string
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+from .constants import ACTION_STATUS_RUNNING, ACTION_STATUS_SUCCESS, SERVER_STATUS_INITIALIZING, \
+    SERVER_STATUS_RUNNING, SERVER_STATUS_OFF, SERVER_STATUS_STARTING, SERVER_STATUS_STOPPING, \
+    SERVER_STATUS_REBUILDING, SERVER_STATUS_MIGRATING, RESCUE_TYPE_LINUX, RESCUE_TYPE_LINUX32, RESCUE_TYPE_FREEBSD, \
+    BACKUP_WINDOW_10PM_2AM, BACKUP_WINDOW_2AM_6AM, BACKUP_WINDOW_6AM_10AM, BACKUP_WINDOW_10AM_2PM, \
+    BACKUP_WINDOW_2PM_6PM, BACKUP_WINDOW_6PM_10PM, FLOATING_IP_TYPE_IPv4, FLOATING_IP_TYPE_IPv6, IMAGE_TYPE_BACKUP, \
+    IMAGE_TYPE_SNAPSHOT, IMAGE_TYPE_SYSTEM
+
+_DEFAULT_PER_PAGE = 25
+_MAX_PER_PAGE = 50
+
+# Every server gets 20 TB of included traffic, as every server type did when the API was released.
+_INCLUDED_TRAFFIC = 20 * 1024 ** 4
+
+_SERVER_IPV4_ADDRESSES = ipaddress.IPv4Network("198.18.0.0/15")
+_FLOATING_IPV4_ADDRESSES = ipaddress.IPv4Network("100.64.0.0/10")
+_SERVER_IPV6_NETWORKS = ipaddress.IPv6Network("2001:db8::/33")
+_FLOATING_IPV6_NETWORKS = ipaddress.IPv6Network("2001:db8:8000::/33")
+
+_BACKUP_WINDOWS = (BACKUP_WINDOW_10PM_2AM, BACKUP_WINDOW_2AM_6AM, BACKUP_WINDOW_6AM_10AM, BACKUP_WINDOW_10AM_2PM,
+                   BACKUP_WINDOW_2PM_6PM, BACKUP_WINDOW_6PM_10PM)
+_RESCUE_TYPES = (RESCUE_TYPE_LINUX, RESCUE_TYPE_LINUX32, RESCUE_TYPE_FREEBSD)
+_SERVER_NAME = re.compile(r"^[a-zA-Z0-9]([a-zA-Z0-9.-]*[a-zA-Z0-9])?$")
+
+_ERROR_CODES = {
+    400: "json_error",
+    401: "unauthorized",
+    403: "forbidden",
+    404: "not_found",
+    409: "conflict",
+    422: "invalid_input",
+    423: "locked",
+    429: "rate_limit_exceeded",
+    503: "unavailable",
+}
+
+_LOCATIONS = [
+    (1, "fsn1", "Falkenstein DC Park 1", "DE", "Falkenstein", 50.47612, 12.370071),
+    (2, "nbg1", "Nuremberg DC Park 1", "DE", "Nuremberg", 49.452102, 11.076665),
+    (3, "hel1", "Helsinki DC Park 1", "FI", "Helsinki", 60.169855, 24.938379),
+]
+
+_DATACENTERS = [
+    (1, "fsn1-dc8", "Falkenstein 1 DC 8", 1),
+    (2, "nbg1-dc3", "Nuremberg 1 DC 3", 2),
+    (3, "hel1-dc2", "Helsinki 1 DC 2", 3),
+]
+
+_SERVER_TYPES = [
+    (1, "cx11", "CX11", 1, 2, 20, "local", "shared"),
+    (2, "cx11-ceph", "CX11 Ceph Disk", 1, 2, 20, "network", "shared"),
+    (3, "cx21", "CX21", 2, 4, 40, "local", "shared"),
+    (4, "cx21-ceph", "CX21 Ceph Disk", 2, 4, 40, "network", "shared"),
+    (5, "cx31", "CX31", 2, 8, 80, "local", "shared"),
+    (6, "cx31-ceph", "CX31 Ceph Disk", 2, 8, 80, "network", "shared"),
+    (7, "cx41", "CX41", 4, 16, 160, "local", "shared"),
+    (8, "cx41-ceph", "CX41 Ceph Disk", 4, 16, 160, "network", "shared"),
+    (9, "cx51", "CX51", 8, 32, 240, "local", "shared"),
+    (10, "cx51-ceph", "CX51 Ceph Disk", 8, 32, 240, "network", "shared"),
+    (11, "ccx11", "CCX11 Dedicated CPU", 2, 8, 80, "local", "dedicated"),
+    (12, "ccx21", "CCX21 Dedicated CPU", 4, 16, 160, "local", "dedicated"),
+    (13, "ccx31", "CCX31 Dedicated CPU", 8, 32, 240, "local", "dedicated"),
+    (14, "ccx41", "CCX41 Dedicated CPU", 16, 64, 360, "local", "dedicated"),
+    (15, "ccx51", "CCX51 Dedicated CPU", 32, 128, 600, "local", "dedicated"),
+]
+
+_IMAGES = [
+    (1, "ubuntu-16.04", "Ubuntu 16.04", "ubuntu", "16.04"),
+    (2, "debian-9", "Debian 9", "debian", "9"),
+    (3, "centos-7", "CentOS 7", "centos", "7"),
+    (4, "fedora-27", "Fedora 27", "fedora", "27"),
+    (5, "ubuntu-18.04", "Ubuntu 18.04", "ubuntu", "18.04"),
+    (6, "fedora-28", "Fedora 28", "fedora", "28"),
+]
+
+_ISOS = [
+    (3, "FreeBSD-11.0-RELEASE-amd64-dvd1", "FreeBSD 11.0 x64"),
+    (26, "virtio-win-0.1.141.iso", "virtio 0.1.141-1"),
+    (27, "Windows-Server-2016-English.iso", "Windows Server 2016 English"),
+]
+
+
+class HetznerCloudMockServer(object):
+    """
+    A local stand-in for the API, for running code that uses the client (including this project's own tests) without a
+    Hetzner account. It serves servers, actions, floating IPs, SSH keys, images, ISOs, locations, datacenters and server
+    types over plain HTTP on a background thread, keeping everything in memory.
+
+    It behaves like the real API where it matters to a client: listings are paginated, changes start actions which run
+    for `action_duration` seconds before they succeed (and only then move servers into their new status), servers are
+    locked whilst they have actions running, errors use the API's error format, GET responses carry an ETag, and every
+    response carries the rate limit headers. Latency, 429 and 500 responses can be injected to exercise rate limiting
+    and retries.
+
+    >>> with HetznerCloudMockServer() as server:
+    ...     config = HetznerCloudClientConfiguration().with_api_key("key").with_base_url(server.base_url)
+    """
+    def __init__(self, api_key=None, latency=0, rate_limit_probability=0, error_probability=0, action_duration=1.0,
+                 rate_limit=3600, seed=None, host="127.0.0.1", port=0):
+        """
+        :param api_key: The only API key accepted, or None to accept any API key.
+        :param latency: The number of seconds to wait before answering each request.
+        :param rate_limit_probability: The probability (between 0 and 1) of answering any request with a 429.
+        :param error_probability: The probability (between 0 and 1) of answering any request with a 500.
+        :param action_duration: The number of seconds every action runs for before it succeeds.
+        :param rate_limit: The number of requests that can be made in a burst. The limit is refilled over an hour, so
+                           the API's own limit of 3600 requests allows one request per second.
+        :param seed: The seed of the random numbers used for injected faults, passwords and traffic figures.
+        :param host: The address to listen on.
+        :param port: The port to listen on, or 0 to pick a free port.
+        """
+        self.api_key = api_key
+        self.latency = latency
+        self.rate_limit_probability = rate_limit_probability
+        self.error_probability = error_probability
+        self.action_duration = action_duration
+        self.rate_limit = rate_limit
+        self.seed = seed
+        self.host = host
+        self.port = port
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._faults = []
+        self._httpd = None
+        self._thread = None
+        self.reset()
+
+    @property
+    def base_url(self):
+        """
+        The URL to pass to HetznerCloudClientConfiguration.with_base_url().
+        """
+        return "http://%s:%s" % (self.host, self.port)
+
+    def start(self):
+        """
+        Starts answering requests on a background thread.
+
+        :return: The server, to allow fluent chaining.
+        """
+        if self._httpd is None:
+            self._httpd = _MockHTTPServer((self.host, self.port), _MockRequestHandler)
+            self._httpd.mock = self
+            self.port = self._httpd.server_address[1]
+            self._thread = threading.Thread(target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05},
+                                            daemon=True)
+            self._thread.start()
+
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._thread.join()
+            self._httpd = None
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def reset(self):
+        """
+        Removes every resource and action created since the server was created, and refills the rate limit.
+        """
+        with self._lock:
+            self._random = random.Random(self.seed)
+            self._state = _MockState(self._random, self.action_duration)
+            self._faults = []
+            self._tokens = float(self.rate_limit)
+            self._updated = time.monotonic()
+
+    def fail_next(self, status_code=500, count=1):
+        """
+        Answers the next `count` requests with an error, regardless of what they ask for.
+
+        :param status_code: The status code to answer with (i.e. 429, 500 or 503).
+        :param count: The number of requests to fail.
+        """
+        with self._lock:
+            self._faults.extend([status_code] * count)
+
+    def seed_resources(self, servers=0, floating_ips=0, ssh_keys=0):
+        """
+        Adds resources directly, without starting any actions. Servers are created running, with random traffic
+        figures, and spread across every datacenter and server type.
+
+        :param servers: The number of servers to add.
+        :param floating_ips: The number of floating IPs to add, each assigned to one of the servers (if there are any).
+        :param ssh_keys: The number of SSH keys to add.
+        """
+        with self._lock:
+            self._state._seed_resources(servers, floating_ips, ssh_keys)
+
+    def _dispatch(self, method, path, headers, body):
+        """
+        Answers a single request, returning its status code, headers and body.
+        """
+        if self.latency:
+            time.sleep(self.latency)
+
+        with self._lock:
+            self.requests += 1
+            rate_limit_headers, limited = self._take_token()
+
+            fault = self._faults.pop(0) if self._faults else None
+            if fault is None and self._random.random() < self.rate_limit_probability:
+                fault = 429
+            if fault is None and self._random.random() < self.error_probability:
+                fault = 500
+            if fault is not None:
+                return _error_response(fault, "injected failure", rate_limit_headers)
+
+            authorization = headers.get("Authorization") or ""
+            token = authorization[len("Bearer "):] if authorization.startswith("Bearer ") else ""
+            if not token or (self.api_key is not None and token != self.api_key):
+                return _error_response(401, "unable to authenticate", rate_limit_headers)
+
+            if limited:
+                return _error_response(429, "limit of %s requests per hour reached" % self.rate_limit,
+                                       rate_limit_headers)
+
+            try:
+                body = json.loads(body.decode("utf-8")) if body else {}
+            except ValueError:
+                return _error_response(400, "invalid JSON in request body", rate_limit_headers)
+
+            url = urlsplit(path)
+            try:
+                status_code, payload = self._state._handle(method, url.path, parse_qs(url.query), body)
+            except _MockError as e:
+                return _error_response(e.status_code, e.message, rate_limit_headers)
+
+            data = json.dumps(payload).encode("utf-8") if payload is not None else b""
+
+        if method == "GET" and status_code == 200:
+            etag = '"%s"' % hashlib.sha1(data).hexdigest()
+            rate_limit_headers["ETag"] = etag
+            if etag == headers.get("If-None-Match"):
+                return 304, rate_limit_headers, b""
+
+        return status_code, rate_limit_headers, data
+
+    def _take_token(self):
+        """
+        Takes a request from the rate limit, returning the rate limit headers and whether the limit has been reached.
+        """
+        refill_rate = self.rate_limit / 3600.0
+        now = time.monotonic()
+        self._tokens = min(self._tokens + (now - self._updated) * refill_rate, self.rate_limit)
+        self._updated = now
+
+        limited = self._tokens < 1
+        if not limited:
+            self._tokens -= 1
+
+        reset = time.time() + (self.rate_limit - self._tokens) / refill_rate
+        return {
+            "RateLimit-Limit": str(self.rate_limit),
+            "RateLimit-Remaining": str(int(self._tokens)),
+            "RateLimit-Reset": str(int(reset)),
+        }, limited
+
+
+class _MockHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    # Accept connections from hundreds of client threads at once, rather than the default of five.
+    request_queue_size = 512
+
+
+class _MockRequestHandler(BaseHTTPRequestHandler):
+    # Keep connections alive between requests, as the API does, so the client's connection pool is exercised.
+    protocol_version = "HTTP/1.1"
+    # The headers and body are written separately, which Nagle's algorithm would otherwise delay by tens of milliseconds.
+    disable_nagle_algorithm = True
+
+    def _handle(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+
+        status_code, headers, data = self.server.mock._dispatch(self.command, self.path, self.headers, body)
+
+        self.send_response(status_code)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if data:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _MockError(Exception):
+    def __init__(self, status_code, message):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+
+
+def _error_response(status_code, message, headers):
+    error = {"code": _ERROR_CODES.get(status_code, "server_error"), "message": message, "details": {}}
+    return status_code, headers, json.dumps({"error": error}).encode("utf-8")
+
+
+class _RunningAction(object):
+    __slots__ = ("record", "started", "duration", "locks", "on_finish")
+
+    def __init__(self, record, started, duration, locks, on_finish):
+        self.record = record
+        self.started = started
+        self.duration = duration
+        self.locks = locks
+        self.on_finish = on_finish
+
+
+class _MockState(object):
+    """
+    The resources and actions held by a mock server, and the handlers of every endpoint. Records are kept in the same
+    form as the API returns them, and every handler is called whilst the server's lock is held.
+    """
+    def __init__(self, random, action_duration):
+        self._random = random
+        self._action_duration = action_duration
+        self._ids = {}
+        self._running = []
+        self._server_locks = {}
+
+        self.locations = {}
+        for id, name, description, country, city, latitude, longitude in _LOCATIONS:
+            self.locations[id] = {"id": id, "name": name, "description": description, "country": country,
+                                  "city": city, "latitude": latitude, "longitude": longitude,
+                                  "network_zone": "eu-central"}
+
+        self.server_types = {}
+        for id, name, description, cores, memory, disk, storage_type, cpu_type in _SERVER_TYPES:
+            self.server_types[id] = {"id": id, "name": name, "description": description, "cores": cores,
+                                     "memory": memory, "disk": disk, "storage_type": storage_type,
+                                     "cpu_type": cpu_type, "deprecated": False, "prices": []}
+
+        self.datacenters = {}
+        for id, name, description, location_id in _DATACENTERS:
+            server_type_ids = sorted(self.server_types)
+            self.datacenters[id] = {"id": id, "name": name, "description": description,
+                                    "location": self.locations[location_id],
+                                    "server_types": {"supported": server_type_ids, "available": server_type_ids,
+                                                     "available_for_migration": server_type_ids}}
+
+        self.images = {}
+        for id, name, description, os_flavor, os_version in _IMAGES:
+            self.images[id] = {"id": id, "type": IMAGE_TYPE_SYSTEM, "status": "available", "name": name,
+                               "description": description, "image_size": None, "disk_size": 5,
+                               "created": "2018-01-15T11:34:45+00:00", "created_from": None, "bound_to": None,
+                               "os_flavor": os_flavor, "os_version": os_version, "rapid_deploy": True,
+                               "protection": {"delete": False}, "deprecated": None, "labels": {}}
+        self._ids["images"] = max(self.images)
+
+        self.isos = {}
+        for id, name, description in _ISOS:
+            self.isos[id] = {"id": id, "name": name, "description": description, "type": "public",
+                             "deprecated": None}
+
+        self.servers = {}
+        self.floating_ips = {}
+        self.ssh_keys = {}
+        self.actions = {}
+
+    def _handle(self, method, path, params, body):
+        self._advance()
+
+        for route_method, pattern, handler in _ROUTES:
+            match = pattern.match(path)
+            if match is not None and route_method == method:
+                return handler(self, params, body, *match.groups())
+
+        raise _MockError(404, "not found")
+
+    def _next_id(self, collection):
+        id = self._ids.get(collection, 0) + 1
+        self._ids[collection] = id
+        return id
+
+    # Actions
+
+    def _start_action(self, command, resources, on_finish=None, lock_server=None):
+        """
+        Starts an action touching the given (type, id) resources, which succeeds once the action duration has passed.
+        `on_finish` is called when it does, and the server with the id `lock_server` is locked until then.
+        """
+        record = {"id": self._next_id("actions"), "command": command, "status": ACTION_STATUS_RUNNING, "progress": 0,
+                  "started": _timestamp(), "finished": None,
+                  "resources": [{"id": id, "type": type} for type, id in resources], "error": None}
+        self.actions[record["id"]] = record
+
+        locks = []
+        if lock_server is not None:
+            self._server_locks[lock_server] = self._server_locks.get(lock_server, 0) + 1
+            self.servers[lock_server]["locked"] = True
+            locks.append(lock_server)
+
+        self._running.append(_RunningAction(record, time.monotonic(), self._action_duration, locks, on_finish))
+        return record
+
+    def _advance(self):
+        """
+        Moves every running action on, finishing those whose time is up.
+        """
+        now = time.monotonic()
+        running = []
+        for action in self._running:
+            elapsed = now - action.started
+            if elapsed < action.duration:
+                action.record["progress"] = min(int(100 * elapsed / action.duration), 99)
+                running.append(action)
+                continue
+
+            action.record.update(status=ACTION_STATUS_SUCCESS, progress=100, finished=_timestamp())
+            for server_id in action.locks:
+                self._server_locks[server_id] -= 1
+                if not self._server_locks[server_id]:
+                    del self._server_locks[server_id]
+                    if server_id in self.servers:
+                        self.servers[server_id]["locked"] = False
+            if action.on_finish is not None:
+                action.on_finish()
+
+        self._running = running
+
+    def _list_actions(self, params, body):
+        records = _filter(self.actions.values(), params, ("id", "status", "command"))
+        return 200, _paginate("actions", _sort(records, params), params)
+
+    def _get_action(self, params, body, id):
+        return 200, {"action": _get(self.actions, id)}
+
+    def _list_resource_actions(self, type, id, params):
+        records = [action for action in self.actions.values()
+                   if {"id": id, "type": type} in action["resources"]]
+        records = _filter(records, params, ("status",))
+        return 200, _paginate("actions", _sort(records, params), params)
+
+    # Servers
+
+    def _list_servers(self, params, body):
+        records = _filter(self.servers.values(), params, ("name", "status"))
+        return 200, _paginate("servers", _sort(records, params), params)
+
+    def _get_server(self, params, body, id):
+        return 200, {"server": _get(self.servers, id)}
+
+    def _create_server(self, params, body):
+        name = body.get("name")
+        if not isinstance(name, str) or not _SERVER_NAME.match(name):
+            raise _MockError(422, "invalid name")
+        if any(server["name"] == name for server in self.servers.values()):
+            raise _MockError(409, "server name is already used")
+
+        server_type = _get_reference(self.server_types, body.get("server_type"), "server_type")
+        image = _get_reference(self.images, body.get("image"), "image")
+        if body.get("datacenter") is not None:
+            datacenter = _get_reference(self.datacenters, body["datacenter"], "datacenter")
+        elif body.get("location") is not None:
+            location = _get_reference(self.locations, body["location"], "location")
+            datacenter = next(dc for dc in self.datacenters.values() if dc["location"]["id"] == location["id"])
+        else:
+            datacenter = self.datacenters[min(self.datacenters)]
+        ssh_keys = [_get_reference(self.ssh_keys, key, "ssh_keys") for key in body.get("ssh_keys") or []]
+
+        server = self._add_server(name, server_type, datacenter, image, SERVER_STATUS_INITIALIZING)
+        status = SERVER_STATUS_RUNNING if body.get("start_after_create", True) else SERVER_STATUS_OFF
+        action = self._start_action("create_server", [("server", server["id"])],
+                                    lambda: server.update(status=status), lock_server=server["id"])
+
+        return 201, {"server": server, "action": action, "next_actions": [],
+                     "root_password": None if ssh_keys else self._password()}
+
+    def _add_server(self, name, server_type, datacenter, image, status, traffic=0):
+        id = self._next_id("servers")
+        ipv4 = str(_SERVER_IPV4_ADDRESSES[id])
+        server = {
+            "id": id,
+            "name": name,
+            "status": status,
+            "created": _timestamp(),
+            "public_net": {
+                "ipv4": {"ip": ipv4, "blocked": False, "dns_ptr": _default_dns_ptr(ipv4)},
+                "ipv6": {"ip": _get_ipv6_network(_SERVER_IPV6_NETWORKS, id), "blocked": False, "dns_ptr": []},
+                "floating_ips": [],
+            },
+            "server_type": server_type,
+            "datacenter": datacenter,
+            "image": image,
+            "iso": None,
+            "rescue_enabled": False,
+            "locked": False,
+            "backup_window": None,
+            "outgoing_traffic": traffic,
+            "ingoing_traffic": traffic // 4,
+            "included_traffic": _INCLUDED_TRAFFIC,
+            "protection": {"delete": False, "rebuild": False},
+            "labels": {},
+            "volumes": [],
+        }
+        self.servers[id] = server
+        return server
+
+    def _update_server(self, params, body, id):
+        server = _get(self.servers, id)
+        name = body.get("name")
+        if name is not None:
+            if not isinstance(name, str) or not _SERVER_NAME.match(name):
+                raise _MockError(422, "invalid name")
+            if any(other["name"] == name and other is not server for other in self.servers.values()):
+                raise _MockError(409, "server name is already used")
+            server["name"] = name
+
+        return 200, {"server": server}
+
+    def _delete_server(self, params, body, id):
+        server = _get(self.servers, id)
+        del self.servers[server["id"]]
+        for floating_ip in self.floating_ips.values():
+            if floating_ip["server"] == server["id"]:
+                floating_ip["server"] = None
+
+        return 200, {"action": self._start_action("delete_server", [("server", server["id"])])}
+
+    def _list_server_actions(self, params, body, id):
+        return self._list_resource_actions("server", _get(self.servers, id)["id"], params)
+
+    def _run_server_action(self, params, body, id, command):
+        server = _get(self.servers, id)
+        handler = _SERVER_ACTIONS.get(command)
+        if handler is None:
+            raise _MockError(404, "not found")
+        if server["locked"]:
+            raise _MockError(423, "server is locked by another action")
+
+        return 201, handler(self, server, body)
+
+    def _start_server_action(self, server, command, on_finish=None, resources=()):
+        return self._start_action(command, [("server", server["id"])] + list(resources), on_finish,
+                                  lock_server=server["id"])
+
+    def _change_status(self, server, command, status, final_status):
+        if status is not None:
+            server["status"] = status
+
+        return {"action": self._start_server_action(server, command, lambda: server.update(status=final_status))}
+
+    def _power_on(self, server, body):
+        return self._change_status(server, "start_server", SERVER_STATUS_STARTING, SERVER_STATUS_RUNNING)
+
+    def _power_off(self, server, body):
+        return self._change_status(server, "stop_server", SERVER_STATUS_STOPPING, SERVER_STATUS_OFF)
+
+    def _shutdown(self, server, body):
+        return self._change_status(server, "shutdown_server", SERVER_STATUS_STOPPING, SERVER_STATUS_OFF)
+
+    def _reboot(self, server, body):
+        return self._change_status(server, "reboot_server", None, SERVER_STATUS_RUNNING)
+
+    def _reset(self, server, body):
+        return self._change_status(server, "reset_server", None, SERVER_STATUS_RUNNING)
+
+    def _reset_password(self, server, body):
+        return {"root_password": self._password(), "action": self._start_server_action(server, "reset_password")}
+
+    def _enable_rescue(self, server, body):
+        rescue_type = body.get("type", RESCUE_TYPE_LINUX)
+        if rescue_type not in _RESCUE_TYPES:
+            raise _MockError(422, "invalid rescue type")
+        for key in body.get("ssh_keys") or []:
+            _get_reference(self.ssh_keys, key, "ssh_keys")
+
+        server["rescue_enabled"] = True
+        return {"root_password": self._password(), "action": self._start_server_action(server, "enable_rescue")}
+
+    def _disable_rescue(self, server, body):
+        server["rescue_enabled"] = False
+        return {"action": self._start_server_action(server, "disable_rescue")}
+
+    def _create_image(self, server, body):
+        image_type = body.get("type", IMAGE_TYPE_SNAPSHOT)
+        if image_type not in (IMAGE_TYPE_SNAPSHOT, IMAGE_TYPE_BACKUP):
+            raise _MockError(422, "invalid image type")
+
+        image = {"id": self._next_id("images"), "type": image_type, "status": "creating", "name": None,
+                 "description": body.get("description") or "", "image_size": None,
+                 "disk_size": server["server_type"]["disk"], "created": _timestamp(),
+                 "created_from": {"id": server["id"], "name": server["name"]},
+                 "bound_to": server["id"] if image_type == IMAGE_TYPE_BACKUP else None,
+                 "os_flavor": server["image"]["os_flavor"], "os_version": server["image"]["os_version"],
+                 "rapid_deploy": False, "protection": {"delete": False}, "deprecated": None, "labels": {}}
+        self.images[image["id"]] = image
+
+        action = self._start_server_action(server, "create_image",
+                                           lambda: image.update(status="available", image_size=1.5),
+                                           resources=[("image", image["id"])])
+        return {"image": image, "action": action}
+
+    def _rebuild(self, server, body):
+        image = _get_reference(self.images, body.get("image"), "image")
+        status = server["status"]
+
+        server.update(status=SERVER_STATUS_REBUILDING, image=image)
+        action = self._start_server_action(server, "rebuild_server", lambda: server.update(status=status))
+        return {"root_password": self._password(), "action": action}
+
+    def _change_type(self, server, body):
+        server_type = _get_reference(self.server_types, body.get("server_type"), "server_type")
+        if server["status"] != SERVER_STATUS_OFF:
+            raise _MockError(409, "server must be stopped before changing its type")
+
+        server["status"] = SERVER_STATUS_MIGRATING
+        action = self._start_server_action(server, "change_server_type",
+                                           lambda: server.update(status=SERVER_STATUS_OFF, server_type=server_type))
+        return {"action": action}
+
+    def _enable_backup(self, server, body):
+        backup_window = body.get("backup_window")
+        if backup_window not in _BACKUP_WINDOWS:
+            raise _MockError(422, "invalid backup window")
+
+        server["backup_window"] = backup_window
+        return {"action": self._start_server_action(server, "enable_backup")}
+
+    def _disable_backup(self, server, body):
+        server["backup_window"] = None
+        return {"action": self._start_server_action(server, "disable_backup")}
+
+    def _attach_iso(self, server, body):
+        server["iso"] = _get_reference(self.isos, body.get("iso"), "iso")
+        return {"action": self._start_server_action(server, "attach_iso")}
+
+    def _detach_iso(self, server, body):
+        server["iso"] = None
+        return {"action": self._start_server_action(server, "detach_iso")}
+
+    def _change_server_dns_ptr(self, server, body):
+        ip = body.get("ip")
+        public_net = server["public_net"]
+        if ip == public_net["ipv4"]["ip"]:
+            public_net["ipv4"]["dns_ptr"] = body.get("dns_ptr") or _default_dns_ptr(ip)
+        elif _in_network(ip, public_net["ipv6"]["ip"]):
+            _set_dns_ptr(public_net["ipv6"]["dns_ptr"], ip, body.get("dns_ptr"))
+        else:
+            raise _MockError(422, "ip does not belong to the server")
+
+        return {"action": self._start_server_action(server, "change_dns_ptr")}
+
+    # Floating IPs
+
+    def _list_floating_ips(self, params, body):
+        return 200, _paginate("floating_ips", _sort(self.floating_ips.values(), params), params)
+
+    def _get_floating_ip(self, params, body, id):
+        return 200, {"floating_ip": _get(self.floating_ips, id)}
+
+    def _create_floating_ip(self, params, body):
+        type = body.get("type")
+        if type not in (FLOATING_IP_TYPE_IPv4, FLOATING_IP_TYPE_IPv6):
+            raise _MockError(422, "invalid type")
+
+        if body.get("server") is not None:
+            server = _get_reference(self.servers, body["server"], "server")
+            location = server["datacenter"]["location"]
+        elif body.get("home_location") is not None:
+            server = None
+            location = _get_reference(self.locations, body["home_location"], "home_location")
+        else:
+            raise _MockError(422, "either server or home_location must be given")
+
+        floating_ip = self._add_floating_ip(type, location, body.get("description"))
+        action = None
+        if server is not None:
+            action = self._assign_floating_ip(floating_ip, server, "assign_floating_ip")
+
+        return 201, {"floating_ip": floating_ip, "action": action}
+
+    def _add_floating_ip(self, type, location, description=None):
+        id = self._next_id("floating_ips")
+        if type == FLOATING_IP_TYPE_IPv4:
+            ip = str(_FLOATING_IPV4_ADDRESSES[id])
+            dns_ptr = [{"ip": ip, "dns_ptr": _default_dns_ptr(ip)}]
+        else:
+            ip = _get_ipv6_network(_FLOATING_IPV6_NETWORKS, id)
+            dns_ptr = []
+
+        floating_ip = {"id": id, "description": description, "ip": ip, "type": type, "server": None,
+                       "dns_ptr": dns_ptr, "home_location": location, "blocked": False,
+                       "protection": {"delete": False}, "labels": {}}
+        self.floating_ips[id] = floating_ip
+        return floating_ip
+
+    def _update_floating_ip(self, params, body, id):
+        floating_ip = _get(self.floating_ips, id)
+        if "description" in body:
+            floating_ip["description"] = body["description"]
+
+        return 200, {"floating_ip": floating_ip}
+
+    def _delete_floating_ip(self, params, body, id):
+        floating_ip = _get(self.floating_ips, id)
+        self._move_floating_ip(floating_ip, None)
+        del self.floating_ips[floating_ip["id"]]
+        return 204, None
+
+    def _list_floating_ip_actions(self, params, body, id):
+        return self._list_resource_actions("floating_ip", _get(self.floating_ips, id)["id"], params)
+
+    def _run_floating_ip_action(self, params, body, id, command):
+        floating_ip = _get(self.floating_ips, id)
+
+        if command == "assign":
+            server = _get_reference(self.servers, body.get("server"), "server")
+            action = self._assign_floating_ip(floating_ip, server, "assign_floating_ip")
+        elif command == "unassign":
+            resources = [("floating_ip", floating_ip["id"])]
+            if floating_ip["server"] is not None:
+                resources.append(("server", floating_ip["server"]))
+            action = self._start_action("unassign_floating_ip", resources,
+                                        lambda: self._move_floating_ip(floating_ip, None))
+        elif command == "change_dns_ptr":
+            ip = body.get("ip")
+            if floating_ip["type"] == FLOATING_IP_TYPE_IPv4 and ip == floating_ip["ip"]:
+                floating_ip["dns_ptr"] = [{"ip": ip, "dns_ptr": body.get("dns_ptr") or _default_dns_ptr(ip)}]
+            elif floating_ip["type"] == FLOATING_IP_TYPE_IPv6 and _in_network(ip, floating_ip["ip"]):
+                _set_dns_ptr(floating_ip["dns_ptr"], ip, body.get("dns_ptr"))
+            else:
+                raise _MockError(422, "ip does not belong to the floating IP")
+            action = self._start_action("change_dns_ptr", [("floating_ip", floating_ip["id"])])
+        else:
+            raise _MockError(404, "not found")
+
+        return 201, {"action": action}
+
+    def _assign_floating_ip(self, floating_ip, server, command):
+        return self._start_action(command, [("floating_ip", floating_ip["id"]), ("server", server["id"])],
+                                  lambda: self._move_floating_ip(floating_ip, server["id"]))
+
+    def _move_floating_ip(self, floating_ip, server_id):
+        """
+        Routes a floating IP to a server (or to no server), keeping the floating IPs listed by the servers in step.
+        """
+        if floating_ip["id"] not in self.floating_ips:
+            return
+
+        previous = self.servers.get(floating_ip["server"])
+        if previous is not None and floating_ip["id"] in previous["public_net"]["floating_ips"]:
+            previous["public_net"]["floating_ips"].remove(floating_ip["id"])
+
+        server = self.servers.get(server_id)
+        floating_ip["server"] = server["id"] if server is not None else None
+        if server is not None:
+            server["public_net"]["floating_ips"].append(floating_ip["id"])
+
+    # SSH keys
+
+    def _list_ssh_keys(self, params, body):
+        records = _filter(self.ssh_keys.values(), params, ("name", "fingerprint"))
+        return 200, _paginate("ssh_keys", _sort(records, params), params)
+
+    def _get_ssh_key(self, params, body, id):
+        return 200, {"ssh_key": _get(self.ssh_keys, id)}
+
+    def _create_ssh_key(self, params, body):
+        name = body.get("name")
+        if not name:
+            raise _MockError(422, "name is required")
+        if any(ssh_key["name"] == name for ssh_key in self.ssh_keys.values()):
+            raise _MockError(409, "SSH key name is already used")
+
+        public_key = body.get("public_key")
+        fingerprint = _get_fingerprint(public_key)
+        if any(ssh_key["fingerprint"] == fingerprint for ssh_key in self.ssh_keys.values()):
+            raise _MockError(409, "SSH key with the same fingerprint already exists")
+
+        return 201, {"ssh_key": self._add_ssh_key(name, public_key, fingerprint)}
+
+    def _add_ssh_key(self, name, public_key, fingerprint):
+        id = self._next_id("ssh_keys")
+        ssh_key = {"id": id, "name": name, "fingerprint": fingerprint, "public_key": public_key, "labels": {}}
+        self.ssh_keys[id] = ssh_key
+        return ssh_key
+
+    def _update_ssh_key(self, params, body, id):
+        ssh_key = _get(self.ssh_keys, id)
+        name = body.get("name")
+        if name is not None:
+            if any(other["name"] == name and other is not ssh_key for other in self.ssh_keys.values()):
+                raise _MockError(409, "SSH key name is already used")
+            ssh_key["name"] = name
+
+        return 200, {"ssh_key": ssh_key}
+
+    def _delete_ssh_key(self, params, body, id):
+        del self.ssh_keys[_get(self.ssh_keys, id)["id"]]
+        return 204, None
+
+    # Images
+
+    def _list_images(self, params, body):
+        records = _filter(self.images.values(), params, ("type", "bound_to", "name", "status"))
+        return 200, _paginate("images", _sort(records, params), params)
+
+    def _get_image(self, params, body, id):
+        return 200, {"image": _get(self.images, id)}
+
+    def _update_image(self, params, body, id):
+        image = _get(self.images, id)
+        if image["type"] == IMAGE_TYPE_SYSTEM:
+            raise _MockError(403, "system images cannot be modified")
+
+        if "description" in body:
+            image["description"] = body["description"]
+        if body.get("type") is not None:
+            # Backups can be converted into snapshots, but not the other way around.
+            if body["type"] != IMAGE_TYPE_SNAPSHOT:
+                raise _MockError(422, "invalid image type")
+            image.update(type=IMAGE_TYPE_SNAPSHOT, bound_to=None)
+
+        return 200, {"image": image}
+
+    def _delete_image(self, params, body, id):
+        image = _get(self.images, id)
+        if image["type"] == IMAGE_TYPE_SYSTEM:
+            raise _MockError(403, "system images cannot be deleted")
+
+        del self.images[image["id"]]
+        return 204, None
+
+    # Catalog
+
+    def _list_catalog(self, key, records, params):
+        return 200, _paginate(key, _sort(_filter(records.values(), params, ("name",)), params), params)
+
+    def _list_isos(self, params, body):
+        return self._list_catalog("isos", self.isos, params)
+
+    def _get_iso(self, params, body, id):
+        return 200, {"iso": _get(self.isos, id)}
+
+    def _list_locations(self, params, body):
+        return self._list_catalog("locations", self.locations, params)
+
+    def _get_location(self, params, body, id):
+        return 200, {"location": _get(self.locations, id)}
+
+    def _list_datacenters(self, params, body):
+        status_code, result = self._list_catalog("datacenters", self.datacenters, params)
+        result["recommendation"] = min(self.datacenters)
+        return status_code, result
+
+    def _get_datacenter(self, params, body, id):
+        return 200, {"datacenter": _get(self.datacenters, id)}
+
+    def _list_server_types(self, params, body):
+        return self._list_catalog("server_types", self.server_types, params)
+
+    def _get_server_type(self, params, body, id):
+        return 200, {"server_type": _get(self.server_types, id)}
+
+    # Seeding
+
+    def _seed_resources(self, servers, floating_ips, ssh_keys):
+        server_types = [self.server_types[id] for id in sorted(self.server_types)]
+        datacenters = [self.datacenters[id] for id in sorted(self.datacenters)]
+        image = self.images[min(self.images)]
+
+        added_servers = []
+        for i in range(servers):
+            id = self._ids.get("servers", 0) + 1
+            status = SERVER_STATUS_RUNNING if self._random.random() < 0.9 else SERVER_STATUS_OFF
+            added_servers.append(self._add_server("server-%s" % id, server_types[i % len(server_types)],
+                                                  datacenters[i % len(datacenters)], image, status,
+                                                  traffic=self._random.randrange(_INCLUDED_TRAFFIC)))
+
+        for i in range(floating_ips):
+            server = added_servers[i % len(added_servers)] if added_servers else None
+            location = server["datacenter"]["location"] if server else self.locations[min(self.locations)]
+            floating_ip = self._add_floating_ip(FLOATING_IP_TYPE_IPv4, location)
+            if server is not None:
+                self._move_floating_ip(floating_ip, server["id"])
+
+        for i in range(ssh_keys):
+            public_key = "ssh-ed25519 %s" % base64.b64encode(self._random.getrandbits(256).to_bytes(32, "big")).decode()
+            self._add_ssh_key("key-%s" % (self._ids.get("ssh_keys", 0) + 1), public_key, _get_fingerprint(public_key))
+
+    def _password(self):
+        return "".join(self._random.choice(string.ascii_letters + string.digits) for _ in range(20))
+
+
+_SERVER_ACTIONS = {
+    "poweron": _MockState._power_on,
+    "poweroff": _MockState._power_off,
+    "shutdown": _MockState._shutdown,
+    "reboot": _MockState._reboot,
+    "reset": _MockState._reset,
+    "reset_password": _MockState._reset_password,
+    "enable_rescue": _MockState._enable_rescue,
+    "disable_rescue": _MockState._disable_rescue,
+    "create_image": _MockState._create_image,
+    "rebuild": _MockState._rebuild,
+    "change_type": _MockState._change_type,
+    "enable_backup": _MockState._enable_backup,
+    "disable_backup": _MockState._disable_backup,
+    "attach_iso": _MockState._attach_iso,
+    "detach_iso": _MockState._detach_iso,
+    "change_dns_ptr": _MockState._change_server_dns_ptr,
+}
+
+_ROUTES = [(method, re.compile(r"^/v1/%s$" % pattern), handler) for method, pattern, handler in (
+    ("GET", r"actions", _MockState._list_actions),
+    ("GET", r"actions/(\d+)", _MockState._get_action),
+    ("GET", r"servers", _MockState._list_servers),
+    ("POST", r"servers", _MockState._create_server),
+    ("GET", r"servers/(\d+)", _MockState._get_server),
+    ("PUT", r"servers/(\d+)", _MockState._update_server),
+    ("DELETE", r"servers/(\d+)", _MockState._delete_server),
+    ("GET", r"servers/(\d+)/actions", _MockState._list_server_actions),
+    ("POST", r"servers/(\d+)/actions/(\w+)", _MockState._run_server_action),
+    ("GET", r"floating_ips", _MockState._list_floating_ips),
+    ("POST", r"floating_ips", _MockState._create_floating_ip),
+    ("GET", r"floating_ips/(\d+)", _MockState._get_floating_ip),
+    ("PUT", r"floating_ips/(\d+)", _MockState._update_floating_ip),
+    ("DELETE", r"floating_ips/(\d+)", _MockState._delete_floating_ip),
+    ("GET", r"floating_ips/(\d+)/actions", _MockState._list_floating_ip_actions),
+    ("POST", r"floating_ips/(\d+)/actions/(\w+)", _MockState._run_floating_ip_action),
+    ("GET", r"ssh_keys", _MockState._list_ssh_keys),
+    ("POST", r"ssh_keys", _MockState._create_ssh_key),
+    ("GET", r"ssh_keys/(\d+)", _MockState._get_ssh_key),
+    ("PUT", r"ssh_keys/(\d+)", _MockState._update_ssh_key),
+    ("DELETE", r"ssh_keys/(\d+)", _MockState._delete_ssh_key),
+    ("GET", r"images", _MockState._list_images),
+    ("GET", r"images/(\d+)", _MockState._get_image),
+    ("PUT", r"images/(\d+)", _MockState._update_image),
+    ("DELETE", r"images/(\d+)", _MockState._delete_image),
+    ("GET", r"isos", _MockState._list_isos),
+    ("GET", r"isos/(\d+)", _MockState._get_iso),
+    ("GET", r"locations", _MockState._list_locations),
+    ("GET", r"locations/(\d+)", _MockState._get_location),
+    ("GET", r"datacenters", _MockState._list_datacenters),
+    ("GET", r"datacenters/(\d+)", _MockState._get_datacenter),
+    ("GET", r"server_types", _MockState._list_server_types),
+    ("GET", r"server_types/(\d+)", _MockState._get_server_type),
+)]
+
+
+def _get(records, id):
+    record = records.get(int(id))
+    if record is None:
+        raise _MockError(404, "not found")
+
+    return record
+
+
+def _get_reference(records, value, field):
+    """
+    Looks up a resource referred to in a request body, by id or by name.
+    """
+    if isinstance(value, int) or (isinstance(value, str) and value.isdigit()):
+        record = records.get(int(value))
+    else:
+        record = next((record for record in records.values() if record.get("name") == value), None)
+
+    if record is None:
+        raise _MockError(422, "invalid %s" % field)
+
+    return record
+
+
+def _filter(records, params, fields):
+    """
+    Keeps the records matching every filter in the query string. A filter given several times matches any of its
+    values, as the API's id and status filters do.
+    """
+    records = list(records)
+    for field in fields:
+        values = params.get(field)
+        if values:
+            records = [record for record in records if str(record[field]) in values]
+
+    return records
+
+
+def _sort(records, params):
+    records = sorted(records, key=lambda record: record["id"])
+    for sort in reversed(params.get("sort") or []):
+        field, _, direction = sort.partition(":")
+        if field not in ("id", "name", "created", "status", "command", "progress", "started", "finished") or \
+                direction not in ("", "asc", "desc") or (records and field not in records[0]):
+            raise _MockError(422, "invalid sort")
+
+        records.sort(key=lambda record: (record[field] is None, record[field]), reverse=direction == "desc")
+
+    return records
+
+
+def _paginate(key, records, params):
+    try:
+        page = int(params.get("page", ["1"])[0])
+        per_page = int(params.get("per_page", [str(_DEFAULT_PER_PAGE)])[0])
+    except ValueError:
+        raise _MockError(422, "invalid pagination")
+    if page < 1 or per_page < 1:
+        raise _MockError(422, "invalid pagination")
+
+    per_page = min(per_page, _MAX_PER_PAGE)
+    last_page = max((len(records) + per_page - 1) // per_page, 1)
+    return {
+        key: records[(page - 1) * per_page:page * per_page],
+        "meta": {
+            "pagination": {
+                "page": page,
+                "per_page": per_page,
+                "previous_page": page - 1 if page > 1 else None,
+                "next_page": page + 1 if page < last_page else None,
+                "last_page": last_page,
+                "total_entries": len(records),
+            },
+        },
+    }
+
+
+def _timestamp():
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S+00:00")
+
+
+def _default_dns_ptr(ipv4):
+    return "static.%s.clients.your-server.de" % ".".join(reversed(ipv4.split(".")))
+
+
+def _get_ipv6_network(networks, id):
+    return str(ipaddress.IPv6Network((int(networks.network_address) + (id << 64), 64)))
+
+
+def _in_network(ip, network):
+    try:
+        return ipaddress.ip_address(ip) in ipaddress.ip_network(network)
+    except (TypeError, ValueError):
+        return False
+
+
+def _set_dns_ptr(entries, ip, dns_ptr):
+    entries[:] = [entry for entry in entries if entry["ip"] != ip]
+    if dns_ptr:
+        entries.append({"ip": ip, "dns_ptr": dns_ptr})
+
+
+def _get_fingerprint(public_key):
+    """
+    Returns the MD5 fingerprint of an OpenSSH public key, in the colon separated form the API uses.
+    """
+    parts = public_key.split() if isinstance(public_key, str) else []
+    try:
+        key = base64.b64decode(parts[1], validate=True) if len(parts) >= 2 and parts[0].startswith(("ssh-", "ecdsa-")) \
+            else None
+    except ValueError:
+        key = None
+    if not key:
+        raise _MockError(422, "invalid public_key")
+
+    digest = hashlib.md5(key).hexdigest()
+    return ":".join(digest[i:i + 2] for i in range(0, len(digest), 2))
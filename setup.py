@@ -2,7 +2,7 @@ from setuptools import setup
 
 setup(
     name="hetznercloud",
-    packages=["hetznercloud"],
+    packages=["hetznercloud", "hetznercloud.aio"],
     version="1.1.1",
     description="Hetzner Cloud SDK",
     author="Liam Symonds",
@@ -10,5 +10,7 @@ setup(
     url="https://github.com/elsyms/hetznercloud-py",
     keywords=["hetzner", "hetznercloud", "hetzner cloud api", "hetzner sdk", "hetzner api"],
     classifiers=[],
-    install_requires=["requests==2.18.4"]
+    python_requires=">=3.7",
+    install_requires=["requests==2.18.4"],
+    extras_require={"async": ["aiohttp>=3.5"], "fast": ["orjson>=3.0"]}
 )
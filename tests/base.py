@@ -1,7 +1,7 @@
 import unittest
 
 from hetznercloud import HetznerCloudClient, SERVER_TYPE_1CPU_2GB, IMAGE_UBUNTU_1604, FLOATING_IP_TYPE_IPv4
-from .shared import valid_configuration
+from tests.shared import valid_configuration
 
 
 class BaseHetznerTest(unittest.TestCase):
@@ -0,0 +1,24 @@
+from hetznercloud import ACTION_STATUS_SUCCESS, SORT_BY_ID_DESC
+from tests.base import BaseHetznerTest
+
+
+class TestActions(BaseHetznerTest):
+    def test_can_wait_for_several_actions_at_once(self):
+        _, first_action = self.create_server("test-wait-for-actions-1")
+        _, second_action = self.create_server("test-wait-for-actions-2")
+
+        results = self.client.actions().wait_for_actions([first_action, second_action], timeout=120)
+
+        self.assertEqual([action.id for action, _ in results], [first_action.id, second_action.id])
+        for action, error in results:
+            self.assertIsNone(error)
+            self.assertEqual(action.status, ACTION_STATUS_SUCCESS)
+
+    def test_actions_can_be_listed_newest_first(self):
+        _, first_action = self.create_server("test-actions-can-be-listed-1")
+        second_server, second_action = self.create_server("test-actions-can-be-listed-2")
+
+        actions = list(self.client.actions().get_all(sort=SORT_BY_ID_DESC, max_items=2))
+
+        self.assertEqual([action.id for action in actions], [second_action.id, first_action.id])
+        self.assertIn({"id": second_server.id, "type": "server"}, actions[0].resources)
@@ -0,0 +1,55 @@
+import asyncio
+
+from hetznercloud import AsyncHetznerCloudClient, SERVER_TYPE_1CPU_2GB, IMAGE_UBUNTU_1604, ACTION_STATUS_SUCCESS
+from tests.base import BaseHetznerTest
+from tests.shared import valid_configuration
+
+
+class TestAsyncClient(BaseHetznerTest):
+    def run_async(self, coroutine_function):
+        async def run():
+            async with AsyncHetznerCloudClient(valid_configuration) as client:
+                return await coroutine_function(client)
+
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(run())
+        finally:
+            loop.close()
+
+    def test_can_get_all_locations(self):
+        async def get_all_locations(client):
+            return [location async for location in client.locations().get_all()]
+
+        locations = self.run_async(get_all_locations)
+        self.assertTrue(len(locations) > 0)
+
+    def test_can_get_location_by_id(self):
+        async def get_location(client):
+            return await client.locations().get(1)
+
+        location = self.run_async(get_location)
+        self.assertEqual(location.id, 1)
+        self.assertTrue(location.name)
+
+    def test_can_create_a_server_and_wait_for_its_action(self):
+        async def create_server(client):
+            server, action = await client.servers().create("test-async-server-can-be-created", SERVER_TYPE_1CPU_2GB,
+                                                           IMAGE_UBUNTU_1604)
+            await action.wait(attempts=60)
+            return server, action
+
+        server, action = self.run_async(create_server)
+        self.assertEqual(server.name, "test-async-server-can-be-created")
+        self.assertEqual(action.status, ACTION_STATUS_SUCCESS)
+
+    def test_a_configuration_can_be_used_from_several_event_loops(self):
+        client = AsyncHetznerCloudClient(valid_configuration)
+        loops = [asyncio.new_event_loop() for _ in range(2)]
+        try:
+            for loop in loops:
+                self.assertEqual(loop.run_until_complete(client.locations().get(1)).id, 1)
+        finally:
+            for loop in loops:
+                loop.run_until_complete(client.close())
+                loop.close()
@@ -0,0 +1,31 @@
+import json
+import unittest
+
+from benchmarks.run import compare, _download_records, _benchmark_parsing
+from hetznercloud.testing import HetznerCloudMockServer
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_benchmarks_produce_json_results(self):
+        # The whole suite takes too long for the unit tests, so only the parsing benchmarks are run.
+        with HetznerCloudMockServer(seed=1) as mock_server:
+            records = _download_records(mock_server, 1)
+        results = json.loads(json.dumps(_benchmark_parsing(records, count=10, repeat=1)))
+
+        names = {result["name"] for result in results}
+        for name in ("parse.server.eager", "parse.server.lazy", "parse.datacenter.eager"):
+            self.assertIn(name, names)
+        for result in results:
+            self.assertGreater(result["value"], 0)
+            self.assertIn(result["better"], ("higher", "lower"))
+
+    def test_results_that_got_worse_are_reported_as_regressions(self):
+        baseline = {"results": [{"name": "parse", "value": 100.0, "better": "higher"},
+                                {"name": "latency", "value": 100.0, "better": "lower"}]}
+        current = {"results": [{"name": "parse", "value": 80.0, "better": "higher"},
+                               {"name": "latency", "value": 80.0, "better": "lower"}]}
+
+        comparison = {name: (change, regressed) for name, _, _, change, regressed in compare(baseline, current)}
+
+        self.assertEqual(comparison["parse"], (-0.2, True))
+        self.assertEqual(comparison["latency"], (0.2, False))
@@ -0,0 +1,68 @@
+import unittest
+
+from hetznercloud import HetznerCloudClientConfiguration, HetznerCloudClient, HetznerActionException, \
+    HetznerInvalidArgumentException, HetznerCloudBackoffPolling, ACTION_STATUS_RUNNING, ACTION_STATUS_SUCCESS, \
+    SERVER_STATUS_OFF, SERVER_STATUS_RUNNING
+from hetznercloud.testing import HetznerCloudMockServer
+
+
+class TestBulkServerActions(unittest.TestCase):
+    def setUp(self):
+        self.mock_server = HetznerCloudMockServer(api_key="key", action_duration=0.2, seed=1).start()
+        self.mock_server.seed_resources(servers=10)
+        self.configuration = HetznerCloudClientConfiguration().with_api_key("key") \
+            .with_base_url(self.mock_server.base_url) \
+            .with_polling_strategy(HetznerCloudBackoffPolling(initial_wait=0.05, max_wait=0.2))
+        self.client = HetznerCloudClient(self.configuration)
+        self.server_ids = [server.id for server in self.client.servers().get_all()]
+
+    def tearDown(self):
+        self.client.close()
+        self.mock_server.stop()
+
+    def test_servers_can_be_powered_off_by_id(self):
+        results = self.client.servers().bulk(self.server_ids).power_off(max_concurrency=4)
+
+        self.assertEqual([result.item for result in results], self.server_ids)
+        for result in results:
+            self.assertTrue(result.succeeded)
+            self.assertIsNone(result.server)
+            self.assertEqual(result.action.status, ACTION_STATUS_SUCCESS)
+        self.assertEqual({server.status for server in self.client.servers().get_all()}, {SERVER_STATUS_OFF})
+
+    def test_actions_are_waited_for_together(self):
+        self.mock_server.requests = 0
+
+        self.client.servers().bulk(self.server_ids).soft_reboot(max_concurrency=10)
+
+        # One request to start each action, then one list query per poll rather than one request per action.
+        self.assertLess(self.mock_server.requests, len(self.server_ids) * 2)
+
+    def test_server_models_are_updated(self):
+        servers = list(self.client.servers().get_all())
+
+        self.client.servers().bulk(servers).power_off()
+        results = self.client.servers().bulk(servers).power_on()
+
+        self.assertEqual([result.server for result in results], servers)
+        self.assertEqual({server.status for server in servers}, {SERVER_STATUS_RUNNING})
+
+    def test_failures_are_reported_per_server(self):
+        results = self.client.servers().bulk([self.server_ids[0], 999999, self.server_ids[1]]).shutdown()
+
+        self.assertEqual([result.succeeded for result in results], [True, False, True])
+        self.assertIsInstance(results[1].error, HetznerActionException)
+        self.assertIsNone(results[1].action)
+
+    def test_actions_can_be_started_without_waiting(self):
+        results = self.client.servers().bulk(self.server_ids).reset(wait=False)
+
+        for result in results:
+            self.assertTrue(result.succeeded)
+            self.assertEqual(result.action.status, ACTION_STATUS_RUNNING)
+
+    def test_invalid_servers_and_concurrency_are_rejected(self):
+        with self.assertRaises(HetznerInvalidArgumentException):
+            self.client.servers().bulk([1, "web-1"])
+        with self.assertRaises(HetznerInvalidArgumentException):
+            self.client.servers().bulk(self.server_ids).power_on(max_concurrency=0)
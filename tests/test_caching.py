@@ -0,0 +1,107 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from hetznercloud import HetznerCloudCatalogCache, HetznerCloudResponseCache
+
+
+class TestCaching(unittest.TestCase):
+    def test_listings_are_cached_until_they_expire(self):
+        cache = HetznerCloudCatalogCache(ttls={"locations": 0.05})
+        cache._put("locations", None, [{"id": 1}])
+
+        self.assertEqual(cache._get("locations", None), [{"id": 1}])
+        time.sleep(0.1)
+        self.assertIsNone(cache._get("locations", None))
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+
+    def test_listings_are_cached_by_their_parameters(self):
+        cache = HetznerCloudCatalogCache()
+        cache._put("locations", {"name": "fsn1"}, [{"id": 1}])
+
+        self.assertIsNone(cache._get("locations", None))
+        self.assertEqual(cache._get("locations", {"name": "fsn1"}), [{"id": 1}])
+
+    def test_least_recently_used_listings_are_evicted(self):
+        cache = HetznerCloudCatalogCache(max_entries=2)
+        cache._put("locations", None, [])
+        cache._put("isos", None, [])
+        cache._get("locations", None)
+        cache._put("datacenters", None, [])
+
+        self.assertIsNotNone(cache._get("locations", None))
+        self.assertIsNone(cache._get("isos", None))
+
+    def test_listings_can_be_invalidated(self):
+        cache = HetznerCloudCatalogCache()
+        cache._put("locations", None, [])
+        cache._put("isos", None, [])
+        cache.invalidate("locations")
+
+        self.assertIsNone(cache._get("locations", None))
+        self.assertIsNotNone(cache._get("isos", None))
+
+    def test_single_resources_are_found_in_cached_listings(self):
+        cache = HetznerCloudCatalogCache()
+        cache._put("locations", None, [{"id": 1}, {"id": 2}])
+
+        self.assertEqual(cache._find("locations", "2"), {"id": 2})
+        self.assertIsNone(cache._find("isos", 2))
+
+
+class TestResponseCaching(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_responses_with_validators_are_stored(self):
+        cache = HetznerCloudResponseCache(self.directory)
+        key = cache._get_key("key", "https://api.hetzner.cloud/v1/isos?", None)
+        self.assertIsNone(cache._load(key))
+        cache._store(key, {"ETag": '"abc"'}, '{"isos": []}')
+
+        entry = cache._load(key)
+        self.assertEqual(entry["text"], '{"isos": []}')
+        self.assertEqual(cache._get_validators(entry), {"If-None-Match": '"abc"'})
+        self.assertEqual(cache._revalidated(key, entry), '{"isos": []}')
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+
+    def test_responses_without_validators_are_not_stored(self):
+        cache = HetznerCloudResponseCache(self.directory)
+        key = cache._get_key("key", "https://api.hetzner.cloud/v1/isos?", None)
+        cache._store(key, {}, '{"isos": []}')
+
+        self.assertIsNone(cache._load(key))
+        self.assertEqual(cache.misses, 1)
+
+    def test_responses_are_cached_per_api_key(self):
+        cache = HetznerCloudResponseCache(self.directory)
+        url = "https://api.hetzner.cloud/v1/isos?"
+
+        self.assertNotEqual(cache._get_key("first", url, None), cache._get_key("second", url, None))
+        self.assertNotIn("first", cache._get_key("first", url, None))
+
+    def test_unreadable_responses_are_ignored(self):
+        cache = HetznerCloudResponseCache(self.directory)
+        with open(cache._get_path("broken"), "w") as f:
+            f.write("{")
+
+        self.assertIsNone(cache._load("broken"))
+
+    def test_least_recently_used_responses_are_evicted(self):
+        cache = HetznerCloudResponseCache(self.directory, max_entries=2)
+        for i, key in enumerate(["first", "second", "third"]):
+            cache._store(key, {"ETag": str(i)}, "{}")
+            os.utime(cache._get_path(key), (i, i))
+
+        cache._evict()
+
+        self.assertIsNone(cache._load("first"))
+        self.assertIsNotNone(cache._load("third"))
+        self.assertEqual(sorted(os.listdir(self.directory)), ["second.json", "third.json"])
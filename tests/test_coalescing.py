@@ -0,0 +1,96 @@
+import threading
+import unittest
+
+from hetznercloud import HetznerCloudClientConfiguration, HetznerCloudClient, HetznerInternalServerErrorException
+from hetznercloud.coalescing import _get_coalescing_key
+from hetznercloud.testing import HetznerCloudMockServer
+
+
+class TestRequestCoalescing(unittest.TestCase):
+    THREADS = 10
+
+    def setUp(self):
+        self.mock_server = HetznerCloudMockServer(api_key="key", latency=0.3, seed=1).start()
+        self.configuration = HetznerCloudClientConfiguration().with_api_key("key") \
+            .with_base_url(self.mock_server.base_url).with_request_coalescing()
+        self.client = HetznerCloudClient(self.configuration)
+
+    def tearDown(self):
+        self.client.close()
+        self.mock_server.stop()
+
+    def _run_concurrently(self, function):
+        barrier = threading.Barrier(self.THREADS)
+        results = [None] * self.THREADS
+
+        def run(index):
+            barrier.wait()
+            try:
+                results[index] = function()
+            except Exception as e:
+                results[index] = e
+
+        threads = [threading.Thread(target=run, args=(index,)) for index in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        return results
+
+    def test_concurrent_identical_gets_share_one_request(self):
+        results = self._run_concurrently(lambda: self.client.locations().get(1))
+
+        self.assertEqual(self.mock_server.requests, 1)
+        self.assertEqual([location.name for location in results], ["fsn1"] * self.THREADS)
+        self.assertEqual(self.configuration.request_coalescer.requests, 1)
+        self.assertEqual(self.configuration.request_coalescer.coalesced, self.THREADS - 1)
+        self.assertEqual(self.configuration.request_coalescer.in_flight, 0)
+
+    def test_concurrent_listings_share_their_pages(self):
+        results = self._run_concurrently(lambda: [location.id for location in self.client.locations().get_all()])
+
+        self.assertEqual(self.mock_server.requests, 1)
+        self.assertTrue(all(result == results[0] for result in results))
+
+    def test_different_gets_are_not_coalesced(self):
+        self.THREADS = 2
+        locations = iter([1, 2])
+        lock = threading.Lock()
+
+        def get():
+            with lock:
+                id = next(locations)
+            return self.client.locations().get(id)
+
+        results = self._run_concurrently(get)
+
+        self.assertEqual(self.mock_server.requests, 2)
+        self.assertEqual(sorted(location.id for location in results), [1, 2])
+
+    def test_sequential_gets_are_not_coalesced(self):
+        self.client.locations().get(1)
+        self.client.locations().get(1)
+
+        self.assertEqual(self.mock_server.requests, 2)
+        self.assertEqual(self.configuration.request_coalescer.coalesced, 0)
+
+    def test_errors_are_shared_with_every_caller(self):
+        self.mock_server.fail_next(500)
+
+        results = self._run_concurrently(lambda: self.client.locations().get(1))
+
+        self.assertEqual(self.mock_server.requests, 1)
+        self.assertTrue(all(isinstance(result, HetznerInternalServerErrorException) for result in results))
+
+    def test_callers_served_by_another_request_made_no_attempts(self):
+        results = self._run_concurrently(lambda: (self.client.locations().get(1),
+                                                  self.client.last_request_statistics().attempts))
+
+        self.assertEqual(sorted(attempts for _, attempts in results), [0] * (self.THREADS - 1) + [1])
+
+    def test_the_order_of_parameters_does_not_matter(self):
+        self.assertEqual(_get_coalescing_key("actions", {"status": "running", "id": [1, 2]}),
+                         _get_coalescing_key("actions", {"id": [1, 2], "status": "running"}))
+        self.assertNotEqual(_get_coalescing_key("actions", {"id": [1, 2]}),
+                            _get_coalescing_key("actions", {"id": [2, 1]}))
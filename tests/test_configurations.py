@@ -23,4 +23,20 @@ class TestConfigurations(unittest.TestCase):
             HetznerCloudClient(HetznerCloudClientConfiguration().with_api_key("abcdefg").with_api_version(2))
             self.fail()
         except HetznerConfigurationException:
-            pass
\ No newline at end of file
+            pass
+
+    def test_invalid_connection_pool_size_results_in_an_exception(self):
+        try:
+            HetznerCloudClientConfiguration().with_connection_pool(pool_size=0)
+            self.fail()
+        except HetznerConfigurationException:
+            pass
+
+    def test_closing_the_client_releases_the_connection_pool(self):
+        configuration = HetznerCloudClientConfiguration().with_api_key("abcdefg").with_api_version(1)
+        with HetznerCloudClient(configuration):
+            session = configuration._get_session()
+            self.assertIs(session, configuration._get_session())
+
+        self.assertIsNone(configuration._adapter)
+        self.assertIsNot(session, configuration._get_session())
@@ -0,0 +1,57 @@
+import os
+import subprocess
+import sys
+import unittest
+
+import hetznercloud
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _loaded_modules(statement):
+    """
+    Runs a statement in a fresh interpreter, returning the names of the modules it loaded.
+    """
+    script = "import sys\n%s\nprint(' '.join(sys.modules))" % statement
+    environment = dict(os.environ, PYTHONPATH=_ROOT)
+    return set(subprocess.run([sys.executable, "-c", script], env=environment, stdout=subprocess.PIPE, check=True,
+                              universal_newlines=True).stdout.split())
+
+
+class TestImports(unittest.TestCase):
+    def test_importing_the_package_does_not_load_the_http_stack(self):
+        modules = _loaded_modules("import hetznercloud")
+
+        for module in ("requests", "aiohttp", "hetznercloud.client", "hetznercloud.shared", "hetznercloud.servers",
+                       "hetznercloud.aio"):
+            self.assertNotIn(module, modules)
+
+    def test_creating_a_client_does_not_load_the_http_stack(self):
+        modules = _loaded_modules("import hetznercloud\n"
+                                  "hetznercloud.HetznerCloudClient(hetznercloud.HetznerCloudClientConfiguration()"
+                                  ".with_api_key('key'))")
+
+        self.assertIn("hetznercloud.client", modules)
+        self.assertNotIn("requests", modules)
+        self.assertNotIn("hetznercloud.servers", modules)
+
+    def test_resource_actions_are_loaded_on_first_use(self):
+        modules = _loaded_modules("import hetznercloud\n"
+                                  "hetznercloud.HetznerCloudClient(hetznercloud.HetznerCloudClientConfiguration()"
+                                  ".with_api_key('key')).servers()")
+
+        self.assertIn("hetznercloud.servers", modules)
+        self.assertIn("requests", modules)
+        self.assertNotIn("aiohttp", modules)
+
+    def test_every_public_name_can_be_imported(self):
+        namespace = {}
+        exec("from hetznercloud import *", namespace)
+
+        for name in hetznercloud.__all__:
+            self.assertIs(namespace[name], getattr(hetznercloud, name))
+            self.assertIn(name, dir(hetznercloud))
+
+    def test_unknown_names_raise_an_attribute_error(self):
+        with self.assertRaises(AttributeError):
+            hetznercloud.HetznerCloudUnknown
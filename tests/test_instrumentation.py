@@ -0,0 +1,47 @@
+import unittest
+
+from hetznercloud import HetznerCloudStatisticsCollector, HetznerCloudRequestEvent
+from hetznercloud.instrumentation import _get_endpoint_template
+
+
+def _event(endpoint, latency, status_code=200, attempt=1):
+    event = HetznerCloudRequestEvent("GET", endpoint, attempt)
+    event.latency = latency
+    event.status_code = status_code
+    event.response_bytes = 100
+    return event
+
+
+class TestInstrumentation(unittest.TestCase):
+    def test_ids_are_removed_from_endpoints(self):
+        self.assertEqual(_get_endpoint_template("servers"), "servers")
+        self.assertEqual(_get_endpoint_template("servers/42"), "servers/{id}")
+        self.assertEqual(_get_endpoint_template("servers/42/actions/poweron"), "servers/{id}/actions/poweron")
+
+    def test_requests_are_collected_per_endpoint(self):
+        collector = HetznerCloudStatisticsCollector()
+        collector.after_request(_event("servers/{id}", 0.01))
+        collector.after_request(_event("servers/{id}", 0.2, status_code=503))
+        collector.after_request(_event("servers/{id}", 20, attempt=2))
+        collector.after_request(_event("servers", 0.01))
+
+        statistics = collector.get()
+        self.assertEqual(sorted(statistics), ["GET servers", "GET servers/{id}"])
+
+        server_statistics = statistics["GET servers/{id}"]
+        self.assertEqual(server_statistics.requests, 3)
+        self.assertEqual(server_statistics.errors, 1)
+        self.assertEqual(server_statistics.retries, 1)
+        self.assertEqual(server_statistics.response_bytes, 300)
+        self.assertEqual(server_statistics.latency_percentile(50), 0.25)
+        self.assertEqual(server_statistics.latency_percentile(100), 20)
+
+    def test_statistics_are_copied(self):
+        collector = HetznerCloudStatisticsCollector()
+        collector.after_request(_event("servers", 0.01))
+        statistics = collector.get()
+        collector.after_request(_event("servers", 0.01))
+        collector.reset()
+
+        self.assertEqual(statistics["GET servers"].requests, 1)
+        self.assertEqual(collector.get(), {})
@@ -0,0 +1,60 @@
+import unittest
+
+from hetznercloud import HetznerCloudClientConfiguration, HetznerCloudInventory
+from tests.base import BaseHetznerTest
+
+
+def _server_json(id, name, ipv4, ipv6, datacenter_id):
+    return {
+        "id": id, "name": name, "status": "running", "created": "2018-01-01T00:00:00+00:00",
+        "public_net": {"ipv4": {"ip": ipv4}, "ipv6": {"ip": ipv6}}, "server_type": {"name": "cx11"},
+        "datacenter": {"id": datacenter_id}, "image": None, "iso": None, "rescue_enabled": False, "locked": False,
+        "backup_window": None, "outgoing_traffic": 0, "ingoing_traffic": 0, "included_traffic": 0
+    }
+
+
+class TestInventory(unittest.TestCase):
+    def setUp(self):
+        self.inventory = HetznerCloudInventory(HetznerCloudClientConfiguration())
+        self.servers = [_server_json(1, "web", "10.0.0.1", "2001:db8:1::/64", 1),
+                        _server_json(2, "db", "10.0.0.2", "2001:db8:2::/64", 1),
+                        _server_json(3, "cache", "10.0.0.3", "2001:db8:3::/64", 2)]
+        self.inventory._servers._replace_all(self.servers)
+        self.inventory._floating_ips._replace_all([{
+            "id": 4, "ip": "10.0.1.1", "description": None, "type": "ipv4", "server": 1, "dns_ptr": [],
+            "home_location": {"id": 1}, "blocked": False
+        }])
+        self.inventory._ssh_keys._replace_all([{"id": 5, "name": "me", "fingerprint": "aa:bb", "public_key": "ssh"}])
+
+    def test_resources_can_be_looked_up(self):
+        self.assertEqual(self.inventory.server(2).name, "db")
+        self.assertEqual(self.inventory.server_by_name("cache").id, 3)
+        self.assertEqual(self.inventory.server_by_ip("10.0.0.1").id, 1)
+        self.assertEqual(self.inventory.server_by_ip("2001:db8:2::1").id, 2)
+        self.assertEqual([server.id for server in self.inventory.servers_in_datacenter(1)], [1, 2])
+        self.assertEqual(self.inventory.floating_ip_by_ip("10.0.1.1").id, 4)
+        self.assertEqual(self.inventory.ssh_key_by_fingerprint("aa:bb").id, 5)
+        self.assertIsNone(self.inventory.server_by_name("missing"))
+
+    def test_only_changed_resources_are_rebuilt(self):
+        unchanged = self.inventory.server(1)
+        changed_servers = [self.servers[0], dict(self.servers[1], name="db-renamed", datacenter={"id": 2})]
+
+        self.assertEqual(self.inventory._servers._replace_all(changed_servers), 2)
+        self.assertIs(self.inventory.server(1), unchanged)
+        self.assertIsNone(self.inventory.server(3))
+        self.assertIsNone(self.inventory.server_by_name("db"))
+        self.assertIsNone(self.inventory.server_by_ip("10.0.0.3"))
+        self.assertEqual(self.inventory.server_by_name("db-renamed").id, 2)
+        self.assertEqual([server.id for server in self.inventory.servers_in_datacenter(2)], [2])
+        self.assertEqual(self.inventory._servers._replace_all(changed_servers), 0)
+
+
+class TestInventorySync(BaseHetznerTest):
+    def test_inventory_can_be_synced_from_the_actions_feed(self):
+        inventory = self.client.inventory()
+        server, action = self.create_server("test-inventory-can-be-synced")
+
+        self.assertEqual(inventory.sync(), 1)
+        self.assertEqual(inventory.server_by_name("test-inventory-can-be-synced").id, server.id)
+        self.assertEqual(inventory.cursor, action.id)
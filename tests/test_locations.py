@@ -21,4 +21,14 @@ class TestLocations(BaseHetznerTest):
         self.assertTrue(location.country)
         self.assertTrue(location.city)
         self.assertTrue(location.latitude)
-        self.assertTrue(location.longitude)
\ No newline at end of file
+        self.assertTrue(location.longitude)
+
+    def test_can_limit_the_number_of_locations_across_pages(self):
+        locations = list(self.client.locations().get_all(per_page=1, max_items=2))
+        self.assertTrue(len(locations) == 2)
+        self.assertNotEqual(locations[0].id, locations[1].id)
+
+    def test_prefetched_locations_are_returned_in_order(self):
+        locations = [location.id for location in self.client.locations().get_all(per_page=1)]
+        prefetched_locations = [location.id for location in self.client.locations().get_all(per_page=1, prefetch=2)]
+        self.assertEqual(locations, prefetched_locations)
@@ -0,0 +1,80 @@
+import time
+import unittest
+
+from hetznercloud import HetznerCloudClientConfiguration, HetznerCloudClient, HetznerConfigurationException, \
+    HetznerActionException, HetznerAuthenticationException, HetznerRateLimitExceeded, \
+    HetznerInternalServerErrorException, ACTION_STATUS_RUNNING, ACTION_STATUS_SUCCESS, SERVER_STATUS_INITIALIZING, \
+    SERVER_STATUS_RUNNING, SERVER_TYPE_1CPU_2GB, IMAGE_UBUNTU_1604
+from hetznercloud.testing import HetznerCloudMockServer
+
+
+class TestMockServer(unittest.TestCase):
+    def setUp(self):
+        self.mock_server = HetznerCloudMockServer(api_key="key", action_duration=0.2, seed=1).start()
+        self.configuration = HetznerCloudClientConfiguration().with_api_key("key") \
+            .with_base_url(self.mock_server.base_url + "/")
+        self.client = HetznerCloudClient(self.configuration)
+
+    def tearDown(self):
+        self.client.close()
+        self.mock_server.stop()
+
+    def test_the_base_url_must_be_an_http_url(self):
+        with self.assertRaises(HetznerConfigurationException):
+            HetznerCloudClientConfiguration().with_base_url("api.hetzner.cloud")
+
+    def test_requests_are_sent_to_the_base_url(self):
+        self.assertEqual(self.configuration.base_url, self.mock_server.base_url)
+        self.assertEqual(self.client.locations().get(1).name, "fsn1")
+        self.assertEqual(self.mock_server.requests, 1)
+
+    def test_listings_are_paginated(self):
+        self.mock_server.seed_resources(servers=60)
+
+        self.assertEqual(len(list(self.client.servers().get_all())), 60)
+        self.assertEqual(self.mock_server.requests, 3)
+
+    def test_servers_start_once_their_create_action_has_finished(self):
+        server, action = self.client.servers().create("test-server", SERVER_TYPE_1CPU_2GB, IMAGE_UBUNTU_1604)
+        self.assertEqual(server.status, SERVER_STATUS_INITIALIZING)
+        self.assertEqual(action.status, ACTION_STATUS_RUNNING)
+
+        with self.assertRaises(HetznerActionException):
+            server.power_off()
+
+        time.sleep(0.25)
+        self.assertEqual(self.client.actions().get(action.id).status, ACTION_STATUS_SUCCESS)
+        self.assertEqual(self.client.servers().get(server.id).status, SERVER_STATUS_RUNNING)
+
+    def test_requests_with_the_wrong_api_key_are_rejected(self):
+        configuration = HetznerCloudClientConfiguration().with_api_key("wrong") \
+            .with_base_url(self.mock_server.base_url)
+
+        with self.assertRaises(HetznerAuthenticationException):
+            HetznerCloudClient(configuration).locations().get(1)
+
+    def test_injected_failures_are_returned_in_order(self):
+        self.mock_server.fail_next(429)
+        self.mock_server.fail_next(500)
+
+        with self.assertRaises(HetznerRateLimitExceeded):
+            self.client.locations().get(1)
+        with self.assertRaises(HetznerInternalServerErrorException):
+            self.client.locations().get(1)
+        self.assertEqual(self.client.locations().get(1).id, 1)
+
+    def test_injected_failures_are_retried(self):
+        self.configuration.with_retry_policy(backoff_factor=0.01)
+        self.mock_server.fail_next(500, count=2)
+
+        self.assertEqual(self.client.locations().get(1).id, 1)
+        self.assertEqual(self.client.last_request_statistics().attempts, 3)
+
+    def test_requests_over_the_rate_limit_are_rejected(self):
+        self.mock_server.rate_limit = 2
+        self.mock_server.reset()
+
+        self.client.locations().get(1)
+        self.client.locations().get(1)
+        with self.assertRaises(HetznerRateLimitExceeded):
+            self.client.locations().get(1)
@@ -0,0 +1,69 @@
+import unittest
+
+from hetznercloud import HetznerCloudClientConfiguration
+from hetznercloud.actions import HetznerCloudAction
+from hetznercloud.aio.servers import AsyncHetznerCloudServer
+from hetznercloud.datacenters import HetznerCloudDatacenter
+from hetznercloud.floating_ips import HetznerCloudFloatingIp
+from hetznercloud.images import HetznerCloudImage
+from hetznercloud.isos import HetznerCloudIso
+from hetznercloud.locations import HetznerCloudLocation
+from hetznercloud.server_types import HetznerCloudServerType
+from hetznercloud.servers import HetznerCloudServer
+from hetznercloud.ssh_keys import HetznerCloudSSHKey
+
+SERVER_JSON = {
+    "id": 1, "name": "server", "status": "running", "created": "2018-01-01T00:00:00+00:00",
+    "public_net": {"ipv4": {"ip": "127.0.0.1"}, "ipv6": {"ip": "::1/64"}}, "server_type": {"name": "cx11"},
+    "datacenter": {"id": 2}, "image": {"name": "ubuntu-16.04"}, "iso": {"name": "FreeBSD-11.0-RELEASE-amd64-dvd1"},
+    "rescue_enabled": False, "locked": False, "backup_window": None, "outgoing_traffic": 1, "ingoing_traffic": 2,
+    "included_traffic": 3
+}
+
+
+class TestModels(unittest.TestCase):
+    def test_models_do_not_have_an_instance_dictionary(self):
+        for model in (HetznerCloudAction(None), AsyncHetznerCloudServer(None), HetznerCloudDatacenter(),
+                      HetznerCloudFloatingIp(None), HetznerCloudImage(None), HetznerCloudIso(), HetznerCloudLocation(),
+                      HetznerCloudServerType(), HetznerCloudServer(None), HetznerCloudSSHKey(None)):
+            self.assertFalse(hasattr(model, "__dict__"), type(model).__name__)
+
+            with self.assertRaises(AttributeError):
+                model.undeclared_field = True
+
+    def test_server_iso_is_loaded_into_the_declared_field(self):
+        server = HetznerCloudServer._load_from_json(HetznerCloudClientConfiguration(), SERVER_JSON)
+
+        self.assertEqual(server.iso, "FreeBSD-11.0-RELEASE-amd64-dvd1")
+
+    def test_lazily_loaded_models_decode_fields_on_first_access(self):
+        configuration = HetznerCloudClientConfiguration().with_lazy_decoding()
+        server_json = dict(SERVER_JSON, datacenter="malformed")
+        server = HetznerCloudServer._load_from_json(configuration, server_json, root_password="password")
+
+        self.assertEqual(server.id, 1)
+        self.assertEqual(server.public_net_ipv4, "127.0.0.1")
+        self.assertEqual(server.root_password, "password")
+        with self.assertRaises(TypeError):
+            server.datacenter_id
+
+        self.assertEqual(server.name, "server")
+        server_json["name"] = "changed"
+        server.status = "off"
+        self.assertEqual(server.name, "server")
+        self.assertEqual(server.status, "off")
+
+    def test_lazily_loaded_models_match_eagerly_loaded_models(self):
+        eager = HetznerCloudServer._load_from_json(HetznerCloudClientConfiguration(), SERVER_JSON)
+        lazy = HetznerCloudServer._load_from_json(HetznerCloudClientConfiguration().with_lazy_decoding(), SERVER_JSON)
+
+        for field in HetznerCloudServer.__slots__:
+            self.assertEqual(getattr(eager, field) if field != "_config" else None,
+                             getattr(lazy, field) if field != "_config" else None, field)
+
+    def test_undeclared_fields_are_not_decoded(self):
+        server = HetznerCloudServer._load_from_json(HetznerCloudClientConfiguration().with_lazy_decoding(),
+                                                    SERVER_JSON)
+
+        with self.assertRaises(AttributeError):
+            server.undeclared_field
@@ -0,0 +1,40 @@
+import unittest
+
+from hetznercloud import HetznerCloudClientConfiguration, HetznerCloudFixedPolling, HetznerCloudBackoffPolling, \
+    HetznerCloudProgressPolling
+from hetznercloud.polling import _Poller
+
+
+class TestPolling(unittest.TestCase):
+    def test_backoff_grows_until_the_maximum_wait(self):
+        polling = HetznerCloudBackoffPolling(initial_wait=1, max_wait=4, multiplier=2, jitter=0)
+
+        self.assertEqual([polling.get_delay(attempt, 0) for attempt in range(1, 5)], [1, 2, 4, 4])
+
+    def test_backoff_is_jittered_within_bounds(self):
+        polling = HetznerCloudBackoffPolling(initial_wait=1, max_wait=1, jitter=0.2)
+
+        for attempt in range(1, 20):
+            self.assertTrue(0.8 <= polling.get_delay(attempt, 0) <= 1.2)
+
+    def test_progress_is_used_to_estimate_the_next_poll(self):
+        polling = HetznerCloudProgressPolling(initial_wait=0.5, max_wait=60, jitter=0, fraction=0.5)
+
+        # 25% done after 10 seconds suggests 30 seconds remaining, so poll again in 15.
+        self.assertEqual(polling.get_delay(3, 10, 25), 15)
+        self.assertEqual(polling.get_delay(3, 10, 99), 0.5)
+
+    def test_poller_gives_up_once_the_deadline_has_passed(self):
+        poller = _Poller(HetznerCloudClientConfiguration(), timeout=0)
+
+        self.assertIsNone(poller.next_delay())
+
+    def test_poller_never_waits_beyond_the_deadline(self):
+        poller = _Poller(HetznerCloudClientConfiguration(), timeout=2, polling=HetznerCloudFixedPolling(30))
+
+        self.assertTrue(poller.next_delay() <= 2)
+
+    def test_poller_keeps_the_attempts_behaviour_when_attempts_are_given(self):
+        poller = _Poller(HetznerCloudClientConfiguration(), attempts=3, wait_seconds=2)
+
+        self.assertEqual([poller.next_delay(), poller.next_delay(), poller.next_delay()], [2, 2, None])
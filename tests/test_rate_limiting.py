@@ -0,0 +1,49 @@
+import time
+import unittest
+
+from hetznercloud import HetznerCloudRateLimiter, HetznerRateLimitExceeded
+
+
+class TestRateLimiting(unittest.TestCase):
+    def test_requests_within_the_budget_do_not_wait(self):
+        limiter = HetznerCloudRateLimiter(limit=10, period=10)
+
+        self.assertEqual(limiter._acquire(), 0)
+        self.assertEqual(limiter.remaining, 9)
+
+    def test_budget_is_seeded_from_response_headers(self):
+        limiter = HetznerCloudRateLimiter()
+        limiter._update({"RateLimit-Limit": "3600", "RateLimit-Remaining": "5",
+                         "RateLimit-Reset": str(int(time.time()) + 3595)})
+
+        self.assertEqual(limiter.limit, 3600)
+        self.assertEqual(limiter.remaining, 5)
+
+    def test_malformed_headers_are_ignored(self):
+        limiter = HetznerCloudRateLimiter(limit=10, period=10)
+        limiter._update({"RateLimit-Limit": "", "RateLimit-Remaining": "5"})
+        limiter._update({"RateLimit-Limit": "3600", "RateLimit-Remaining": "five"})
+
+        self.assertEqual(limiter.limit, 10)
+        self.assertEqual(limiter.remaining, 10)
+
+        limiter._update({"RateLimit-Limit": "3600", "RateLimit-Remaining": "5", "RateLimit-Reset": "soon"})
+
+        self.assertEqual(limiter.limit, 3600)
+        self.assertEqual(limiter.remaining, 5)
+
+    def test_exhausted_budget_fails_fast_when_waiting_is_disabled(self):
+        limiter = HetznerCloudRateLimiter(wait=False)
+        limiter._update({"RateLimit-Limit": "3600", "RateLimit-Remaining": "0",
+                         "RateLimit-Reset": str(int(time.time()) + 3600)})
+
+        with self.assertRaises(HetznerRateLimitExceeded):
+            limiter._acquire()
+
+    def test_exhausted_budget_waits_for_the_next_token(self):
+        limiter = HetznerCloudRateLimiter()
+        limiter._update({"RateLimit-Limit": "3600", "RateLimit-Remaining": "0",
+                         "RateLimit-Reset": str(int(time.time()) + 3600)})
+
+        delay = limiter._acquire()
+        self.assertTrue(0 < delay <= 1.1)
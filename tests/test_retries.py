@@ -0,0 +1,37 @@
+import unittest
+
+from hetznercloud import HetznerCloudRetryPolicy
+
+
+class TestRetries(unittest.TestCase):
+    def test_backoff_grows_exponentially_up_to_the_maximum(self):
+        policy = HetznerCloudRetryPolicy(backoff_factor=1, max_backoff=5, jitter=False)
+
+        self.assertEqual([policy.get_backoff(attempt) for attempt in range(1, 6)], [1, 2, 4, 5, 5])
+
+    def test_jittered_backoff_never_exceeds_the_computed_backoff(self):
+        policy = HetznerCloudRetryPolicy(backoff_factor=1, max_backoff=5)
+
+        for attempt in range(1, 10):
+            self.assertTrue(0 <= policy.get_backoff(attempt) <= 5)
+
+    def test_transient_failures_of_idempotent_requests_are_retried(self):
+        policy = HetznerCloudRetryPolicy(jitter=False)
+
+        self.assertEqual(policy._get_retry_delay("GET", 1, 503), 0.5)
+        self.assertEqual(policy._get_retry_delay("DELETE", 1), 0.5)
+        self.assertIsNone(policy._get_retry_delay("GET", 1, 404))
+
+    def test_requests_are_not_retried_once_the_attempts_are_used_up(self):
+        policy = HetznerCloudRetryPolicy(max_attempts=2)
+
+        self.assertIsNone(policy._get_retry_delay("GET", 2, 500))
+
+    def test_post_requests_are_only_retried_when_opted_in(self):
+        self.assertIsNone(HetznerCloudRetryPolicy()._get_retry_delay("POST", 1, 500))
+        self.assertIsNotNone(HetznerCloudRetryPolicy(retry_post=True)._get_retry_delay("POST", 1, 500))
+
+    def test_retry_after_header_takes_precedence_over_the_backoff(self):
+        policy = HetznerCloudRetryPolicy()
+
+        self.assertEqual(policy._get_retry_delay("GET", 1, 429, "7"), 7)
@@ -0,0 +1,85 @@
+import base64
+import json
+import unittest
+
+from hetznercloud import HetznerCloudClientConfiguration, HetznerCloudClient, HetznerCloudJsonCodec, \
+    HetznerCloudStdlibJsonCodec, HetznerCloudOrjsonCodec, HetznerConfigurationException, \
+    HetznerInternalServerErrorException, HetznerActionException
+from hetznercloud.serialization import orjson
+from hetznercloud.shared import _handle_response
+from hetznercloud.testing import HetznerCloudMockServer
+
+
+class TestSerialization(unittest.TestCase):
+    def codecs(self):
+        return [HetznerCloudStdlibJsonCodec()] + ([HetznerCloudOrjsonCodec()] if orjson is not None else [])
+
+    def test_codecs_decode_bytes_and_strings(self):
+        for codec in self.codecs():
+            self.assertEqual(codec.loads(b'{"name": "f\xc3\xbcr"}'), {"name": "für"})
+            self.assertEqual(codec.loads('{"name": "für"}'), {"name": "für"})
+
+    def test_encoded_bodies_can_be_decoded(self):
+        body = {"name": "my-server", "ssh_keys": [1, 2], "start_after_create": True, "user_data": None}
+        for codec in self.codecs():
+            self.assertEqual(HetznerCloudStdlibJsonCodec().loads(codec.dumps(body)), body)
+
+    def test_the_codec_must_be_a_json_codec(self):
+        with self.assertRaises(HetznerConfigurationException):
+            HetznerCloudClientConfiguration().with_json_codec(object())
+
+    @unittest.skipIf(orjson is None, "orjson is not installed")
+    def test_orjson_is_used_when_it_is_installed(self):
+        self.assertIsInstance(HetznerCloudClientConfiguration().json_codec, HetznerCloudOrjsonCodec)
+
+    def test_responses_are_decoded_with_the_configured_codec(self):
+        decoded = []
+
+        class RecordingCodec(HetznerCloudStdlibJsonCodec):
+            def loads(self, data):
+                decoded.append(data)
+                return super().loads(data)
+
+        config = HetznerCloudClientConfiguration().with_json_codec(RecordingCodec())
+
+        self.assertEqual(_handle_response(config, 200, b'{"location": {"id": 1}}'), (200, {"location": {"id": 1}}))
+        self.assertEqual(decoded, [b'{"location": {"id": 1}}'])
+
+    def test_invalid_responses_raise_an_exception(self):
+        config = HetznerCloudClientConfiguration()
+
+        with self.assertRaises(HetznerInternalServerErrorException):
+            _handle_response(config, 200, b"<html>")
+        with self.assertRaises(HetznerActionException):
+            _handle_response(config, 201, b'{"action": {"error": {"code": "locked", "message": "locked"}}}')
+
+    def test_the_client_works_with_every_codec(self):
+        with HetznerCloudMockServer() as mock_server:
+            for codec in self.codecs():
+                configuration = HetznerCloudClientConfiguration().with_api_key("key") \
+                    .with_base_url(mock_server.base_url).with_json_codec(codec)
+                with HetznerCloudClient(configuration) as client:
+                    name = "key-%s" % type(codec).__name__
+                    ssh_key = client.ssh_keys().create(name, "ssh-ed25519 %s" % base64.b64encode(name.encode()).decode())
+                    self.assertEqual(client.ssh_keys().get(ssh_key.id).name, ssh_key.name)
+
+    def test_custom_codecs_are_used_by_the_client(self):
+        calls = []
+
+        class CustomCodec(HetznerCloudJsonCodec):
+            def dumps(self, obj):
+                calls.append("dumps")
+                return json.dumps(obj)
+
+            def loads(self, data):
+                calls.append("loads")
+                return json.loads(data)
+
+        with HetznerCloudMockServer() as mock_server:
+            configuration = HetznerCloudClientConfiguration().with_api_key("key") \
+                .with_base_url(mock_server.base_url).with_json_codec(CustomCodec())
+            with HetznerCloudClient(configuration) as client:
+                ssh_key = client.ssh_keys().create("custom", "ssh-ed25519 %s" % base64.b64encode(b"custom").decode())
+                self.assertEqual(client.ssh_keys().get(ssh_key.id).name, "custom")
+
+        self.assertEqual(calls, ["dumps", "loads", "loads"])
@@ -1,5 +1,9 @@
+import unittest
+
 from hetznercloud import SERVER_STATUS_OFF, ACTION_STATUS_SUCCESS, SERVER_STATUS_RUNNING, \
-    BACKUP_WINDOW_10PM_2AM, HetznerActionException, SERVER_TYPE_2CPU_4GB, SERVER_TYPE_1CPU_2GB, IMAGE_UBUNTU_1604
+    BACKUP_WINDOW_10PM_2AM, HetznerActionException, HetznerInternalServerErrorException, SERVER_TYPE_2CPU_4GB, \
+    SERVER_TYPE_1CPU_2GB, IMAGE_UBUNTU_1604
+from tests import shared
 from tests.base import BaseHetznerTest
 
 
@@ -161,4 +165,52 @@ class TestServers(BaseHetznerTest):
         except HetznerActionException:
             pass
 
-
+    def test_many_servers_can_be_created_at_once(self):
+        specs = [{"name": "test-create-many-%s" % i, "server_type": SERVER_TYPE_1CPU_2GB, "image": IMAGE_UBUNTU_1604}
+                 for i in range(3)]
+
+        results = self.servers.create_many(specs, max_concurrency=3, timeout=120)
+
+        self.assertEqual([result.item for result in results], specs)
+        for result in results:
+            self.assertTrue(result.succeeded)
+            self.assertEqual(result.server.name, result.item["name"])
+
+    def _create_failing_batch(self, name):
+        existing_server, _ = self.create_server(name)
+        specs = [{"name": server_name, "server_type": SERVER_TYPE_1CPU_2GB, "image": IMAGE_UBUNTU_1604}
+                 for server_name in ("%s-1" % name, existing_server.name, "%s-2" % name)]
+
+        return existing_server, self.servers.create_many(specs, max_concurrency=1, timeout=120, rollback=True)
+
+    def test_servers_created_in_a_failed_batch_are_rolled_back(self):
+        existing_server, results = self._create_failing_batch("test-create-many-rolled-back")
+
+        self.assertIsInstance(results[1].error, HetznerActionException)
+        for result in (results[0], results[2]):
+            self.assertTrue(result.rolled_back)
+            self.assertIsNone(result.error)
+            self.assertFalse(result.succeeded)
+        self.assertEqual([server.id for server in self.servers.get_all()], [existing_server.id])
+
+    @unittest.skipIf(shared.api_key, "failures can only be injected into the local API")
+    def test_servers_that_could_not_be_rolled_back_are_reported(self):
+        # Fail the first rollback delete.
+        deletes = []
+
+        def fail_first_delete(event):
+            if event.method == "DELETE" and not deletes:
+                deletes.append(event)
+                shared.mock_server.fail_next(500)
+
+        shared.valid_configuration.with_request_hooks(before_request=fail_first_delete)
+        self.addCleanup(shared.valid_configuration.before_request_hooks.remove, fail_first_delete)
+        _, results = self._create_failing_batch("test-create-many-not-rolled-back")
+
+        self.assertIsInstance(results[1].error, HetznerActionException)
+        not_rolled_back = [result for result in (results[0], results[2]) if not result.rolled_back]
+        self.assertEqual(len(not_rolled_back), 1)
+        self.assertIsInstance(not_rolled_back[0].rollback_error, HetznerInternalServerErrorException)
+        self.assertFalse(not_rolled_back[0].succeeded)
+        self.assertEqual([server.id for server in self.servers.get_all(name=not_rolled_back[0].item["name"])],
+                         [not_rolled_back[0].server.id])
@@ -0,0 +1,100 @@
+import json
+import unittest
+
+from hetznercloud import HetznerCloudClientConfiguration, HetznerCloudClient, HetznerInvalidArgumentException, \
+    HetznerInternalServerErrorException
+from hetznercloud.streaming import _stream_list
+from hetznercloud.testing import HetznerCloudMockServer
+
+
+def _chunks(document, size):
+    data = json.dumps(document).encode("utf-8")
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class TestStreamList(unittest.TestCase):
+    def setUp(self):
+        self.document = {
+            "servers": [{"id": i, "name": "server-%s" % i, "traffic": 1234567.5 * i, "labels": {"é": "ü"}}
+                         for i in range(1, 20)],
+            "meta": {"pagination": {"page": 1, "next_page": 2}},
+        }
+
+    def test_records_are_yielded_whatever_the_chunk_size(self):
+        for size in (1, 2, 3, 7, 64, 100000):
+            rest = {}
+            records = list(_stream_list(_chunks(self.document, size), "servers", rest))
+
+            self.assertEqual(records, self.document["servers"])
+            self.assertEqual(rest, {"meta": self.document["meta"]})
+
+    def test_members_before_the_list_are_kept(self):
+        document = {"meta": {"pagination": {"next_page": None}}, "servers": [{"id": 1}, {"id": 2}]}
+        rest = {}
+
+        self.assertEqual(list(_stream_list(_chunks(document, 5), "servers", rest)), [{"id": 1}, {"id": 2}])
+        self.assertEqual(rest, {"meta": {"pagination": {"next_page": None}}})
+
+    def test_an_empty_list_yields_nothing(self):
+        rest = {}
+
+        self.assertEqual(list(_stream_list(_chunks({"servers": [], "meta": {}}, 4), "servers", rest)), [])
+        self.assertEqual(rest, {"meta": {}})
+
+    def test_truncated_responses_are_rejected(self):
+        chunks = _chunks(self.document, 16)[:-3]
+
+        with self.assertRaises(ValueError):
+            list(_stream_list(chunks, "servers", {}))
+
+
+class TestStreamedListings(unittest.TestCase):
+    def setUp(self):
+        self.mock_server = HetznerCloudMockServer(api_key="key", seed=1).start()
+        self.mock_server.seed_resources(servers=60)
+        self.configuration = HetznerCloudClientConfiguration().with_api_key("key") \
+            .with_base_url(self.mock_server.base_url)
+        self.client = HetznerCloudClient(self.configuration)
+
+    def tearDown(self):
+        self.client.close()
+        self.mock_server.stop()
+
+    def test_streamed_listings_match_decoded_listings(self):
+        servers = [server.id for server in self.client.servers().get_all(per_page=25)]
+        streamed = [server.id for server in self.client.servers().get_all(per_page=25, stream=True)]
+
+        self.assertEqual(len(streamed), 60)
+        self.assertEqual(streamed, servers)
+
+    def test_streamed_snapshots_match_decoded_snapshots(self):
+        table = self.client.servers().snapshot(per_page=25)
+        streamed = self.client.servers().snapshot(per_page=25, stream=True)
+
+        self.assertEqual(len(streamed), 60)
+        self.assertEqual(list(streamed.column("id")), list(table.column("id")))
+
+    def test_catalog_listings_can_be_streamed(self):
+        locations = [location.name for location in self.client.locations().get_all()]
+
+        self.assertEqual([location.name for location in self.client.locations().get_all(stream=True)], locations)
+        self.assertEqual(len(list(self.client.isos().get_all(stream=True))), len(list(self.client.isos().get_all())))
+        self.assertEqual(len(list(self.client.datacenters().get_all(stream=True))), 3)
+        self.assertEqual([server_type.name for server_type in self.client.server_types().get_all(stream=True)],
+                         [server_type.name for server_type in self.client.server_types().get_all()])
+
+    def test_streaming_stops_requesting_pages_after_max_items(self):
+        self.mock_server.requests = 0
+
+        self.assertEqual(len(list(self.client.servers().get_all(per_page=25, max_items=25, stream=True))), 25)
+        self.assertEqual(self.mock_server.requests, 1)
+
+    def test_streaming_cannot_be_combined_with_prefetching(self):
+        with self.assertRaises(HetznerInvalidArgumentException):
+            list(self.client.servers().get_all(stream=True, prefetch=1))
+
+    def test_server_errors_are_raised_whilst_streaming(self):
+        self.mock_server.fail_next(500)
+
+        with self.assertRaises(HetznerInternalServerErrorException):
+            list(self.client.servers().get_all(stream=True))
@@ -0,0 +1,53 @@
+import unittest
+
+from hetznercloud import HetznerCloudServerTable, HetznerInvalidArgumentException
+
+
+def _server_json(id, status, location, outgoing_traffic, included_traffic, server_type="cx11"):
+    return {
+        "id": id, "status": status, "created": "2018-01-01T00:00:00+00:00", "server_type": {"name": server_type},
+        "datacenter": {"id": 1 if location == "fsn1" else 2, "location": {"name": location}},
+        "outgoing_traffic": outgoing_traffic, "ingoing_traffic": None, "included_traffic": included_traffic
+    }
+
+
+class TestTables(unittest.TestCase):
+    def setUp(self):
+        self.table = HetznerCloudServerTable()
+        for server_json in (_server_json(1, "running", "fsn1", 90, 100),
+                            _server_json(2, "running", "fsn1", 10, 100, server_type="cx21"),
+                            _server_json(3, "off", "nbg1", 95, 100),
+                            _server_json(4, "running", "fsn1", 0, 0)):
+            self.table._append(server_json)
+
+    def test_columns_are_loaded_from_json(self):
+        self.assertEqual(len(self.table), 4)
+        self.assertEqual(list(self.table.column("id")), [1, 2, 3, 4])
+        self.assertEqual(self.table.column("status"), ["running", "running", "off", "running"])
+        self.assertEqual(list(self.table.column("ingoing_traffic")), [0, 0, 0, 0])
+        self.assertEqual(self.table.column("created")[0], 1514764800.0)
+
+    def test_rows_can_be_filtered(self):
+        busy = self.table.where("location", "==", "fsn1") \
+            .where(self.table.where("location", "==", "fsn1").divide("outgoing_traffic", "included_traffic"), ">", 0.8)
+
+        self.assertEqual(list(busy.column("id")), [1])
+        self.assertEqual(list(self.table.where("status", "in", ["off", "unknown"]).column("id")), [3])
+        self.assertEqual(len(self.table.where("status", "==", "unknown")), 0)
+
+    def test_rows_can_be_grouped_and_aggregated(self):
+        self.assertEqual(self.table.aggregate("outgoing_traffic", "sum"), 195)
+        self.assertEqual(self.table.aggregate("id", "count", by="location"), {"fsn1": 3, "nbg1": 1})
+        self.assertEqual(self.table.aggregate("outgoing_traffic", "max", by="server_type"), {"cx11": 95, "cx21": 10})
+        self.assertEqual(list(self.table.group_by("status")["off"].column("id")), [3])
+        self.assertIsNone(self.table.where("id", ">", 10).aggregate("outgoing_traffic", "mean"))
+
+    def test_invalid_queries_are_rejected(self):
+        with self.assertRaises(HetznerInvalidArgumentException):
+            self.table.column("name")
+        with self.assertRaises(HetznerInvalidArgumentException):
+            self.table.where("id", "~", 1)
+        with self.assertRaises(HetznerInvalidArgumentException):
+            self.table.where("status", "in", "off")
+        with self.assertRaises(HetznerInvalidArgumentException):
+            self.table.aggregate("status", "sum")
@@ -0,0 +1,121 @@
+import threading
+import unittest
+
+from hetznercloud import HetznerCloudClientConfiguration, HetznerCloudClient, ACTION_STATUS_SUCCESS, \
+    SERVER_STATUS_OFF
+from hetznercloud.testing import HetznerCloudMockServer
+
+
+class TestThreadSafety(unittest.TestCase):
+    THREADS = 200
+
+    def setUp(self):
+        self.mock_server = HetznerCloudMockServer(api_key="key", action_duration=0.1, seed=1).start()
+        self.mock_server.seed_resources(servers=20, floating_ips=5, ssh_keys=5)
+        self.configuration = HetznerCloudClientConfiguration().with_api_key("key") \
+            .with_base_url(self.mock_server.base_url).with_rate_limiter().with_lazy_decoding() \
+            .with_connection_pool(max_connections_per_host=self.THREADS)
+        self.client = HetznerCloudClient(self.configuration)
+
+    def tearDown(self):
+        self.client.close()
+        self.mock_server.stop()
+
+    def _run_concurrently(self, function, threads=None):
+        threads = threads or self.THREADS
+        barrier = threading.Barrier(threads)
+        errors = []
+
+        def run(index):
+            barrier.wait()
+            try:
+                function(index)
+            except Exception as e:
+                errors.append(e)
+
+        workers = [threading.Thread(target=run, args=(index,)) for index in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        return errors
+
+    def test_one_client_can_be_shared_by_hundreds_of_threads(self):
+        servers = list(self.client.servers().get_all())
+        names = {server.id: server.name for server in self.client.servers().get_all()}
+
+        def work(index):
+            server = servers[index % len(servers)]
+            # The API locks a server whilst an action is running on it, so only one thread changes each server.
+            if index < len(servers):
+                server.power_off()
+            else:
+                server.status
+
+            self.assertEqual(self.client.servers().get(server.id).name, names[server.id])
+            self.assertEqual(len(list(self.client.servers().get_all(per_page=10))), len(servers))
+
+        self.mock_server.requests = 0
+        self.assertEqual(self._run_concurrently(work), [])
+
+        # Every request was counted exactly once, both by the API and by the shared statistics.
+        requests = self.THREADS * 3 + len(servers)
+        self.assertEqual(self.mock_server.requests, requests)
+        self.assertEqual(sum(statistics.requests for statistics in self.client.stats().values()), requests + 2)
+        self.assertEqual({server.status for server in servers}, {SERVER_STATUS_OFF})
+
+    def test_threads_share_the_connection_pool_but_not_sessions(self):
+        sessions = [None] * 20
+
+        def get_session(index):
+            sessions[index] = self.configuration._get_session()
+
+        self.assertEqual(self._run_concurrently(get_session, threads=20), [])
+
+        self.assertEqual(len({id(session) for session in sessions}), 20)
+        self.assertEqual({id(session.get_adapter(self.mock_server.base_url)) for session in sessions},
+                         {id(self.configuration._adapter)})
+
+    def test_changes_are_not_lost_to_lazy_decoding(self):
+        servers = list(self.client.servers().get_all())
+
+        def change(index):
+            server = servers[index % len(servers)]
+            if index < len(servers):
+                server.change_name("renamed-%s" % server.id)
+            else:
+                server.name
+
+        self.assertEqual(self._run_concurrently(change), [])
+
+        self.assertEqual([server.name for server in servers], ["renamed-%s" % server.id for server in servers])
+
+    def test_an_inventory_can_be_read_whilst_it_is_refreshed(self):
+        inventory = self.client.inventory()
+        ids = [server.id for server in inventory.servers()]
+
+        def work(index):
+            if index % 20 == 0:
+                inventory.refresh() if index % 40 else inventory.sync()
+            else:
+                server = inventory.server(ids[index % len(ids)])
+                self.assertIs(inventory.server_by_name(server.name), server)
+                self.assertEqual(len(inventory.servers()), len(ids))
+
+        self.assertEqual(self._run_concurrently(work), [])
+
+    def test_one_action_can_be_waited_for_by_many_threads(self):
+        servers = list(self.client.servers().get_all())
+        actions = [result.action for result in self.client.servers().bulk(servers).power_off(wait=False)]
+
+        def wait(index):
+            if index % 10 == 0:
+                results = self.client.actions().wait_for_actions(actions, timeout=10)
+                self.assertEqual([error for _, error in results], [None] * len(actions))
+            else:
+                actions[index % len(actions)].wait_until_status_is(ACTION_STATUS_SUCCESS, timeout=10)
+
+        self.assertEqual(self._run_concurrently(wait, threads=50), [])
+
+        self.assertEqual({(action.status, action.progress) for action in actions}, {(ACTION_STATUS_SUCCESS, 100)})